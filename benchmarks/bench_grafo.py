@@ -0,0 +1,137 @@
+"""Casos de benchmark da construção do grafo, da busca de caminhos e do sorteio de posições."""
+import numpy as np
+
+from data_structure.centralidade import CentralidadePasses, calcula_centralidades
+from data_structure.esparso import GrafoEsparso
+from data_structure.graph import GrafoSimples
+from data_structure.pesos import GeometriaPasses, ModeloPeso, varre_modelos
+from simulation.cenarios import (FORMACOES, JOGADORES_TIME_1, JOGADORES_TIME_2, atualizar_posicoes_sem_sobreposicao,
+                                 generate_graph, get_player_positions)
+from simulation.otimizador import ProblemaDefesa
+
+TAMANHOS = [11, 50, 200, 1000]
+TAMANHOS_RAPIDO = [11, 200]
+# Acima disso a conversão para NetworkX leva segundos por chamada
+TAMANHO_MAXIMO_NETWORKX = 200
+# O cálculo completo das centralidades é O(n³)
+TAMANHO_MAXIMO_CENTRALIDADE = 200
+# Posicionamentos defensivos avaliados por chamada
+LOTE_DEFESA = 64
+# Grafos esparsos: vértices espalhados em um campo de 105 x 68 e passes de até RAIO_ESPARSO
+TAMANHOS_ESPARSOS = [1000, 10000, 50000]
+TAMANHOS_ESPARSOS_RAPIDO = [1000]
+RAIO_ESPARSO = 1.0
+
+
+def times_da_formacao(formacao_time_1, formacao_time_2):
+    """Monta os dois times nas posições fixas das formações, sem arestas."""
+    posicoes_time_1, posicoes_time_2 = get_player_positions(formacao_time_1, formacao_time_2)
+    return generate_graph(JOGADORES_TIME_1, posicoes_time_1), generate_graph(JOGADORES_TIME_2, posicoes_time_2)
+
+
+def times_sinteticos(tamanho, semente=0):
+    """Monta um time de 'tamanho' jogadores e um adversário de tamanho - 1, em posições aleatórias do campo."""
+    rng = np.random.default_rng(semente)
+    grafo = GrafoSimples()
+    time_inimigo = GrafoSimples()
+    for i, posicao in enumerate(rng.uniform((0, -2), (5.6, 2), (tamanho, 2)).tolist()):
+        grafo.adiciona_vertice(f"J{i}", tuple(posicao))
+    for i, posicao in enumerate(rng.uniform((0, -2), (5.6, 2), (tamanho - 1, 2)).tolist()):
+        time_inimigo.adiciona_vertice(f"A{i}", tuple(posicao))
+    return grafo, time_inimigo
+
+
+def cenarios(rapido):
+    """Gera (parametros, grafo, time_inimigo, origem, destino) para as formações e os times sintéticos."""
+    for formacao in FORMACOES:
+        grafo, time_inimigo = times_da_formacao(formacao, formacao)
+        yield {"formacao": formacao}, grafo, time_inimigo, "Alisson", "Gol"
+    for tamanho in TAMANHOS_RAPIDO if rapido else TAMANHOS:
+        grafo, time_inimigo = times_sinteticos(tamanho)
+        yield {"jogadores": tamanho}, grafo, time_inimigo, "J0", f"J{tamanho - 1}"
+
+
+def casos(rapido=False):
+    for parametros, grafo, time_inimigo, origem, destino in cenarios(rapido):
+        grafo.cria_grafo_completo(time_inimigo)
+        tamanho = len(grafo.vertices)
+
+        yield "cria_grafo_completo", parametros, lambda g=grafo, t=time_inimigo: lambda: g.cria_grafo_completo(t)
+
+        def distancia_marcador(g=grafo, t=time_inimigo):
+            def executar():
+                g.invalida_caches()
+                t.invalida_caches()
+                for nome in g.vertices:
+                    g.distancia_marcador(nome, t)
+            return executar
+        yield "distancia_marcador (todos, sem cache)", parametros, distancia_marcador
+
+        def distancia_marcador_memo(g=grafo, t=time_inimigo):
+            for nome in g.vertices:
+                g.distancia_marcador(nome, t)
+            return lambda: [g.distancia_marcador(nome, t) for nome in g.vertices]
+        yield "distancia_marcador (todos, memo)", parametros, distancia_marcador_memo
+
+        def varredura(g=grafo, t=time_inimigo):
+            rng = np.random.default_rng(0)
+            modelos = [ModeloPeso(*rng.uniform((2.5, 3, 2.5), (4, 6, 4))) for _ in range(100)]
+            return lambda: varre_modelos(modelos, GeometriaPasses(g.posicoes, t.posicoes))
+        yield "varre_modelos (100 modelos)", parametros, varredura
+
+        yield "encontra_caminho_mais_curto", parametros, \
+            lambda g=grafo, o=origem, d=destino: lambda: g.encontra_caminho_mais_curto(o, d)
+
+        yield "k_caminhos_mais_curtos (k=5)", parametros, \
+            lambda g=grafo, o=origem, d=destino: lambda: g.k_caminhos_mais_curtos(o, d, 5)
+
+        yield "caminho_com_limite_de_passes (3 passes)", parametros, \
+            lambda g=grafo, o=origem, d=destino: lambda: g.caminho_com_limite_de_passes(o, d, 3)
+
+        if tamanho <= TAMANHO_MAXIMO_CENTRALIDADE:
+            yield "calcula_centralidades", parametros, lambda g=grafo, d=destino: lambda: calcula_centralidades(g, d)
+
+            def centralidade_incremental(g=grafo, d=destino):
+                # Cada chamada muda o peso de uma única aresta, como entre quadros parecidos
+                copia = GrafoSimples.de_arrays(g.nomes, g.posicoes.copy(), g.pesos.copy())
+                centralidade = CentralidadePasses(d)
+                centralidade.calcula(copia)
+                rng = np.random.default_rng(0)
+
+                def executar():
+                    de, para = rng.choice(len(copia.nomes), 2, replace=False)
+                    copia.pesos[de, para] *= rng.uniform(0.9, 1.1)
+                    copia.invalida_caches()
+                    centralidade.calcula(copia)
+                return executar
+            yield "CentralidadePasses.calcula (uma aresta alterada)", parametros, centralidade_incremental
+
+        if tamanho <= TAMANHO_MAXIMO_NETWORKX:
+            yield "construir_grafo_networkx", parametros, lambda g=grafo: g.construir_grafo_networkx
+
+    for formacao in FORMACOES:
+        def sorteio(f=formacao):
+            rng = np.random.default_rng(0)
+            return lambda: atualizar_posicoes_sem_sobreposicao(*get_player_positions(f, f), rng)
+        yield "atualizar_posicoes_sem_sobreposicao", {"formacao": formacao}, sorteio
+
+        def avaliacao_defesa(f=formacao):
+            problema = ProblemaDefesa.das_formacoes(f, f)
+            candidatos = problema.sorteia(LOTE_DEFESA, 0)
+            return lambda: problema.custos(candidatos)
+        yield f"ProblemaDefesa.custos (lote de {LOTE_DEFESA})", {"formacao": formacao}, avaliacao_defesa
+
+    for tamanho in TAMANHOS_ESPARSOS_RAPIDO if rapido else TAMANHOS_ESPARSOS:
+        rng = np.random.default_rng(0)
+        nomes = [f"J{i}" for i in range(tamanho)]
+        posicoes = rng.uniform((0, 0), (105, 68), (tamanho, 2))
+        inimigas = rng.uniform((0, 0), (105, 68), (tamanho // 2, 2))
+        parametros = {"jogadores": tamanho, "raio": RAIO_ESPARSO}
+
+        yield "GrafoEsparso.por_raio", parametros, \
+            lambda p=posicoes, i=inimigas, nomes=nomes: lambda: GrafoEsparso.por_raio(nomes, p, RAIO_ESPARSO, i)
+
+        def caminho_esparso(p=posicoes, i=inimigas, nomes=nomes):
+            grafo = GrafoEsparso.por_raio(nomes, p, RAIO_ESPARSO, i)
+            return lambda: grafo.encontra_caminho_mais_curto(nomes[0], nomes[-1])
+        yield "GrafoEsparso.encontra_caminho_mais_curto", parametros, caminho_esparso
@@ -0,0 +1,84 @@
+"""Tempo de importação e memória dos módulos principais, cada um medido em um processo novo.
+
+Como casos() da suíte, mede o tempo total de um processo Python que só importa o módulo. Rodado
+direto, também mostra a memória (RSS) que a importação acrescenta e quais bibliotecas pesadas ela
+carregou:
+
+    python -m benchmarks.bench_inicializacao [--repeticoes 5] [--saida arquivo.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+MODULOS_MEDIDOS = ["data_structure.graph", "data_structure.pesos", "simulation.cenarios", "simulation.lote", "main"]
+# Bibliotecas que o núcleo do grafo não deve carregar na importação
+PESADAS = ["matplotlib", "networkx", "pygame", "pygame_gui"]
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT_FILHO = """
+import importlib, json, resource, sys, time
+antes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+inicio = time.perf_counter()
+importlib.import_module(sys.argv[1])
+tempo = time.perf_counter() - inicio
+depois = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss vem em KiB no Linux e em bytes no macOS
+escala = 1 if sys.platform == "darwin" else 1024
+pesadas = sorted({nome.split(".")[0] for nome in sys.modules} & set(sys.argv[2:]))
+print(json.dumps({"tempo": tempo, "rss": depois * escala, "rss_importacao": (depois - antes) * escala,
+                  "pesadas": pesadas}))
+"""
+
+
+def mede_importacao(modulo):
+    """
+    Importa um módulo em um processo novo e retorna o que o processo mediu.
+
+    Retorna:
+    dict: tempo (s) da importação, rss e rss_importacao (bytes) e as bibliotecas pesadas carregadas.
+    """
+    ambiente = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    saida = subprocess.run([sys.executable, "-c", SCRIPT_FILHO, modulo, *PESADAS], cwd=RAIZ, env=ambiente,
+                           capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def casos(rapido=False):
+    yield "python -c pass (referência)", {}, \
+        lambda: lambda: subprocess.run([sys.executable, "-c", "pass"], check=True)
+    for modulo in MODULOS_MEDIDOS[:2] if rapido else MODULOS_MEDIDOS:
+        yield "importação em processo novo", {"modulo": modulo}, lambda m=modulo: lambda: mede_importacao(m)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="arquivo JSON onde salvar as medidas")
+    args = parser.parse_args()
+
+    resultados = []
+    for modulo in MODULOS_MEDIDOS:
+        medidas = [mede_importacao(modulo) for _ in range(args.repeticoes)]
+        resultado = {
+            "modulo": modulo,
+            "tempo_mediana": statistics.median(m["tempo"] for m in medidas),
+            "tempo_minimo": min(m["tempo"] for m in medidas),
+            "rss": statistics.median(m["rss"] for m in medidas),
+            "rss_importacao": statistics.median(m["rss_importacao"] for m in medidas),
+            "pesadas": medidas[-1]["pesadas"],
+        }
+        resultados.append(resultado)
+        print(f"{modulo:<24} {resultado['tempo_mediana'] * 1e3:8.1f} ms  "
+              f"RSS {resultado['rss'] / 2**20:6.1f} MiB (+{resultado['rss_importacao'] / 2**20:5.1f})  "
+              f"{', '.join(resultado['pesadas']) or '-'}")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Casos de benchmark do InterfaceDrawer, desenhando em uma Surface fora da tela com o driver de vídeo dummy."""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from gui.exportacao import ExportadorFiguras
+from gui.gui import InterfaceDrawer
+from simulation.cenarios import gera_cenario
+
+RESOLUCOES = [(1280, 720), (3840, 2160)]
+CAMINHO_FUNDO = os.path.join(os.path.dirname(__file__), os.pardir, "assets", "pitch.jpg")
+
+
+def prepara_interface(resolucao):
+    """Cria um InterfaceDrawer sobre uma Surface comum, que não é a tela."""
+    pygame.init()
+    return InterfaceDrawer(pygame.Surface(resolucao), CAMINHO_FUNDO)
+
+
+def casos(rapido=False):
+    grafo, grafo_inimigo = gera_cenario("4-4-2", "4-4-2", 0)
+    caminho = grafo.encontra_caminho_mais_curto("Alisson", "Gol")
+
+    for resolucao in RESOLUCOES[:1] if rapido else RESOLUCOES:
+        parametros = {"resolucao": f"{resolucao[0]}x{resolucao[1]}"}
+
+        yield "draw_background", parametros, lambda r=resolucao: prepara_interface(r).draw_background
+        yield "draw_edges", parametros, \
+            lambda r=resolucao: (lambda i: lambda: i.draw_edges(grafo, (255, 255, 255)))(prepara_interface(r))
+        yield "draw_players", parametros, \
+            lambda r=resolucao: (lambda i: lambda: i.draw_players(grafo, (255, 255, 255)))(prepara_interface(r))
+        yield "draw_path", parametros, \
+            lambda r=resolucao: (lambda i: lambda: i.draw_path(grafo, caminho, (255, 0, 255)))(prepara_interface(r))
+        yield "draw_button", parametros, \
+            lambda r=resolucao: (lambda i: lambda: i.draw_button("Play", False))(prepara_interface(r))
+        yield "draw_score", parametros, lambda r=resolucao: prepara_interface(r).draw_score
+
+        def quadro_sem_cache(r=resolucao):
+            interface = prepara_interface(r)
+
+            def executar():
+                interface.invalida_caches()
+                interface.draw_frame(grafo, grafo_inimigo, caminho)
+            return executar
+        yield "draw_frame (camadas refeitas)", parametros, quadro_sem_cache
+
+        def quadro_com_cache(r=resolucao):
+            interface = prepara_interface(r)
+            interface.draw_frame(grafo, grafo_inimigo)
+
+            def executar():
+                # Esquece o quadro anterior para que o quadro não seja pulado
+                interface.invalida_caches(camadas=False)
+                interface.draw_frame(grafo, grafo_inimigo, caminho)
+            return executar
+        yield "draw_frame (camadas em cache)", parametros, quadro_com_cache
+
+    def exportacao(mostrar_nomes):
+        exportador = ExportadorFiguras(mostrar_nomes=mostrar_nomes)
+
+        def executar():
+            exportador.desenha(grafo, grafo_inimigo, caminho)
+            return exportador.imagem()
+        return executar
+    for mostrar_nomes in (True, False):
+        yield "ExportadorFiguras.imagem", {"nomes": mostrar_nomes}, lambda m=mostrar_nomes: exportacao(m)
@@ -0,0 +1,67 @@
+"""Compara o Dijkstra nativo do GrafoSimples com a rota antiga via NetworkX.
+
+Uso:
+    python -m benchmarks.caminho_mais_curto [--cenarios 200] [--repeticoes 50]
+"""
+import argparse
+import random
+import timeit
+
+import networkx as nx
+
+from data_structure.graph import GrafoSimples
+
+
+def cria_cenario(rng, jogadores=12, adversarios=11):
+    """Cria um par (time, time inimigo) com posições aleatórias dentro do campo."""
+    grafo = GrafoSimples()
+    time_inimigo = GrafoSimples()
+    for i in range(jogadores):
+        grafo.adiciona_vertice(f"J{i}", (round(rng.uniform(0, 5), 1), round(rng.uniform(-2, 2), 1)))
+    for i in range(adversarios):
+        time_inimigo.adiciona_vertice(f"A{i}", (round(rng.uniform(0, 5), 1), round(rng.uniform(-2, 2), 1)))
+    grafo.cria_grafo_completo(time_inimigo)
+    return grafo
+
+
+def caminho_networkx(grafo, origem, destino):
+    """A rota antiga: reconstrói o grafo NetworkX a cada consulta."""
+    return nx.dijkstra_path(grafo.construir_grafo_networkx(), origem, destino)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenarios", type=int, default=200)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    grafos = [cria_cenario(rng) for _ in range(args.cenarios)]
+    origem, destino = "J0", "J11"
+
+    divergencias = sum(
+        grafo.encontra_caminho_mais_curto(origem, destino) != caminho_networkx(grafo, origem, destino)
+        for grafo in grafos
+    )
+
+    def nativo():
+        for grafo in grafos:
+            grafo.encontra_caminho_mais_curto(origem, destino)
+
+    def networkx():
+        for grafo in grafos:
+            caminho_networkx(grafo, origem, destino)
+
+    consultas = args.cenarios * args.repeticoes
+    tempo_nativo = timeit.timeit(nativo, number=args.repeticoes) / consultas
+    tempo_networkx = timeit.timeit(networkx, number=args.repeticoes) / consultas
+
+    print(f"Caminhos divergentes: {divergencias} de {args.cenarios}")
+    print(f"Nativo:   {tempo_nativo * 1e6:9.1f} us/consulta")
+    print(f"NetworkX: {tempo_networkx * 1e6:9.1f} us/consulta")
+    print(f"Ganho:    {tempo_networkx / tempo_nativo:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
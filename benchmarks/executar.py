@@ -0,0 +1,119 @@
+"""Executa a suíte de benchmarks sem interface gráfica e salva os tempos em JSON.
+
+Cada módulo listado em MODULOS expõe uma função casos() que gera tuplas
+(nome, parametros, preparar). preparar() monta o estado do caso e retorna a
+função a ser cronometrada.
+
+Uso:
+    python -m benchmarks.executar [--filtro grafo] [--rapido] [--saida arquivo.json]
+    python -m benchmarks.executar --comparar benchmarks/resultados/anterior.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import timeit
+
+MODULOS = ["benchmarks.bench_grafo", "benchmarks.bench_render", "benchmarks.bench_inicializacao"]
+PASTA_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+
+def cronometra(funcao, repeticoes=5, tempo_minimo=0.2):
+    """
+    Mede o tempo de uma chamada da função.
+
+    O número de chamadas por repetição é escolhido para que cada repetição dure pelo menos
+    tempo_minimo segundos.
+
+    Retorna:
+    dict: O menor tempo e a mediana por chamada, em segundos, e quantas chamadas foram feitas.
+    """
+    timer = timeit.Timer(funcao)
+    chamadas, tempo = timer.autorange()
+    if tempo < tempo_minimo:
+        chamadas = max(1, int(chamadas * tempo_minimo / max(tempo, 1e-9)))
+    tempos = [t / chamadas for t in timer.repeat(repeat=repeticoes, number=chamadas)]
+    return {"minimo": min(tempos), "mediana": statistics.median(tempos), "chamadas": chamadas, "repeticoes": repeticoes}
+
+
+def versao_do_codigo():
+    """Retorna o hash do commit atual, se o código estiver em um repositório git."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executa(filtro=None, rapido=False, repeticoes=5):
+    """Executa todos os casos cujo nome contém 'filtro' e retorna a lista de resultados."""
+    resultados = []
+    for nome_modulo in MODULOS:
+        modulo = importlib.import_module(nome_modulo)
+        for nome, parametros, preparar in modulo.casos(rapido):
+            if filtro and filtro not in nome:
+                continue
+            medida = cronometra(preparar(), repeticoes, 0.05 if rapido else 0.2)
+            resultado = {"nome": nome, "parametros": parametros, **medida}
+            resultados.append(resultado)
+            print(f"{nome:<40} {formata_parametros(parametros):<30} {medida['mediana'] * 1e6:12.1f} us")
+    return resultados
+
+
+def formata_parametros(parametros):
+    return " ".join(f"{chave}={valor}" for chave, valor in parametros.items())
+
+
+def chave_do_caso(resultado):
+    return resultado["nome"], formata_parametros(resultado["parametros"])
+
+
+def compara(resultados, arquivo_anterior):
+    """Imprime a razão entre os tempos atuais e os de uma execução anterior."""
+    with open(arquivo_anterior, encoding="utf-8") as arquivo:
+        anteriores = {chave_do_caso(r): r for r in json.load(arquivo)["resultados"]}
+
+    print(f"\nComparação com {arquivo_anterior} (razão > 1 significa mais lento agora):")
+    for resultado in resultados:
+        anterior = anteriores.get(chave_do_caso(resultado))
+        if anterior is None:
+            continue
+        razao = resultado["mediana"] / anterior["mediana"]
+        print(f"{resultado['nome']:<40} {formata_parametros(resultado['parametros']):<30} {razao:8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filtro", help="executa só os casos cujo nome contém este texto")
+    parser.add_argument("--rapido", action="store_true", help="menos tamanhos e repetições mais curtas")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: benchmarks/resultados/<data>.json)")
+    parser.add_argument("--comparar", help="arquivo JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    resultados = executa(args.filtro, args.rapido, args.repeticoes)
+
+    saida = args.saida
+    if saida is None:
+        os.makedirs(PASTA_RESULTADOS, exist_ok=True)
+        saida = os.path.join(PASTA_RESULTADOS, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": versao_do_codigo(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "resultados": resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em {saida}")
+
+    if args.comparar:
+        compara(resultados, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
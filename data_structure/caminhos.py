@@ -0,0 +1,342 @@
+import heapq
+import math
+
+import numpy as np
+
+
+def dijkstra(pesos, origem, destino=None):
+    """
+    Algoritmo de Dijkstra sobre uma matriz de adjacência densa.
+
+    A cada passo o vértice não visitado de menor distância é escolhido com argmin e todas as
+    arestas dele são relaxadas de uma vez, o que dá O(n²) operações vetorizadas.
+
+    Parâmetros:
+    pesos (ndarray): Matriz (n, n) de pesos não negativos, com infinito onde não há aresta.
+    origem (int): O índice do vértice de origem.
+    destino (int): Se informado, a busca para assim que a distância até ele é definitiva.
+
+    Retorna:
+    tuple: Dois arrays (distancias, predecessores). predecessores[v] é o vértice anterior a v no
+    caminho mais curto, ou -1 se v é a origem ou não é alcançável.
+    """
+    n = pesos.shape[0]
+    distancias = np.full(n, np.inf)
+    distancias[origem] = 0.0
+    predecessores = np.full(n, -1, dtype=np.intp)
+    visitados = np.zeros(n, dtype=bool)
+
+    for _ in range(n):
+        candidatas = np.where(visitados, np.inf, distancias)
+        atual = int(np.argmin(candidatas))
+        if candidatas[atual] == np.inf:
+            break
+        visitados[atual] = True
+        if atual == destino:
+            break
+
+        novas_distancias = distancias[atual] + pesos[atual]
+        melhora = (novas_distancias < distancias) & ~visitados
+        distancias[melhora] = novas_distancias[melhora]
+        predecessores[melhora] = atual
+
+    return distancias, predecessores
+
+
+def dijkstra_em_lote(pesos, origens):
+    """
+    Algoritmo de Dijkstra a partir de várias origens ao mesmo tempo, sobre uma matriz densa.
+
+    Cada linha do lote é uma busca independente; a cada passo todas escolhem o seu vértice mais
+    próximo e relaxam as arestas dele juntas, então n passos vetorizados calculam as árvores de
+    todas as origens.
+
+    Parâmetros:
+    pesos (ndarray): Matriz (n, n) de pesos não negativos, com infinito onde não há aresta.
+    origens (array): Os índices das b origens.
+
+    Retorna:
+    tuple: Dois arrays (distancias, ordem), ambos (b, n). distancias[r, v] é o custo mínimo da
+    origem r até v, e ordem[r] lista os vértices na ordem em que ficaram definitivos (a origem
+    primeiro), completada com -1 pelos não alcançáveis.
+    """
+    origens = np.asarray(origens, dtype=np.intp)
+    b, n = len(origens), pesos.shape[0]
+    linhas = np.arange(b)
+    distancias = np.full((b, n), np.inf)
+    distancias[linhas, origens] = 0.0
+    ordem = np.full((b, n), -1, dtype=np.intp)
+    visitados = np.zeros((b, n), dtype=bool)
+
+    for passo in range(n):
+        candidatas = np.where(visitados, np.inf, distancias)
+        atuais = candidatas.argmin(axis=1)
+        ativas = np.isfinite(candidatas[linhas, atuais])
+        if not ativas.any():
+            break
+        visitados[linhas[ativas], atuais[ativas]] = True
+        ordem[ativas, passo] = atuais[ativas]
+
+        novas_distancias = distancias[linhas, atuais][:, None] + pesos[atuais]
+        melhora = (novas_distancias < distancias) & ~visitados & ativas[:, None]
+        distancias = np.where(melhora, novas_distancias, distancias)
+
+    return distancias, ordem
+
+
+def custos_em_lote(pesos, origem):
+    """
+    Calcula os custos mínimos a partir de uma origem em vários grafos com os mesmos vértices de uma vez.
+
+    É um Bellman–Ford em forma de produto min-plus: cada iteração relaxa todas as arestas de todos
+    os grafos juntas, e o laço para quando nenhum custo melhora, em no máximo n - 1 iterações.
+
+    Parâmetros:
+    pesos (ndarray): Array (P, n, n) com as matrizes de pesos dos P grafos, com infinito onde não há aresta.
+    origem (int): O índice do vértice de origem, o mesmo em todos os grafos.
+
+    Retorna:
+    ndarray: Array (P, n) em que [p, v] é o custo mínimo da origem até v no grafo p.
+    """
+    quantidade, n = pesos.shape[0], pesos.shape[1]
+    custos = np.full((quantidade, n), np.inf)
+    custos[:, origem] = 0.0
+    for _ in range(n - 1):
+        novos = np.minimum(custos, (custos[:, :, None] + pesos).min(axis=1))
+        if np.array_equal(novos, custos):
+            break
+        custos = novos
+    return custos
+
+
+def dijkstra_esparso(indptr, indices, pesos, origem, destino=None):
+    """
+    Algoritmo de Dijkstra com heap binário sobre um grafo em formato CSR.
+
+    Só as arestas que existem são visitadas, então o custo é O((n + arestas) log n), e não O(n²).
+
+    Parâmetros:
+    indptr (ndarray): Vetor (n + 1,); as arestas que saem de i estão nas posições indptr[i]:indptr[i + 1].
+    indices (ndarray): O destino de cada aresta.
+    pesos (ndarray): O peso de cada aresta, não negativo.
+    origem (int): O índice do vértice de origem.
+    destino (int): Se informado, a busca para assim que a distância até ele é definitiva.
+
+    Retorna:
+    tuple: Dois arrays (distancias, predecessores), como os de dijkstra.
+    """
+    n = len(indptr) - 1
+    distancias = [math.inf] * n
+    distancias[origem] = 0.0
+    predecessores = [-1] * n
+    visitados = [False] * n
+    fila = [(0.0, origem)]
+
+    while fila:
+        distancia, atual = heapq.heappop(fila)
+        if visitados[atual]:
+            continue
+        visitados[atual] = True
+        if atual == destino:
+            break
+
+        inicio, fim = indptr[atual], indptr[atual + 1]
+        for vizinho, peso in zip(indices[inicio:fim].tolist(), pesos[inicio:fim].tolist()):
+            nova_distancia = distancia + peso
+            if nova_distancia < distancias[vizinho] and not visitados[vizinho]:
+                distancias[vizinho] = nova_distancia
+                predecessores[vizinho] = atual
+                heapq.heappush(fila, (nova_distancia, vizinho))
+
+    return np.array(distancias), np.array(predecessores, dtype=np.intp)
+
+
+def reconstroi_caminho(predecessores, origem, destino):
+    """
+    Reconstrói um caminho a partir do vetor de predecessores de uma árvore de caminhos mínimos.
+
+    Parâmetros:
+    predecessores (ndarray): O vetor de predecessores retornado por dijkstra.
+    origem (int): O índice do vértice de origem.
+    destino (int): O índice do vértice de destino.
+
+    Retorna:
+    list: Os índices dos vértices do caminho, da origem ao destino, ou None se não há caminho.
+    """
+    caminho = [destino]
+    while caminho[-1] != origem:
+        anterior = int(predecessores[caminho[-1]])
+        if anterior < 0:
+            return None
+        caminho.append(anterior)
+    caminho.reverse()
+    return caminho
+
+
+def floyd_warshall(pesos):
+    """
+    Calcula os custos mínimos entre todos os pares de vértices com Floyd–Warshall vetorizado.
+
+    Cada uma das n iterações relaxa a matriz inteira de uma vez pelo vértice intermediário k.
+
+    Parâmetros:
+    pesos (ndarray): Matriz (n, n) de pesos não negativos, com infinito onde não há aresta.
+
+    Retorna:
+    tuple: Duas matrizes (custos, proximos). custos[i, j] é o custo mínimo de i até j e
+    proximos[i, j] é o vértice seguinte a i nesse caminho, ou -1 se j não é alcançável.
+    """
+    n = pesos.shape[0]
+    custos = np.array(pesos, dtype=np.float64)
+    np.fill_diagonal(custos, 0.0)
+    proximos = np.where(np.isfinite(custos), np.arange(n)[None, :], -1)
+
+    for k in range(n):
+        via_k = custos[:, k, None] + custos[None, k, :]
+        melhora = via_k < custos
+        custos = np.where(melhora, via_k, custos)
+        proximos = np.where(melhora, proximos[:, k, None], proximos)
+
+    return custos, proximos
+
+
+def caminho_por_proximos(proximos, origem, destino):
+    """
+    Reconstrói um caminho a partir da matriz de próximos saltos, em O(comprimento do caminho).
+
+    Parâmetros:
+    proximos (ndarray): A matriz de próximos saltos retornada por floyd_warshall.
+    origem (int): O índice do vértice de origem.
+    destino (int): O índice do vértice de destino.
+
+    Retorna:
+    list: Os índices dos vértices do caminho, da origem ao destino, ou None se não há caminho.
+    """
+    if proximos[origem, destino] < 0:
+        return None
+    caminho = [origem]
+    while caminho[-1] != destino:
+        caminho.append(int(proximos[caminho[-1], destino]))
+    return caminho
+
+
+def custo_do_caminho(pesos, caminho):
+    """Soma os pesos das arestas de um caminho, dado como lista de índices."""
+    return float(sum(pesos[a, b] for a, b in zip(caminho, caminho[1:])))
+
+
+def caminho_limitado(pesos, origem, destino, max_arestas):
+    """
+    Encontra o caminho de menor custo entre dois vértices usando no máximo 'max_arestas' arestas.
+
+    É um Bellman–Ford truncado: a iteração k calcula, de uma vez para todos os vértices, o menor
+    custo com até k arestas.
+
+    Parâmetros:
+    pesos (ndarray): Matriz (n, n) de pesos não negativos, com infinito onde não há aresta.
+    origem (int): O índice do vértice de origem.
+    destino (int): O índice do vértice de destino.
+    max_arestas (int): O número máximo de arestas do caminho.
+
+    Retorna:
+    tuple: (caminho, custo), com o caminho como lista de índices, ou (None, inf) se não há caminho.
+    """
+    n = pesos.shape[0]
+    custos = np.full(n, np.inf)
+    custos[origem] = 0.0
+    # anteriores[k][v] é o vértice anterior a v no melhor caminho com até k+1 arestas,
+    # ou -1 se esse caminho é o mesmo de até k arestas
+    anteriores = []
+    colunas = np.arange(n)
+    for _ in range(max_arestas):
+        via = custos[:, None] + pesos
+        melhores = via.argmin(axis=0)
+        novos = via[melhores, colunas]
+        melhora = novos < custos
+        anteriores.append(np.where(melhora, melhores, -1))
+        custos = np.where(melhora, novos, custos)
+        if not melhora.any():
+            break
+
+    if not np.isfinite(custos[destino]):
+        return None, np.inf
+
+    caminho = [destino]
+    for nivel in reversed(anteriores):
+        anterior = int(nivel[caminho[-1]])
+        if anterior >= 0:
+            caminho.append(anterior)
+    caminho.reverse()
+    return caminho, float(custos[destino])
+
+
+def k_caminhos_mais_curtos(pesos, origem, destino, k):
+    """
+    Encontra os k caminhos simples de menor custo entre dois vértices, pelo algoritmo de Yen.
+
+    Uma árvore de caminhos mínimos até o destino é calculada uma vez. Em cada desvio, se o caminho
+    da árvore a partir do vértice de desvio não usa vértices nem arestas bloqueados, ele é o
+    melhor desvio possível e o Dijkstra daquele desvio é evitado.
+
+    Parâmetros:
+    pesos (ndarray): Matriz (n, n) de pesos não negativos, com infinito onde não há aresta.
+    origem (int): O índice do vértice de origem.
+    destino (int): O índice do vértice de destino.
+    k (int): Quantos caminhos retornar.
+
+    Retorna:
+    list: Até k tuplas (caminho, custo), em ordem crescente de custo, com os caminhos como listas de índices.
+    """
+    # A árvore até o destino é a árvore a partir dele no grafo com as arestas invertidas
+    custos_ate_destino, proximos = dijkstra(pesos.T, destino)
+
+    def caminho_pela_arvore(inicio):
+        caminho = [inicio]
+        while caminho[-1] != destino:
+            caminho.append(int(proximos[caminho[-1]]))
+        return caminho
+
+    if not np.isfinite(custos_ate_destino[origem]):
+        return []
+
+    encontrados = [(caminho_pela_arvore(origem), float(custos_ate_destino[origem]))]
+    candidatos = []
+    vistos = {tuple(encontrados[0][0])}
+
+    while len(encontrados) < k:
+        ultimo = encontrados[-1][0]
+        for j in range(len(ultimo) - 1):
+            desvio = ultimo[j]
+            raiz = ultimo[:j + 1]
+            removidos = set(raiz[:-1])
+            bloqueadas = {(c[j], c[j + 1]) for c, _ in encontrados if len(c) > j + 1 and c[:j + 1] == raiz}
+
+            complemento = None
+            if np.isfinite(custos_ate_destino[desvio]):
+                pela_arvore = caminho_pela_arvore(desvio)
+                if (pela_arvore[0], pela_arvore[1]) not in bloqueadas and removidos.isdisjoint(pela_arvore):
+                    complemento = pela_arvore
+
+            if complemento is None:
+                restrito = pesos.copy()
+                lista_removidos = list(removidos)
+                restrito[lista_removidos, :] = np.inf
+                restrito[:, lista_removidos] = np.inf
+                for a, b in bloqueadas:
+                    restrito[a, b] = np.inf
+                _, predecessores = dijkstra(restrito, desvio, destino)
+                complemento = reconstroi_caminho(predecessores, desvio, destino)
+                if complemento is None:
+                    continue
+
+            caminho = raiz[:-1] + complemento
+            if tuple(caminho) not in vistos:
+                vistos.add(tuple(caminho))
+                heapq.heappush(candidatos, (custo_do_caminho(pesos, caminho), caminho))
+
+        if not candidatos:
+            break
+        custo, caminho = heapq.heappop(candidatos)
+        encontrados.append((caminho, custo))
+
+    return encontrados
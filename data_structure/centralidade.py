@@ -0,0 +1,251 @@
+"""Centralidade dos jogadores no grafo de passes, calculada quadro a quadro.
+
+As três medidas saem das árvores de caminhos mínimos de todas as origens, calculadas juntas por
+dijkstra_em_lote sobre a matriz de pesos do GrafoSimples:
+
+    intermediação   em quantos caminhos mínimos entre outros dois jogadores o jogador está
+                    (Brandes), como nx.betweenness_centrality com weight="weight"
+    proximidade     o inverso da distância média dos outros até o jogador, como
+                    nx.closeness_centrality com distance="weight"
+    envolvimento    a chance de o jogador estar na rota mais barata até o destino ("Gol"),
+                    com a bola começando em um jogador sorteado
+
+Entre quadros consecutivos, só são recalculadas as árvores das origens em que alguma aresta que
+mudou de peso estava em um caminho mínimo ou passou a estar.
+"""
+import numpy as np
+
+from data_structure.caminhos import dijkstra_em_lote
+
+# Somas de pesos por caminhos diferentes que empatam podem diferir no último bit
+TOLERANCIA = 1e-12
+
+
+def _no_caminho_minimo(via, distancias, tolerancia):
+    """Se chegar por 'via' custa o mesmo que o caminho mínimo, dentro da tolerância relativa."""
+    return np.isfinite(distancias) & (np.abs(via - distancias) <= tolerancia * np.maximum(np.abs(distancias), 1.0))
+
+
+def arvores_em_lote(pesos, origens, tolerancia=TOLERANCIA):
+    """
+    Calcula as árvores de caminhos mínimos de várias origens e as contagens de Brandes sobre elas.
+
+    Parâmetros:
+    pesos (ndarray): Matriz (n, n) de pesos não negativos, com infinito onde não há aresta.
+    origens (array): Os índices das b origens.
+    tolerancia (float): A diferença relativa abaixo da qual dois custos são considerados iguais.
+
+    Retorna:
+    tuple: Três arrays (b, n): distancias, o número de caminhos mínimos da origem até cada vértice
+    e a dependência de Brandes da origem em cada vértice (zero na própria origem).
+    """
+    origens = np.asarray(origens, dtype=np.intp)
+    b, n = len(origens), pesos.shape[0]
+    linhas = np.arange(b)
+    distancias, ordem = dijkstra_em_lote(pesos, origens)
+    sem_lacos = ~np.eye(n, dtype=bool)
+
+    def predecessores(vertices):
+        # [r, u] é True se a aresta u -> vertices[r] está em um caminho mínimo a partir da origem r
+        via = distancias + pesos[:, vertices].T
+        return _no_caminho_minimo(via, distancias[linhas, vertices][:, None], tolerancia) & sem_lacos[vertices]
+
+    caminhos = np.zeros((b, n))
+    caminhos[linhas, origens] = 1.0
+    for passo in range(1, n):
+        vertices = ordem[:, passo]
+        ativas = vertices >= 0
+        if not ativas.any():
+            break
+        vertices = np.where(ativas, vertices, 0)
+        soma = (predecessores(vertices) * caminhos).sum(axis=1)
+        caminhos[linhas[ativas], vertices[ativas]] = soma[ativas]
+
+    dependencias = np.zeros((b, n))
+    for passo in range(n - 1, 0, -1):
+        vertices = ordem[:, passo]
+        ativas = vertices >= 0
+        if not ativas.any():
+            continue
+        vertices = np.where(ativas, vertices, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fator = np.where(ativas, (1.0 + dependencias[linhas, vertices]) / caminhos[linhas, vertices], 0.0)
+        dependencias += predecessores(vertices) * caminhos * fator[:, None]
+    dependencias[linhas, origens] = 0.0
+
+    return distancias, caminhos, dependencias
+
+
+class Centralidades:
+    """
+    As medidas de centralidade de um quadro, como arrays na ordem dos nomes.
+
+    Atributos:
+    nomes (list): Os nomes dos vértices.
+    intermediacao (ndarray): A intermediação de cada vértice.
+    proximidade (ndarray): A proximidade de cada vértice.
+    envolvimento (ndarray): A chance de cada vértice estar na rota até o destino. No próprio destino,
+    é a chance de haver rota.
+    """
+
+    def __init__(self, nomes, intermediacao, proximidade, envolvimento):
+        self.nomes = nomes
+        self.intermediacao = intermediacao
+        self.proximidade = proximidade
+        self.envolvimento = envolvimento
+        self._indices = {nome: i for i, nome in enumerate(nomes)}
+
+    def __getitem__(self, nome):
+        """Retorna as três medidas de um jogador em um dicionário."""
+        i = self._indices[nome]
+        return {"intermediacao": float(self.intermediacao[i]), "proximidade": float(self.proximidade[i]),
+                "envolvimento": float(self.envolvimento[i])}
+
+    def como_dict(self):
+        """Retorna medida -> {nome -> valor}, serializável em JSON."""
+        return {medida: dict(zip(self.nomes, getattr(self, medida).tolist()))
+                for medida in ("intermediacao", "proximidade", "envolvimento")}
+
+
+class CentralidadePasses:
+    """
+    Calcula as centralidades de um grafo de passes a cada quadro, reaproveitando o quadro anterior.
+
+    Guarda as distâncias, as contagens de caminhos e as dependências de todas as origens. No quadro
+    seguinte, compara os pesos com os do anterior e só recalcula as origens afetadas: aquelas em que
+    uma aresta alterada estava em um caminho mínimo (e pode ter deixado de estar) ou em que o novo
+    peso dela empata com ou melhora um caminho mínimo. As outras árvores não mudam.
+
+    Atributos:
+    destino (str): O vértice aonde chegam as rotas do envolvimento.
+    origens_recalculadas (int): Quantas árvores foram recalculadas no último quadro.
+    """
+
+    def __init__(self, destino="Gol", normalizado=True, tolerancia=TOLERANCIA):
+        """
+        Parâmetros:
+        destino (str): O vértice aonde chegam as rotas do envolvimento.
+        normalizado (bool): Se a intermediação é dividida por (n - 1)(n - 2), como no NetworkX.
+        tolerancia (float): A diferença relativa abaixo da qual dois custos são considerados iguais.
+        """
+        self.destino = destino
+        self.normalizado = normalizado
+        self.tolerancia = tolerancia
+        self.origens_recalculadas = 0
+        self._nomes = None
+        self._pesos = None
+        self._distancias = None
+        self._caminhos = None
+        self._dependencias = None
+        self._grafo = None
+        self._versao = None
+        self._resultado = None
+
+    def _origens_afetadas(self, pesos):
+        """Os índices das origens cujas árvores podem ter mudado com os novos pesos."""
+        alteradas = self._pesos != pesos
+        np.fill_diagonal(alteradas, False)
+        de, para = np.nonzero(alteradas)
+        if len(de) == 0:
+            return de
+
+        distancias = self._distancias
+        ate_de, ate_para = distancias[:, de], distancias[:, para]
+        estava = _no_caminho_minimo(ate_de + self._pesos[de, para], ate_para, self.tolerancia)
+        via_nova = ate_de + pesos[de, para]
+        passa_a_estar = np.isfinite(via_nova) & (via_nova <= ate_para + self.tolerancia * np.maximum(np.abs(ate_para), 1.0))
+        return np.nonzero((estava | passa_a_estar).any(axis=1))[0]
+
+    def calcula(self, grafo, probabilidades_origem=None):
+        """
+        Calcula as centralidades do grafo no estado atual.
+
+        Parâmetros:
+        grafo (GrafoSimples): O grafo de passes, com pesos não negativos.
+        probabilidades_origem (array): A chance de a bola começar em cada vértice, na ordem dos nomes.
+        Por padrão, a mesma para todos, exceto o destino.
+
+        Retorna:
+        Centralidades: As medidas do quadro.
+        """
+        if probabilidades_origem is None and grafo is self._grafo and grafo.versao == self._versao:
+            self.origens_recalculadas = 0
+            return self._resultado
+
+        nomes = grafo.nomes
+        pesos = grafo.pesos
+        n = len(nomes)
+        if nomes != self._nomes:
+            origens = np.arange(n)
+            self._distancias = np.empty((n, n))
+            self._caminhos = np.empty((n, n))
+            self._dependencias = np.empty((n, n))
+        else:
+            origens = self._origens_afetadas(pesos)
+
+        if len(origens):
+            distancias, caminhos, dependencias = arvores_em_lote(pesos, origens, self.tolerancia)
+            self._distancias[origens] = distancias
+            self._caminhos[origens] = caminhos
+            self._dependencias[origens] = dependencias
+        self.origens_recalculadas = len(origens)
+        self._nomes = nomes
+        self._pesos = pesos.copy()
+
+        resultado = Centralidades(nomes, self._intermediacao(), self._proximidade(),
+                                  self._envolvimento(nomes, probabilidades_origem))
+        if probabilidades_origem is None:
+            self._grafo, self._versao, self._resultado = grafo, grafo.versao, resultado
+        else:
+            self._grafo = None
+        return resultado
+
+    def _intermediacao(self):
+        n = len(self._nomes)
+        intermediacao = self._dependencias.sum(axis=0)
+        if self.normalizado and n > 2:
+            intermediacao /= (n - 1) * (n - 2)
+        return intermediacao
+
+    def _proximidade(self):
+        # Como no NetworkX, usa as distâncias dos outros até o vértice e corrige pela fração alcançável
+        n = len(self._nomes)
+        alcancaveis = np.isfinite(self._distancias)
+        totais = np.where(alcancaveis, self._distancias, 0.0).sum(axis=0)
+        chegam = alcancaveis.sum(axis=0) - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            proximidade = np.where(totais > 0, chegam / totais * chegam / max(n - 1, 1), 0.0)
+        return proximidade
+
+    def _envolvimento(self, nomes, probabilidades_origem):
+        n = len(nomes)
+        if self.destino not in nomes:
+            return np.zeros(n)
+        t = nomes.index(self.destino)
+        if probabilidades_origem is None:
+            probabilidades_origem = np.full(n, 1.0 / max(n - 1, 1))
+            probabilidades_origem[t] = 0.0
+        probabilidades_origem = np.asarray(probabilidades_origem, dtype=np.float64)
+
+        distancias, caminhos = self._distancias, self._caminhos
+        # [s, v]: a fração dos caminhos mínimos de s até o destino que passam por v
+        via = distancias + distancias[:, t][None, :]
+        no_caminho = _no_caminho_minimo(via, distancias[:, t][:, None], self.tolerancia)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fracao = np.where(no_caminho, caminhos * caminhos[:, t][None, :] / caminhos[:, t][:, None], 0.0)
+        return probabilidades_origem @ fracao
+
+
+def calcula_centralidades(grafo, destino="Gol", probabilidades_origem=None):
+    """
+    Calcula as centralidades de um grafo uma única vez, sem guardar estado para o quadro seguinte.
+
+    Parâmetros:
+    grafo (GrafoSimples): O grafo de passes.
+    destino (str): O vértice aonde chegam as rotas do envolvimento.
+    probabilidades_origem (array): A chance de a bola começar em cada vértice.
+
+    Retorna:
+    Centralidades: As medidas.
+    """
+    return CentralidadePasses(destino).calcula(grafo, probabilidades_origem)
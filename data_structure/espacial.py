@@ -0,0 +1,265 @@
+import heapq
+import math
+
+import numpy as np
+
+
+class GradeEspacial:
+    """
+    Índice espacial em grade uniforme para consultas de vizinhança sobre um conjunto fixo de pontos.
+
+    Os pontos são distribuídos em células quadradas; cada consulta só examina as células próximas
+    ao ponto consultado, em anéis crescentes, em vez de percorrer todos os pontos.
+
+    Atributos:
+    posicoes (ndarray): Array (m, 2) com os pontos indexados.
+    tamanho_celula (float): O lado de cada célula da grade.
+    """
+
+    def __init__(self, posicoes, tamanho_celula=None):
+        """
+        Constrói a grade sobre um conjunto de pontos.
+
+        Parâmetros:
+        posicoes (array): Um array (m, 2) com os pontos a indexar.
+        tamanho_celula (float): O lado das células. Se omitido, é escolhido para haver cerca de um ponto por célula.
+        """
+        self.posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+        self._pontos = [tuple(ponto) for ponto in self.posicoes.tolist()]
+
+        if tamanho_celula is None:
+            extensao = np.ptp(self.posicoes, axis=0) if len(self._pontos) else np.zeros(2)
+            area = float(extensao[0] * extensao[1])
+            tamanho_celula = math.sqrt(area / len(self._pontos)) if area > 0 else 1.0
+        self.tamanho_celula = float(tamanho_celula)
+
+        self._celulas = {}
+        for indice, ponto in enumerate(self._pontos):
+            self._celulas.setdefault(self._celula(ponto), []).append(indice)
+
+        if self._celulas:
+            colunas, linhas = zip(*self._celulas)
+            self._limites = (min(colunas), max(colunas), min(linhas), max(linhas))
+
+    def __len__(self):
+        return len(self._pontos)
+
+    def _celula(self, ponto):
+        """Retorna as coordenadas inteiras da célula que contém o ponto."""
+        return (math.floor(ponto[0] / self.tamanho_celula), math.floor(ponto[1] / self.tamanho_celula))
+
+    def _distancia(self, ponto, indice):
+        """Distância euclidiana, calculada como em GrafoSimples.calcula_distancia."""
+        outro = self._pontos[indice]
+        return math.sqrt((ponto[0] - outro[0])**2 + (ponto[1] - outro[1])**2)
+
+    def _anel(self, centro, raio):
+        """
+        Gera os índices dos pontos nas células à distância de Chebyshev exatamente 'raio' do centro.
+
+        Só as células dentro dos limites ocupados da grade são visitadas.
+        """
+        cx, cy = centro
+        x_min, x_max, y_min, y_max = self._limites
+        for x in range(max(cx - raio, x_min), min(cx + raio, x_max) + 1):
+            if abs(x - cx) == raio:
+                ys = range(max(cy - raio, y_min), min(cy + raio, y_max) + 1)
+            else:
+                ys = [y for y in (cy - raio, cy + raio) if y_min <= y <= y_max]
+            for y in ys:
+                yield from self._celulas.get((x, y), ())
+
+    def _aneis(self, centro):
+        """O primeiro e o último anel em torno do centro que tocam células ocupadas."""
+        x_min, x_max, y_min, y_max = self._limites
+        primeiro = max(0, x_min - centro[0], centro[0] - x_max, y_min - centro[1], centro[1] - y_max)
+        ultimo = max(abs(centro[0] - x_min), abs(centro[0] - x_max), abs(centro[1] - y_min), abs(centro[1] - y_max))
+        return primeiro, ultimo
+
+    def k_mais_proximos(self, ponto, k):
+        """
+        Encontra os k pontos mais próximos de um ponto.
+
+        Parâmetros:
+        ponto (tuple): O ponto consultado.
+        k (int): Quantos vizinhos retornar.
+
+        Retorna:
+        list: Até k tuplas (distancia, indice), em ordem crescente de distância.
+        """
+        if not self._pontos or k <= 0:
+            return []
+
+        centro = self._celula(ponto)
+        primeiro, ultimo = self._aneis(centro)
+        melhores = []  # heap de máximo, com distâncias negadas
+        for raio in range(primeiro, ultimo + 1):
+            for indice in self._anel(centro, raio):
+                candidato = (-self._distancia(ponto, indice), -indice)
+                if len(melhores) < k:
+                    heapq.heappush(melhores, candidato)
+                elif candidato > melhores[0]:
+                    heapq.heapreplace(melhores, candidato)
+            # Pontos fora dos anéis já visitados estão a pelo menos raio * tamanho_celula
+            if len(melhores) == k and -melhores[0][0] <= raio * self.tamanho_celula:
+                break
+
+        return sorted((-distancia, -indice) for distancia, indice in melhores)
+
+    def mais_proximo(self, ponto):
+        """
+        Encontra o ponto mais próximo de um ponto.
+
+        Parâmetros:
+        ponto (tuple): O ponto consultado.
+
+        Retorna:
+        tuple: Uma tupla (distancia, indice), ou None se a grade está vazia.
+        """
+        vizinhos = self.k_mais_proximos(ponto, 1)
+        return vizinhos[0] if vizinhos else None
+
+    def no_raio(self, ponto, raio):
+        """
+        Encontra todos os pontos a uma distância menor ou igual a 'raio' de um ponto.
+
+        Parâmetros:
+        ponto (tuple): O ponto consultado.
+        raio (float): A distância máxima.
+
+        Retorna:
+        list: Tuplas (distancia, indice), em ordem crescente de distância.
+        """
+        if not self._pontos:
+            return []
+        x_min, y_min = self._celula((ponto[0] - raio, ponto[1] - raio))
+        x_max, y_max = self._celula((ponto[0] + raio, ponto[1] + raio))
+        x_min, y_min = max(x_min, self._limites[0]), max(y_min, self._limites[2])
+        x_max, y_max = min(x_max, self._limites[1]), min(y_max, self._limites[3])
+        encontrados = []
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                for indice in self._celulas.get((x, y), ()):
+                    distancia = self._distancia(ponto, indice)
+                    if distancia <= raio:
+                        encontrados.append((distancia, indice))
+        encontrados.sort()
+        return encontrados
+
+
+def _pares_vizinhos(consultas, pontos, lado):
+    """
+    Gera os pares (consulta, ponto) em que o ponto está na mesma célula da consulta ou em uma das
+    oito vizinhas, numa grade de células de lado 'lado'.
+
+    Retorna:
+    tuple: Dois arrays (indices_consultas, indices_pontos), sem ordem definida.
+    """
+    celulas_pontos = np.floor(pontos / lado).astype(np.int64)
+    celulas_consultas = np.floor(consultas / lado).astype(np.int64)
+    # Coordenadas a partir de 1, para que as células vizinhas também sejam positivas
+    minimo = np.minimum(celulas_pontos.min(axis=0), celulas_consultas.min(axis=0)) - 1
+    celulas_pontos -= minimo
+    celulas_consultas -= minimo
+    largura = int(max(celulas_pontos[:, 1].max(), celulas_consultas[:, 1].max())) + 2
+    chaves = celulas_pontos[:, 0] * largura + celulas_pontos[:, 1]
+    chaves_consultas = celulas_consultas[:, 0] * largura + celulas_consultas[:, 1]
+
+    ordem = np.argsort(chaves, kind="stable")
+    chaves_ordenadas = chaves[ordem]
+    inicios = np.flatnonzero(np.r_[True, chaves_ordenadas[1:] != chaves_ordenadas[:-1]])
+    chaves_celulas = chaves_ordenadas[inicios]
+    contagens = np.diff(np.r_[inicios, len(pontos)])
+
+    origens, destinos = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            alvos = chaves_consultas + dx * largura + dy
+            celula = np.minimum(np.searchsorted(chaves_celulas, alvos), len(chaves_celulas) - 1)
+            existe = chaves_celulas[celula] == alvos
+            indices, celula = np.flatnonzero(existe), celula[existe]
+
+            # Para cada consulta, as posições em 'ordem' de todos os pontos da célula vizinha
+            quantos = contagens[celula]
+            deslocamentos = np.repeat(inicios[celula] - (np.cumsum(quantos) - quantos), quantos)
+            origens.append(np.repeat(indices, quantos))
+            destinos.append(ordem[deslocamentos + np.arange(quantos.sum())])
+
+    return np.concatenate(origens), np.concatenate(destinos)
+
+
+def pares_no_raio(posicoes, raio):
+    """
+    Encontra todos os pares ordenados de pontos distintos a uma distância menor ou igual a 'raio'.
+
+    Os pontos são agrupados em células de lado 'raio', e cada ponto só é comparado com os pontos da
+    própria célula e das oito vizinhas. Tudo é feito em operações sobre arrays, então o custo e a
+    memória crescem com o número de pares próximos, e não com o quadrado do número de pontos.
+
+    Parâmetros:
+    posicoes (array): Um array (n, 2) com os pontos.
+    raio (float): A distância máxima.
+
+    Retorna:
+    tuple: Três arrays (origens, destinos, distancias), ordenados por origem e depois por destino.
+    A distância é calculada como em pesos.matriz_distancias.
+    """
+    posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+    if posicoes.shape[0] == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+
+    origens, destinos = _pares_vizinhos(posicoes, posicoes, raio)
+    dx = posicoes[origens, 0] - posicoes[destinos, 0]
+    dy = posicoes[origens, 1] - posicoes[destinos, 1]
+    distancias = np.sqrt(dx**2 + dy**2)
+
+    perto = (distancias <= raio) & (origens != destinos)
+    origens, destinos, distancias = origens[perto], destinos[perto], distancias[perto]
+    ordem_pares = np.lexsort((destinos, origens))
+    return origens[ordem_pares], destinos[ordem_pares], distancias[ordem_pares]
+
+
+def mais_proximos_em_lote(consultas, pontos):
+    """
+    Encontra, para cada consulta, o ponto mais próximo, sem montar a matriz de todas as distâncias.
+
+    Com células de lado h, cerca de um ponto por célula, o mais próximo entre as nove células em
+    volta da consulta é o mais próximo de todos sempre que está a até h dela. As poucas consultas
+    em que isso não acontece são resolvidas com GradeEspacial.
+
+    Parâmetros:
+    consultas (array): Um array (n, 2) com os pontos consultados.
+    pontos (array): Um array (m, 2), não vazio, com os pontos procurados.
+
+    Retorna:
+    tuple: Dois vetores (distancias, indices), como os de pesos.marcadores_mais_proximos.
+    """
+    consultas = np.asarray(consultas, dtype=np.float64).reshape(-1, 2)
+    pontos = np.asarray(pontos, dtype=np.float64).reshape(-1, 2)
+    n = consultas.shape[0]
+    distancias = np.full(n, np.inf)
+    indices = np.full(n, -1, dtype=np.intp)
+    if n == 0:
+        return distancias, indices
+
+    extensao = np.ptp(pontos, axis=0)
+    area = float(extensao[0] * extensao[1])
+    lado = math.sqrt(area / len(pontos)) if area > 0 else max(float(extensao.max()), 1.0)
+
+    origens, destinos = _pares_vizinhos(consultas, pontos, lado)
+    dx = consultas[origens, 0] - pontos[destinos, 0]
+    dy = consultas[origens, 1] - pontos[destinos, 1]
+    candidatas = np.sqrt(dx**2 + dy**2)
+    # Ordena por consulta, distância e índice, para ficar com o primeiro de cada consulta
+    ordem = np.lexsort((destinos, candidatas, origens))
+    origens, destinos, candidatas = origens[ordem], destinos[ordem], candidatas[ordem]
+    primeiros = np.flatnonzero(np.r_[True, origens[1:] != origens[:-1]]) if len(origens) else np.zeros(0, np.intp)
+    distancias[origens[primeiros]] = candidatas[primeiros]
+    indices[origens[primeiros]] = destinos[primeiros]
+
+    incertas = np.flatnonzero(~(distancias <= lado))
+    if len(incertas):
+        grade = GradeEspacial(pontos)
+        for i in incertas.tolist():
+            distancias[i], indices[i] = grade.mais_proximo(tuple(consultas[i]))
+    return distancias, indices
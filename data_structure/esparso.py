@@ -0,0 +1,227 @@
+import numpy as np
+
+from data_structure.caminhos import dijkstra_esparso, reconstroi_caminho
+from data_structure.espacial import mais_proximos_em_lote, pares_no_raio
+from data_structure.graph import GrafoSimples
+from data_structure.pesos import MODELO_PADRAO, marcadores_mais_proximos
+
+# Acima disso, o marcador mais próximo é procurado em uma grade em vez de em uma matriz (n, m)
+LIMITE_MATRIZ_MARCADORES = 4_000_000
+
+
+class GrafoEsparso:
+    """
+    Um grafo direcionado com vértices posicionados, guardado em formato CSR (linhas comprimidas).
+
+    Serve para grafos grandes e pouco conectados, como os agregados de uma temporada, em que cada
+    vértice é um par jogador-zona e as arestas são passes observados. A memória e o tempo de
+    construção crescem com o número de arestas, e não com o quadrado do número de vértices.
+
+    As arestas que saem do vértice i são indices[indptr[i]:indptr[i + 1]], com os pesos nas mesmas
+    posições de 'pesos', ordenadas pelo destino.
+
+    Atributos:
+    nomes (list): Os nomes dos vértices, na ordem dos índices.
+    posicoes (ndarray): Array (n, 2) com as posições dos vértices.
+    indptr (ndarray): Vetor (n + 1,) com o início das arestas de cada vértice.
+    indices (ndarray): Vetor (arestas,) com o destino de cada aresta.
+    pesos (ndarray): Vetor (arestas,) com o peso de cada aresta.
+    """
+
+    def __init__(self, nomes, posicoes, indptr, indices, pesos):
+        """
+        Cria um grafo a partir dos arrays CSR, sem copiá-los.
+
+        Parâmetros:
+        nomes (list): Os nomes dos vértices, na ordem dos índices.
+        posicoes (array): Array (n, 2) com as posições.
+        indptr (array): Vetor (n + 1,) com o início das arestas de cada vértice.
+        indices (array): O destino de cada aresta.
+        pesos (array): O peso de cada aresta.
+        """
+        self.nomes = list(nomes)
+        self.posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.pesos = np.asarray(pesos, dtype=np.float64)
+        self._indices_nomes = {nome: i for i, nome in enumerate(self.nomes)}
+        if len(self._indices_nomes) != len(self.nomes):
+            raise ValueError("Os nomes dos vértices devem ser únicos.")
+        if len(self.indptr) != len(self.nomes) + 1:
+            raise ValueError("indptr deve ter um elemento a mais que o número de vértices.")
+
+    @classmethod
+    def de_arestas(cls, nomes, posicoes, origens, destinos, pesos):
+        """
+        Cria um grafo a partir de uma lista de arestas, em qualquer ordem.
+
+        Parâmetros:
+        nomes (list): Os nomes dos vértices, na ordem dos índices.
+        posicoes (array): Array (n, 2) com as posições.
+        origens (array): O índice da origem de cada aresta.
+        destinos (array): O índice do destino de cada aresta.
+        pesos (array): O peso de cada aresta.
+
+        Retorna:
+        GrafoEsparso: O grafo.
+        """
+        origens = np.asarray(origens, dtype=np.intp)
+        destinos = np.asarray(destinos, dtype=np.intp)
+        pesos = np.asarray(pesos, dtype=np.float64)
+        ordem = np.lexsort((destinos, origens))
+        indptr = np.zeros(len(nomes) + 1, dtype=np.intp)
+        np.cumsum(np.bincount(origens, minlength=len(nomes)), out=indptr[1:])
+        return cls(nomes, posicoes, indptr, destinos[ordem], pesos[ordem])
+
+    @classmethod
+    def por_raio(cls, nomes, posicoes, raio, posicoes_inimigas=None, modelo=None):
+        """
+        Cria um grafo ligando apenas os pares de vértices a até 'raio' de distância um do outro.
+
+        Substitui GrafoSimples.cria_grafo_completo para grafos grandes: os pesos seguem o mesmo
+        modelo, e cada aresta criada tem exatamente o peso que teria no grafo completo.
+
+        Parâmetros:
+        nomes (list): Os nomes dos vértices, na ordem dos índices.
+        posicoes (array): Array (n, 2) com as posições.
+        raio (float): O alcance máximo de um passe.
+        posicoes_inimigas (array): Array (m, 2) com as posições dos adversários. Se omitido, o termo de
+        marcador é zero.
+        modelo (ModeloPeso): O modelo de peso. Se omitido, usa MODELO_PADRAO.
+
+        Retorna:
+        GrafoEsparso: O grafo.
+        """
+        modelo = modelo or MODELO_PADRAO
+        posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+        origens, destinos, distancias = pares_no_raio(posicoes, raio)
+
+        peso_gol = modelo.termo_gol(modelo.distancias_ao_gol(posicoes))
+        if posicoes_inimigas is None or len(posicoes_inimigas) == 0:
+            peso_marcador = np.zeros(len(posicoes))
+        else:
+            peso_marcador = modelo.termo_marcador(_distancias_marcador(posicoes, posicoes_inimigas))
+
+        pesos = modelo.termo_distancia(distancias) * (1 + peso_marcador[destinos] - peso_gol[origens])
+        indptr = np.zeros(len(posicoes) + 1, dtype=np.intp)
+        np.cumsum(np.bincount(origens, minlength=len(posicoes)), out=indptr[1:])
+        return cls(nomes, posicoes, indptr, destinos, pesos)
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        """Converte um GrafoSimples, mantendo só as arestas que existem."""
+        origens, destinos, pesos = grafo.lista_arestas()
+        return cls.de_arestas(grafo.nomes, grafo.posicoes.copy(), origens, destinos, pesos)
+
+    def __len__(self):
+        return len(self.nomes)
+
+    @property
+    def numero_arestas(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        """int: A memória ocupada pelos arrays do grafo, em bytes."""
+        return self.posicoes.nbytes + self.indptr.nbytes + self.indices.nbytes + self.pesos.nbytes
+
+    def indice(self, nome):
+        """Retorna o índice do vértice com o nome informado."""
+        return self._indices_nomes[nome]
+
+    def vizinhos(self, nome):
+        """
+        Retorna as arestas que saem de um vértice.
+
+        Retorna:
+        list: Tuplas (nome do destino, peso), em ordem de índice do destino.
+        """
+        i = self.indice(nome)
+        inicio, fim = self.indptr[i], self.indptr[i + 1]
+        return [(self.nomes[j], peso) for j, peso in zip(self.indices[inicio:fim].tolist(), self.pesos[inicio:fim].tolist())]
+
+    def peso_aresta(self, de, para):
+        """Retorna o peso da aresta de 'de' para 'para', ou infinito se ela não existe."""
+        i, j = self.indice(de), self.indice(para)
+        inicio, fim = self.indptr[i], self.indptr[i + 1]
+        k = inicio + np.searchsorted(self.indices[inicio:fim], j)
+        if k < fim and self.indices[k] == j:
+            return float(self.pesos[k])
+        return np.inf
+
+    def lista_arestas(self):
+        """
+        Retorna todas as arestas do grafo, como em GrafoSimples.lista_arestas.
+
+        Retorna:
+        tuple: Três arrays (origens, destinos, pesos).
+        """
+        origens = np.repeat(np.arange(len(self.nomes)), np.diff(self.indptr))
+        return origens, self.indices, self.pesos
+
+    def encontra_caminho_mais_curto(self, origem, destino, retornar_custo=False):
+        """
+        Encontra o caminho mais curto entre dois vértices usando o algoritmo de Dijkstra com heap.
+
+        :param origem: O nome do vértice de origem.
+        :param destino: O nome do vértice de destino.
+        :param retornar_custo: Se True, retorna também o custo total do caminho.
+        :return: Uma lista de vértices representando o caminho mais curto, ou uma tupla (caminho, custo).
+        """
+        indice_origem = self.indice(origem)
+        indice_destino = self.indice(destino)
+        distancias, predecessores = dijkstra_esparso(self.indptr, self.indices, self.pesos, indice_origem, indice_destino)
+        caminho = reconstroi_caminho(predecessores, indice_origem, indice_destino)
+
+        if caminho is None:
+            caminho = "Não há caminho disponível."
+        else:
+            caminho = [self.nomes[i] for i in caminho]
+
+        if retornar_custo:
+            return caminho, float(distancias[indice_destino])
+        return caminho
+
+    def para_denso(self):
+        """Converte para um GrafoSimples. Só faz sentido para grafos pequenos: a matriz tem n² pesos."""
+        n = len(self.nomes)
+        pesos = np.full((n, n), np.inf)
+        origens, destinos, valores = self.lista_arestas()
+        pesos[origens, destinos] = valores
+        return GrafoSimples.de_arrays(self.nomes, self.posicoes.copy(), pesos)
+
+    def construir_grafo_networkx(self):
+        """
+        Constrói um DiGraph do NetworkX com os mesmos vértices, posições e arestas.
+
+        Retorna:
+        networkx.DiGraph: O grafo, com a posição de cada vértice no atributo 'pos'.
+        """
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from((nome, {"pos": tuple(posicao)}) for nome, posicao in zip(self.nomes, self.posicoes.tolist()))
+        origens, destinos, pesos = self.lista_arestas()
+        G.add_weighted_edges_from(
+            (self.nomes[i], self.nomes[j], peso) for i, j, peso in zip(origens.tolist(), destinos.tolist(), pesos.tolist())
+        )
+        return G
+
+    def salvar(self, caminho):
+        """Salva o grafo em um arquivo .npz não comprimido."""
+        np.savez(caminho, nomes=np.array(self.nomes), posicoes=self.posicoes, indptr=self.indptr,
+                 indices=self.indices, pesos=self.pesos)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Carrega um grafo salvo com salvar."""
+        with np.load(caminho) as arquivo:
+            return cls(arquivo["nomes"].tolist(), arquivo["posicoes"], arquivo["indptr"], arquivo["indices"],
+                       arquivo["pesos"])
+
+
+def _distancias_marcador(posicoes, posicoes_inimigas):
+    """A distância de cada posição ao adversário mais próximo, sem montar uma matriz (n, m) grande."""
+    if len(posicoes) * len(posicoes_inimigas) <= LIMITE_MATRIZ_MARCADORES:
+        return marcadores_mais_proximos(posicoes, posicoes_inimigas)[0]
+    return mais_proximos_em_lote(posicoes, posicoes_inimigas)[0]
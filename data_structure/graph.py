@@ -1,47 +1,209 @@
-import matplotlib.pyplot as plt
-import networkx as nx
 import math
+import numpy as np
+
+from data_structure.caminhos import (
+    caminho_limitado,
+    caminho_por_proximos,
+    dijkstra,
+    floyd_warshall,
+    k_caminhos_mais_curtos,
+    reconstroi_caminho,
+)
+from data_structure.espacial import GradeEspacial
+from data_structure.pesos import (
+    MODELO_PADRAO,
+    combina_termos,
+    marcadores_mais_proximos,
+    matriz_distancias,
+)
+from profiling.perfil import medir
+
 
 class GrafoSimples:
     """
     Representa um grafo simples direcionado com vértices posicionados.
 
+    Internamente o grafo é denso: cada vértice recebe um índice inteiro, as posições ficam em um
+    array (n, 2) e os pesos em uma matriz de adjacência (n, n) de float64, com infinito onde não
+    há aresta.
+
     Atributos:
     vertices (dict): Um dicionário que mapeia o nome do vértice para o objeto Vertice correspondente.
     """
 
     class Vertice:
         """
-        Representa um vértice em um grafo.
+        Representa um vértice em um grafo. É uma visão sobre os arrays do grafo ao qual pertence.
 
         Atributos:
         nome (str): O nome identificador do vértice.
+        indice (int): A linha/coluna do vértice na matriz de adjacência do grafo.
         posicao (tuple): A posição do vértice, geralmente como um par de coordenadas (x, y).
         arestas (list): Uma lista de tuplas representando as arestas e seus pesos para outros vértices.
         """
 
-        def __init__(self, nome, posicao):
+        __slots__ = ("nome", "indice", "_grafo")
+
+        def __init__(self, grafo, nome, indice):
             """
-            Inicializa um novo vértice com um nome e posição.
+            Inicializa um novo vértice ligado a um grafo.
 
             Parâmetros:
+            grafo (GrafoSimples): O grafo que armazena os dados do vértice.
             nome (str): O nome do vértice.
-            posicao (tuple): A posição do vértice.
+            indice (int): O índice do vértice no grafo.
             """
+            self._grafo = grafo
             self.nome = nome
-            self.posicao = posicao
-            self.arestas = []
+            self.indice = indice
+
+        @property
+        def posicao(self):
+            return tuple(self._grafo._posicoes[self.indice].tolist())
+
+        @posicao.setter
+        def posicao(self, posicao):
+            self._grafo.mover_posicao(self.nome, posicao)
+
+        @property
+        def arestas(self):
+            linha = self._grafo.pesos[self.indice]
+            destinos = np.flatnonzero(np.isfinite(linha))
+            vertices = self._grafo._lista_vertices
+            return [(vertices[j], peso) for j, peso in zip(destinos.tolist(), linha[destinos].tolist())]
 
     def __init__(self):
         """
         Inicializa um novo grafo simples sem vértices.
         """
         self.vertices = {}  # Armazena os objetos Vertice
-    
+        self._lista_vertices = []  # Vértices ordenados pelo índice
+        self._posicoes = np.zeros((0, 2), dtype=np.float64)
+        self._pesos = np.full((0, 0), np.inf, dtype=np.float64)
+        self._versao = 0  # Incrementada a cada alteração de vértices, posições ou arestas
+        self._tabela_caminhos = None
+        self._termos = None  # Termos de gol e marcador da última construção, usados nas atualizações incrementais
+        self._modelo = None  # O ModeloPeso da última construção
+        self._indice_espacial = None
+        self._memo_marcador = {}  # nome -> (time_inimigo, versao_inimigo, posicao, distancia)
+
+    @classmethod
+    def de_arrays(cls, nomes, posicoes, pesos):
+        """
+        Cria um grafo que usa diretamente os arrays informados, sem copiá-los.
+
+        Parâmetros:
+        nomes (list): Os nomes dos vértices, na ordem dos índices.
+        posicoes (ndarray): Array (n, 2) de float64 com as posições.
+        pesos (ndarray): Matriz (n, n) de float64 com os pesos, com infinito onde não há aresta.
+
+        Retorna:
+        GrafoSimples: O grafo, cujas posições e pesos são visões dos arrays.
+        """
+        grafo = cls()
+        grafo._posicoes = posicoes
+        grafo._pesos = pesos
+        for indice, nome in enumerate(nomes):
+            vertice = GrafoSimples.Vertice(grafo, nome, indice)
+            grafo._lista_vertices.append(vertice)
+            grafo.vertices[nome] = vertice
+        return grafo
+
+    @property
+    def versao(self):
+        """int: Um contador que muda sempre que o grafo é alterado."""
+        return self._versao
+
+    def _invalida(self):
+        """Registra uma alteração no grafo e descarta os dados derivados que dependem dele."""
+        self._versao += 1
+        self._tabela_caminhos = None
+
+    def invalida_caches(self):
+        """
+        Descarta todos os dados derivados guardados no grafo (a tabela de caminhos, o índice espacial e
+        as distâncias ao marcador memorizadas) e muda a versão.
+
+        Deve ser chamado depois de alterar diretamente os arrays de posicoes ou pesos, para que quem
+        depende do grafo perceba a mudança.
+        """
+        self._indice_espacial = None
+        self._memo_marcador.clear()
+        self._invalida()
+
+    @property
+    def posicoes(self):
+        """ndarray: Array (n, 2) com a posição de cada vértice, na ordem dos índices."""
+        return self._posicoes[:len(self._lista_vertices)]
+
+    @property
+    def pesos(self):
+        """ndarray: Matriz (n, n) com o peso de cada aresta, ou infinito quando ela não existe."""
+        n = len(self._lista_vertices)
+        return self._pesos[:n, :n]
+
+    @property
+    def nomes(self):
+        """list: Os nomes dos vértices, na ordem dos índices."""
+        return [vertice.nome for vertice in self._lista_vertices]
+
+    def indice(self, nome):
+        """
+        Retorna o índice de um vértice na matriz de adjacência.
+
+        Parâmetros:
+        nome (str): O nome do vértice.
+
+        Retorna:
+        int: O índice do vértice.
+        """
+        return self.vertices[nome].indice
+
+    def lista_arestas(self):
+        """
+        Retorna todas as arestas do grafo como arrays contíguos.
+
+        Retorna:
+        tuple: Três arrays (origens, destinos, pesos), com os índices de origem e destino e o peso de cada aresta.
+        """
+        origens, destinos = np.nonzero(np.isfinite(self.pesos))
+        return origens, destinos, self.pesos[origens, destinos]
+
+    def peso_aresta(self, de, para):
+        """
+        Retorna o peso da aresta entre dois vértices.
+
+        Parâmetros:
+        de (str): O nome do vértice de origem.
+        para (str): O nome do vértice de destino.
+
+        Retorna:
+        float: O peso da aresta, ou None se ela não existir.
+        """
+        peso = self.pesos[self.indice(de), self.indice(para)]
+        return float(peso) if np.isfinite(peso) else None
+
+    def _garante_capacidade(self, n):
+        """Aumenta os arrays internos, dobrando a capacidade, para caberem n vértices."""
+        capacidade = self._posicoes.shape[0]
+        if n <= capacidade:
+            return
+        nova_capacidade = max(n, 2 * capacidade, 16)
+        posicoes = np.zeros((nova_capacidade, 2), dtype=np.float64)
+        posicoes[:capacidade] = self._posicoes
+        pesos = np.full((nova_capacidade, nova_capacidade), np.inf, dtype=np.float64)
+        pesos[:capacidade, :capacidade] = self._pesos
+        self._posicoes = posicoes
+        self._pesos = pesos
+
+    @medir("GrafoSimples.construir_grafo_networkx")
     def construir_grafo_networkx(self):
         """
         Constrói um objeto grafo NetworkX a partir da estrutura atual do GrafoSimples.
         """
+        # Importado aqui para que quem só calcula pesos e caminhos não carregue o NetworkX
+        import networkx as nx
+
         grafo_nx = nx.DiGraph()  # Criar um grafo direcionado com NetworkX
         for vertice in self.vertices.values():
             grafo_nx.add_node(vertice.nome, pos=vertice.posicao)
@@ -58,7 +220,15 @@ class GrafoSimples:
         posicao (tuple): A posição do vértice a ser adicionado.
         """
         if nome not in self.vertices:
-            self.vertices[nome] = GrafoSimples.Vertice(nome, posicao)
+            indice = len(self._lista_vertices)
+            self._garante_capacidade(indice + 1)
+            self._posicoes[indice] = posicao
+            vertice = GrafoSimples.Vertice(self, nome, indice)
+            self._lista_vertices.append(vertice)
+            self.vertices[nome] = vertice
+            self._termos = None
+            self._indice_espacial = None
+            self._invalida()
 
     def calcula_distancia(self, pos1, pos2):
         """
@@ -73,7 +243,8 @@ class GrafoSimples:
         """
         return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
 
-    def adiciona_aresta(self, de, para, time_inimigo):
+    @medir("GrafoSimples.adiciona_aresta")
+    def adiciona_aresta(self, de, para, time_inimigo, modelo=None):
         """
         Adiciona uma aresta direcionada entre dois vértices no grafo. O peso é baseado na distância entre os vértices,
         proximidade ao gol e proximidade de adversários.
@@ -81,30 +252,84 @@ class GrafoSimples:
         Parâmetros:
         de (str): O nome do vértice de origem.
         para (str): O nome do vértice de destino.
+        modelo (ModeloPeso): O modelo de peso. Se omitido, usa MODELO_PADRAO.
         """
+        modelo = modelo or MODELO_PADRAO
         if de in self.vertices and para in self.vertices:
             distancia_passe = self.calcula_distancia(self.vertices[de].posicao, self.vertices[para].posicao)
-            distancia_ao_gol = self.calcula_distancia(self.vertices[de].posicao, (5.5, 0))
+            distancia_ao_gol = self.calcula_distancia(self.vertices[de].posicao, modelo.gol)
             distancia_para_marcador = self.distancia_marcador(para, time_inimigo)
 
-            # Quanto mais longe o passe, maior o peso
-            peso_distancia = distancia_passe ** 3.3
-
-            # Quanto mais perto do gol, menor o peso
-            peso_gol = max(1 - (distancia_ao_gol / 5), 0) ** 5
+            peso_final = modelo.peso(distancia_passe, distancia_ao_gol, distancia_para_marcador)
+            self._pesos[self.indice(de), self.indice(para)] = peso_final
+            self._invalida()
+            
+    def indice_espacial(self):
+        """
+        Retorna um índice espacial sobre as posições dos vértices, construído uma vez por configuração.
 
-            # Quanto mais próximo do marcador, maior o peso
-            peso_marcador = (1 / max(distancia_para_marcador, 0.1)) ** 3.1
+        Retorna:
+        GradeEspacial: A grade com as posições dos vértices, na ordem dos índices.
+        """
+        if self._indice_espacial is None:
+            self._indice_espacial = GradeEspacial(self.posicoes)
+        return self._indice_espacial
 
-            # Combinar os fatores para o peso final
-            peso_final = peso_distancia * (1 + peso_marcador - peso_gol)
-            self.vertices[de].arestas.append((self.vertices[para], peso_final))
-            
+    @medir("GrafoSimples.distancia_marcador")
     def distancia_marcador(self, vertice, time_inimigo):
+        """
+        Retorna a distância entre um vértice e o adversário mais próximo dele.
+
+        A consulta usa o índice espacial do time inimigo e o resultado fica memorizado por vértice
+        até que ele ou o time inimigo mudem.
+
+        Parâmetros:
+        vertice (str): O nome do vértice.
+        time_inimigo (GrafoSimples): O time adversário.
+
+        Retorna:
+        float: A distância até o marcador mais próximo.
+        """
         pos_vertice = self.vertices[vertice].posicao
-        distancias = [self.calcula_distancia(pos_vertice, time_inimigo.vertices[x].posicao) for x in time_inimigo.vertices]
-        return min(distancias)
+        memo = self._memo_marcador.get(vertice)
+        if memo is not None and memo[0] is time_inimigo and memo[1] == time_inimigo.versao and memo[2] == pos_vertice:
+            return memo[3]
+
+        distancia = time_inimigo.indice_espacial().mais_proximo(pos_vertice)[0]
+        self._memo_marcador[vertice] = (time_inimigo, time_inimigo.versao, pos_vertice, distancia)
+        return distancia
+
+    def marcadores_proximos(self, vertice, time_inimigo, k):
+        """
+        Retorna os k adversários mais próximos de um vértice.
+
+        Parâmetros:
+        vertice (str): O nome do vértice.
+        time_inimigo (GrafoSimples): O time adversário.
+        k (int): Quantos adversários retornar.
+
+        Retorna:
+        list: Tuplas (nome, distancia), em ordem crescente de distância.
+        """
+        vizinhos = time_inimigo.indice_espacial().k_mais_proximos(self.vertices[vertice].posicao, k)
+        return [(time_inimigo._lista_vertices[i].nome, distancia) for distancia, i in vizinhos]
+
+    def marcadores_no_raio(self, vertice, time_inimigo, raio):
+        """
+        Retorna os adversários a até uma certa distância de um vértice.
+
+        Parâmetros:
+        vertice (str): O nome do vértice.
+        time_inimigo (GrafoSimples): O time adversário.
+        raio (float): A distância máxima.
+
+        Retorna:
+        list: Tuplas (nome, distancia), em ordem crescente de distância.
+        """
+        vizinhos = time_inimigo.indice_espacial().no_raio(self.vertices[vertice].posicao, raio)
+        return [(time_inimigo._lista_vertices[i].nome, distancia) for distancia, i in vizinhos]
             
+    @medir("GrafoSimples.visualizar")
     def visualizar(self):
         """
         Imprime uma representação textual do grafo, mostrando vértices, suas posições e arestas.
@@ -129,53 +354,314 @@ class GrafoSimples:
         else:
             return "Vértice não encontrado"
 
-    def plotar_grafo(self):
+    def plotar_grafo(self, arquivo=None, time_inimigo=None, caminho=None):
         """
         Plota o grafo visualmente usando matplotlib.
+
+        As arestas são desenhadas como uma única coleção de linhas e os vértices como um único
+        scatter, pelo ExportadorFiguras de gui.exportacao.
+
+        Parâmetros:
+        arquivo (str): Se informado, a figura é salva nele (PNG, SVG...) sem abrir janela.
+        time_inimigo (GrafoSimples): Se informado, os adversários também são desenhados.
+        caminho (list): Se informado, o caminho (lista de nomes) é destacado.
         """
-        fig, ax = plt.subplots()
+        # Importados aqui para que quem só calcula pesos e caminhos não carregue o matplotlib
+        from gui.exportacao import ExportadorFiguras
 
-        # Desenhar vértices
-        for vertice in self.vertices.values():
-            ax.scatter(*vertice.posicao, s=100)  # s é o tamanho do ponto
-            ax.text(*vertice.posicao, vertice.nome, fontsize=12, ha='right')
+        if arquivo is not None:
+            exportador = ExportadorFiguras(limites=None)
+            exportador.desenha(self, time_inimigo, caminho)
+            exportador.salvar(arquivo)
+            return
 
-        # Desenhar arestas
-        for vertice in self.vertices.values():
-            for vizinho, peso in vertice.arestas:
-                ax.arrow(
-                    *vertice.posicao,
-                    *(vizinho.posicao[0] - vertice.posicao[0], vizinho.posicao[1] - vertice.posicao[1]),
-                    head_width=5,
-                    head_length=10,
-                    fc='lightblue',
-                    ec='black'
-                )
+        import matplotlib.pyplot as plt
 
+        exportador = ExportadorFiguras(limites=None, figura=plt.figure())
+        exportador.desenha(self, time_inimigo, caminho)
         plt.show()
 
-    def cria_grafo_completo(self, time_inimigo,):
+    @medir("GrafoSimples.cria_grafo_completo")
+    def cria_grafo_completo(self, time_inimigo, modelo=None):
         """
         Cria um grafo completo, adicionando uma aresta direcionada entre cada par de vértices.
+
+        Os pesos de todas as arestas são calculados de uma vez, em forma matricial, com a mesma
+        fórmula de adiciona_aresta.
+
+        Parâmetros:
+        time_inimigo (GrafoSimples): O time adversário usado no cálculo dos pesos.
+        modelo (ModeloPeso): O modelo de peso. Se omitido, usa MODELO_PADRAO. As atualizações
+        incrementais seguintes usam o mesmo modelo.
+        """
+        modelo = modelo or MODELO_PADRAO
+        self._calcula_termos(time_inimigo, modelo)
+
+        pesos = self._pesos_dos_termos()
+        np.fill_diagonal(pesos, np.inf)
+        self.pesos[:] = pesos
+        self._invalida()
+
+    def _calcula_termos(self, time_inimigo, modelo):
+        """Calcula e guarda os termos de gol e de marcador de todos os vértices contra o time inimigo."""
+        self._modelo = modelo
+        distancia_marcador, indice_marcador = marcadores_mais_proximos(self.posicoes, time_inimigo.posicoes)
+        self._termos = {
+            "time_inimigo": time_inimigo,
+            "versao_inimigo": time_inimigo.versao,
+            "gol": modelo.termo_gol(modelo.distancias_ao_gol(self.posicoes)),
+            "distancia_marcador": distancia_marcador,
+            "indice_marcador": indice_marcador,
+            "marcador": modelo.termo_marcador(distancia_marcador),
+        }
+
+    def _pesos_dos_termos(self):
+        """Retorna a matriz (n, n) com o peso de todos os passes possíveis, a partir dos termos guardados."""
+        return combina_termos(self._modelo.termo_distancia(matriz_distancias(self.posicoes)), self._termos["gol"],
+                              self._termos["marcador"])
+
+    def _recalcula_arestas(self, time_inimigo):
+        """
+        Recalcula os termos e o peso de todas as arestas que já existem, sem criar nem remover arestas.
+
+        É o caminho das atualizações incrementais quando os termos guardados não valem mais. Um grafo
+        montado só com algumas chamadas a adiciona_aresta continua com as mesmas arestas.
+        """
+        existentes = np.isfinite(self.pesos)
+        self._calcula_termos(time_inimigo, self._modelo or MODELO_PADRAO)
+        self.pesos[existentes] = self._pesos_dos_termos()[existentes]
+        self._invalida()
+
+    def _termos_sincronizados(self, time_inimigo):
+        """
+        Indica se os termos guardados na última construção ainda valem para o time inimigo informado.
         """
-        for nome_vertice1 in self.vertices:
-            for nome_vertice2 in self.vertices:
-                if nome_vertice1 != nome_vertice2:
-                    self.adiciona_aresta(nome_vertice1, nome_vertice2, time_inimigo)
+        return (
+            self._termos is not None
+            and self._termos["time_inimigo"] is time_inimigo
+            and self._termos["versao_inimigo"] == time_inimigo.versao
+        )
+
+    def mover_posicao(self, nome, nova_posicao):
+        """
+        Muda só a posição de um vértice, sem recalcular nenhum peso, e muda a versão do grafo.
+
+        É a forma de mover um jogador do time inimigo antes de chamar atualiza_marcador no grafo de
+        passes. Em um grafo de passes, os pesos deixam de corresponder às posições, e a próxima
+        atualização incremental recalcula as arestas existentes.
+
+        Parâmetros:
+        nome (str): O nome do vértice a ser movido.
+        nova_posicao (tuple): A nova posição do vértice.
+        """
+        self._posicoes[self.indice(nome)] = nova_posicao
+        self._termos = None
+        self._indice_espacial = None
+        self._invalida()
+
+    @medir("GrafoSimples.mover_vertice")
+    def mover_vertice(self, nome, nova_posicao, time_inimigo):
+        """
+        Move um vértice e recalcula apenas as arestas que saem dele ou chegam nele.
+
+        Custa O(n·m) em vez das O(n²·m) operações de uma reconstrução completa. Se o grafo não foi
+        construído com cria_grafo_completo contra esse mesmo time inimigo, ou se o time inimigo mudou
+        desde então, os pesos de todas as arestas existentes são recalculados, sem criar arestas novas.
+
+        Parâmetros:
+        nome (str): O nome do vértice a ser movido.
+        nova_posicao (tuple): A nova posição do vértice.
+        time_inimigo (GrafoSimples): O time adversário usado no cálculo dos pesos.
+        """
+        i = self.indice(nome)
+        self._posicoes[i] = nova_posicao
+        self._indice_espacial = None
+        if not self._termos_sincronizados(time_inimigo):
+            self._recalcula_arestas(time_inimigo)
+            return
+
+        termos = self._termos
+        modelo = self._modelo
+        posicao = self._posicoes[i:i + 1]
+        distancia, indice = marcadores_mais_proximos(posicao, time_inimigo.posicoes)
+        termos["distancia_marcador"][i] = distancia[0]
+        termos["indice_marcador"][i] = indice[0]
+        termos["marcador"][i] = modelo.termo_marcador(distancia)[0]
+        termos["gol"][i] = modelo.termo_gol(modelo.distancias_ao_gol(posicao))[0]
+
+        peso_distancia = modelo.termo_distancia(matriz_distancias(posicao, self.posicoes)[0])
+        pesos = self.pesos
+        saida = np.isfinite(pesos[i])
+        chegada = np.isfinite(pesos[:, i])
+        pesos[i, saida] = combina_termos(
+            peso_distancia[None, saida], termos["gol"][i:i + 1], termos["marcador"][saida]
+        )[0]
+        pesos[chegada, i] = combina_termos(
+            peso_distancia[chegada, None], termos["gol"][chegada], termos["marcador"][i:i + 1]
+        )[:, 0]
+        self._invalida()
+
+    @medir("GrafoSimples.atualiza_marcador")
+    def atualiza_marcador(self, nome_marcador, time_inimigo):
+        """
+        Atualiza os pesos depois que um jogador do time inimigo foi movido com mover_posicao.
+
+        Só os jogadores cujo marcador mais próximo mudou têm as arestas de chegada recalculadas. Se o
+        time inimigo mudou mais de uma vez desde a última atualização, os pesos de todas as arestas
+        existentes são recalculados, sem criar arestas novas.
+
+        Parâmetros:
+        nome_marcador (str): O nome do jogador do time inimigo que se moveu.
+        time_inimigo (GrafoSimples): O time adversário, já com a nova posição do marcador.
+        """
+        if self._termos_sincronizados(time_inimigo):
+            return
+        termos = self._termos
+        if termos is None or termos["time_inimigo"] is not time_inimigo \
+                or termos["versao_inimigo"] + 1 != time_inimigo.versao:
+            self._recalcula_arestas(time_inimigo)
+            return
+        termos["versao_inimigo"] = time_inimigo.versao
+
+        k = time_inimigo.indice(nome_marcador)
+        distancias = matriz_distancias(self.posicoes, time_inimigo.posicoes[k:k + 1])[:, 0]
+        distancia_atual = termos["distancia_marcador"]
+        era_o_mais_proximo = termos["indice_marcador"] == k
+
+        # Quem ficou mais perto do marcador passa a tê-lo como mais próximo
+        aproximou = distancias < distancia_atual
+        # Quem tinha esse marcador como mais próximo e ficou mais longe precisa procurar de novo
+        afastou = era_o_mais_proximo & (distancias > distancia_atual)
+        mudou = aproximou | (era_o_mais_proximo & (distancias != distancia_atual))
 
-    def encontra_caminho_mais_curto(self, origem, destino):
+        distancia_atual[aproximou | era_o_mais_proximo] = distancias[aproximou | era_o_mais_proximo]
+        termos["indice_marcador"][aproximou] = k
+        if afastou.any():
+            novas_distancias, novos_indices = marcadores_mais_proximos(self.posicoes[afastou], time_inimigo.posicoes)
+            distancia_atual[afastou] = novas_distancias
+            termos["indice_marcador"][afastou] = novos_indices
+
+        if not mudou.any():
+            return
+
+        modelo = self._modelo
+        termos["marcador"][mudou] = modelo.termo_marcador(distancia_atual[mudou])
+        pesos = self.pesos
+        for j in np.flatnonzero(mudou).tolist():
+            chegada = np.isfinite(pesos[:, j])
+            peso_distancia = modelo.termo_distancia(
+                matriz_distancias(self.posicoes[chegada], self.posicoes[j:j + 1])[:, 0]
+            )
+            pesos[chegada, j] = combina_termos(
+                peso_distancia[:, None], termos["gol"][chegada], termos["marcador"][j:j + 1]
+            )[:, 0]
+        self._invalida()
+
+    @medir("GrafoSimples.encontra_caminho_mais_curto")
+    def encontra_caminho_mais_curto(self, origem, destino, retornar_custo=False):
         """
         Encontra o caminho mais curto entre dois vértices usando o algoritmo de Dijkstra.
 
+        A busca roda direto sobre a matriz de adjacência do grafo, sem montar um grafo NetworkX.
+
+        :param origem: O nome do vértice de origem.
+        :param destino: O nome do vértice de destino.
+        :param retornar_custo: Se True, retorna também o custo total do caminho.
+        :return: Uma lista de vértices representando o caminho mais curto, ou uma tupla (caminho, custo).
+        """
+        indice_origem = self.indice(origem)
+        indice_destino = self.indice(destino)
+        distancias, predecessores = dijkstra(self.pesos, indice_origem, indice_destino)
+        caminho = reconstroi_caminho(predecessores, indice_origem, indice_destino)
+
+        if caminho is None:
+            caminho = "Não há caminho disponível."
+        else:
+            caminho = [self._lista_vertices[i].nome for i in caminho]
+
+        if retornar_custo:
+            return caminho, float(distancias[indice_destino])
+        return caminho
+
+    @medir("GrafoSimples.tabela_caminhos")
+    def tabela_caminhos(self):
+        """
+        Retorna as tabelas de custos mínimos e próximos saltos entre todos os pares de vértices.
+
+        As tabelas são calculadas uma vez, com Floyd–Warshall, e reaproveitadas até que um vértice,
+        uma posição ou uma aresta do grafo mude.
+
+        Retorna:
+        tuple: Duas matrizes (custos, proximos), indexadas pelos índices dos vértices.
+        """
+        if self._tabela_caminhos is None:
+            self._tabela_caminhos = floyd_warshall(self.pesos)
+        return self._tabela_caminhos
+
+    def caminho_tabelado(self, origem, destino, retornar_custo=False):
+        """
+        Encontra o caminho mais curto entre dois vértices consultando a tabela de todos os pares.
+
+        Depois que a tabela existe, cada consulta custa O(comprimento do caminho).
+
         :param origem: O nome do vértice de origem.
         :param destino: O nome do vértice de destino.
-        :return: Uma lista de vértices representando o caminho mais curto.
+        :param retornar_custo: Se True, retorna também o custo total do caminho.
+        :return: Uma lista de vértices representando o caminho mais curto, ou uma tupla (caminho, custo).
         """
-        grafo_nx = self.construir_grafo_networkx()
-        try:
-            return nx.dijkstra_path(grafo_nx, origem, destino)
-        except nx.NetworkXNoPath:
-            return "Não há caminho disponível."
+        custos, proximos = self.tabela_caminhos()
+        indice_origem = self.indice(origem)
+        indice_destino = self.indice(destino)
+        caminho = caminho_por_proximos(proximos, indice_origem, indice_destino)
+
+        if caminho is None:
+            caminho = "Não há caminho disponível."
+        else:
+            caminho = [self._lista_vertices[i].nome for i in caminho]
+
+        if retornar_custo:
+            return caminho, float(custos[indice_origem, indice_destino])
+        return caminho
+
+    @medir("GrafoSimples.k_caminhos_mais_curtos")
+    def k_caminhos_mais_curtos(self, origem, destino, k, retornar_custo=False):
+        """
+        Encontra as k rotas de passe de menor custo entre dois vértices, sem repetir jogadores.
+
+        As rotas são calculadas pelo algoritmo de Yen direto sobre a matriz de adjacência do grafo.
+
+        :param origem: O nome do vértice de origem.
+        :param destino: O nome do vértice de destino.
+        :param k: Quantas rotas retornar.
+        :param retornar_custo: Se True, cada rota vem em uma tupla (caminho, custo).
+        :return: Uma lista com até k rotas, em ordem crescente de custo; vazia se não há caminho.
+        """
+        rotas = k_caminhos_mais_curtos(self.pesos, self.indice(origem), self.indice(destino), k)
+        rotas = [([self._lista_vertices[i].nome for i in caminho], custo) for caminho, custo in rotas]
+        if retornar_custo:
+            return rotas
+        return [caminho for caminho, _ in rotas]
+
+    def caminho_com_limite_de_passes(self, origem, destino, max_passes, retornar_custo=False):
+        """
+        Encontra o caminho de menor custo entre dois vértices com no máximo 'max_passes' passes.
+
+        :param origem: O nome do vértice de origem.
+        :param destino: O nome do vértice de destino.
+        :param max_passes: O número máximo de arestas do caminho.
+        :param retornar_custo: Se True, retorna também o custo total do caminho.
+        :return: Uma lista de vértices representando o caminho, ou uma tupla (caminho, custo).
+        """
+        caminho, custo = caminho_limitado(self.pesos, self.indice(origem), self.indice(destino), max_passes)
+
+        if caminho is None:
+            caminho = "Não há caminho disponível."
+        else:
+            caminho = [self._lista_vertices[i].nome for i in caminho]
+
+        if retornar_custo:
+            return caminho, custo
+        return caminho
 
 if __name__ == "__main__":
     pass
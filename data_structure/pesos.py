@@ -0,0 +1,315 @@
+import math
+from itertools import repeat
+
+import numpy as np
+
+# Posição do gol adversário, usada no termo de proximidade ao gol
+POSICAO_GOL = (5.5, 0)
+
+
+def matriz_distancias(posicoes, outras_posicoes=None):
+    """
+    Calcula as distâncias euclidianas entre todos os pares de pontos de uma vez.
+
+    Parâmetros:
+    posicoes (array): Um array (n, 2) com as posições de origem.
+    outras_posicoes (array): Um array (m, 2) com as posições de destino. Se omitido, usa as próprias posições.
+
+    Retorna:
+    ndarray: Uma matriz (n, m) em que o elemento [i, j] é a distância entre a posição i e a posição j.
+    """
+    posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+    if outras_posicoes is None:
+        outras_posicoes = posicoes
+    else:
+        outras_posicoes = np.asarray(outras_posicoes, dtype=np.float64).reshape(-1, 2)
+
+    dx = posicoes[:, 0, None] - outras_posicoes[None, :, 0]
+    dy = posicoes[:, 1, None] - outras_posicoes[None, :, 1]
+    return np.sqrt(dx**2 + dy**2)
+
+
+def distancias_ao_gol(posicoes, gol=POSICAO_GOL):
+    """
+    Calcula a distância de cada posição até o gol.
+
+    Parâmetros:
+    posicoes (array): Um array (n, 2) com as posições dos jogadores.
+    gol (tuple): A posição do gol.
+
+    Retorna:
+    ndarray: Um vetor (n,) com as distâncias.
+    """
+    return matriz_distancias(posicoes, [gol])[:, 0]
+
+
+def distancias_marcador(posicoes, posicoes_inimigas):
+    """
+    Calcula, para cada jogador, a distância até o adversário mais próximo.
+
+    Parâmetros:
+    posicoes (array): Um array (n, 2) com as posições dos jogadores.
+    posicoes_inimigas (array): Um array (m, 2) com as posições dos adversários.
+
+    Retorna:
+    ndarray: Um vetor (n,) com a distância ao marcador mais próximo de cada jogador.
+    """
+    return marcadores_mais_proximos(posicoes, posicoes_inimigas)[0]
+
+
+def marcadores_mais_proximos(posicoes, posicoes_inimigas):
+    """
+    Encontra, para cada jogador, o adversário mais próximo e a distância até ele.
+
+    Parâmetros:
+    posicoes (array): Um array (n, 2) com as posições dos jogadores.
+    posicoes_inimigas (array): Um array (m, 2) com as posições dos adversários.
+
+    Retorna:
+    tuple: Dois vetores (distancias, indices), com a distância ao marcador mais próximo e o índice dele.
+    """
+    distancias = matriz_distancias(posicoes, posicoes_inimigas)
+    indices = distancias.argmin(axis=1)
+    return distancias[np.arange(distancias.shape[0]), indices], indices
+
+
+def potencia(base, expoente):
+    """
+    Eleva cada elemento de um array a um expoente usando o pow da libm.
+
+    O np.power vetorizado (SIMD) pode diferir do operador ** do Python no último bit. Para que os
+    pesos calculados em lote sejam idênticos aos calculados aresta a aresta, as potências passam
+    pela mesma implementação usada pelo Python.
+
+    Parâmetros:
+    base (ndarray): O array de bases.
+    expoente (float): O expoente.
+
+    Retorna:
+    ndarray: Um array com o mesmo formato de base.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    resultado = np.fromiter(map(math.pow, base.ravel().tolist(), repeat(float(expoente))), np.float64, base.size)
+    return resultado.reshape(base.shape)
+
+
+def combina_termos(peso_distancia, peso_gol, peso_marcador):
+    """
+    Combina os fatores no peso final das arestas.
+
+    O termo de gol é da origem do passe (linhas) e o termo de marcador é do destino (colunas).
+
+    Parâmetros:
+    peso_distancia (ndarray): Matriz (n, n) com o termo de distância de cada passe.
+    peso_gol (ndarray): Vetor (n,) com o termo de gol de cada origem.
+    peso_marcador (ndarray): Vetor (n,) com o termo de marcador de cada destino.
+
+    Retorna:
+    ndarray: Matriz (n, n) com os pesos finais.
+    """
+    return peso_distancia * (1 + peso_marcador[None, :] - peso_gol[:, None])
+
+
+class ModeloPeso:
+    """
+    Um modelo de peso de passe: a fórmula de GrafoSimples.adiciona_aresta com os parâmetros livres.
+
+        peso = distancia_passe ** expoente_distancia
+               * (1 + termo_marcador(destino) - termo_gol(origem))
+        termo_gol = max(1 - distancia_ao_gol / raio_gol, 0) ** expoente_gol
+        termo_marcador = (1 / max(distancia_para_marcador, distancia_minima_marcador)) ** expoente_marcador
+
+    Os termos são avaliados sobre arrays inteiros, com o pow da libm, então os pesos são idênticos
+    aos calculados aresta a aresta. Dois modelos com os mesmos parâmetros são iguais.
+
+    Atributos:
+    expoente_distancia (float): O expoente da distância do passe.
+    expoente_gol (float): O expoente do termo de proximidade ao gol.
+    expoente_marcador (float): O expoente do termo de proximidade do marcador.
+    gol (tuple): A posição do gol.
+    raio_gol (float): A distância ao gol a partir da qual o termo de gol é zero.
+    distancia_minima_marcador (float): O piso da distância ao marcador.
+    """
+
+    def __init__(self, expoente_distancia=3.3, expoente_gol=5, expoente_marcador=3.1, gol=POSICAO_GOL,
+                 raio_gol=5, distancia_minima_marcador=0.1):
+        self.expoente_distancia = expoente_distancia
+        self.expoente_gol = expoente_gol
+        self.expoente_marcador = expoente_marcador
+        self.gol = tuple(gol)
+        self.raio_gol = raio_gol
+        self.distancia_minima_marcador = distancia_minima_marcador
+
+    @property
+    def parametros(self):
+        """tuple: Os parâmetros do modelo, na ordem do construtor."""
+        return (self.expoente_distancia, self.expoente_gol, self.expoente_marcador, self.gol, self.raio_gol,
+                self.distancia_minima_marcador)
+
+    def __eq__(self, outro):
+        return isinstance(outro, ModeloPeso) and self.parametros == outro.parametros
+
+    def __hash__(self):
+        return hash(self.parametros)
+
+    def __repr__(self):
+        return (f"ModeloPeso(expoente_distancia={self.expoente_distancia}, expoente_gol={self.expoente_gol}, "
+                f"expoente_marcador={self.expoente_marcador}, gol={self.gol}, raio_gol={self.raio_gol}, "
+                f"distancia_minima_marcador={self.distancia_minima_marcador})")
+
+    def peso(self, distancia_passe, distancia_ao_gol, distancia_para_marcador):
+        """Calcula o peso de um único passe a partir das três distâncias."""
+        # Quanto mais longe o passe, maior o peso
+        peso_distancia = distancia_passe ** self.expoente_distancia
+
+        # Quanto mais perto do gol, menor o peso
+        peso_gol = max(1 - (distancia_ao_gol / self.raio_gol), 0) ** self.expoente_gol
+
+        # Quanto mais próximo do marcador, maior o peso
+        peso_marcador = (1 / max(distancia_para_marcador, self.distancia_minima_marcador)) ** self.expoente_marcador
+
+        # Combinar os fatores para o peso final
+        return peso_distancia * (1 + peso_marcador - peso_gol)
+
+    def termo_distancia(self, distancia_passe):
+        """Quanto mais longe o passe, maior o peso."""
+        return potencia(distancia_passe, self.expoente_distancia)
+
+    def termo_gol(self, distancia_ao_gol):
+        """Quanto mais perto do gol, menor o peso."""
+        return potencia(np.maximum(1 - (distancia_ao_gol / self.raio_gol), 0), self.expoente_gol)
+
+    def termo_marcador(self, distancia_para_marcador):
+        """Quanto mais próximo do marcador, maior o peso."""
+        return potencia(1 / np.maximum(distancia_para_marcador, self.distancia_minima_marcador), self.expoente_marcador)
+
+    def distancias_ao_gol(self, posicoes):
+        """A distância de cada posição até o gol deste modelo."""
+        return distancias_ao_gol(posicoes, self.gol)
+
+    def matriz(self, geometria):
+        """
+        Calcula os pesos de todos os passes de uma geometria de uma vez.
+
+        Parâmetros:
+        geometria (GeometriaPasses): As distâncias já calculadas das posições.
+
+        Retorna:
+        ndarray: Matriz (n, n) com os pesos. A diagonal não tem significado.
+        """
+        return combina_termos(
+            self.termo_distancia(geometria.distancias),
+            self.termo_gol(geometria.distancias_ao_gol(self.gol)),
+            self.termo_marcador(geometria.distancias_marcador),
+        )
+
+
+# O modelo usado quando nenhum é informado: a fórmula original de adiciona_aresta
+MODELO_PADRAO = ModeloPeso()
+
+
+def termo_distancia(distancia_passe):
+    """Quanto mais longe o passe, maior o peso."""
+    return MODELO_PADRAO.termo_distancia(distancia_passe)
+
+
+def termo_gol(distancia_ao_gol):
+    """Quanto mais perto do gol, menor o peso."""
+    return MODELO_PADRAO.termo_gol(distancia_ao_gol)
+
+
+def termo_marcador(distancia_para_marcador):
+    """Quanto mais próximo do marcador, maior o peso."""
+    return MODELO_PADRAO.termo_marcador(distancia_para_marcador)
+
+
+class GeometriaPasses:
+    """
+    As distâncias de que os modelos de peso precisam, calculadas uma vez por configuração de jogadores.
+
+    Atributos:
+    posicoes (ndarray): Array (n, 2) com as posições dos jogadores do time.
+    distancias (ndarray): Matriz (n, n) com a distância de cada passe.
+    distancias_marcador (ndarray): Vetor (n,) com a distância de cada jogador ao marcador mais próximo.
+    indices_marcador (ndarray): Vetor (n,) com o índice do marcador mais próximo de cada jogador.
+    """
+
+    def __init__(self, posicoes, posicoes_inimigas):
+        """
+        Parâmetros:
+        posicoes (array): Um array (n, 2) com as posições dos jogadores do time.
+        posicoes_inimigas (array): Um array (m, 2) com as posições dos adversários.
+        """
+        self.posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+        self.distancias = matriz_distancias(self.posicoes)
+        self.distancias_marcador, self.indices_marcador = marcadores_mais_proximos(self.posicoes, posicoes_inimigas)
+        self._distancias_ao_gol = {}
+
+    def distancias_ao_gol(self, gol=POSICAO_GOL):
+        """As distâncias de cada jogador até o gol, calculadas uma vez por posição do gol."""
+        gol = tuple(gol)
+        if gol not in self._distancias_ao_gol:
+            self._distancias_ao_gol[gol] = distancias_ao_gol(self.posicoes, gol)
+        return self._distancias_ao_gol[gol]
+
+
+def matriz_pesos(posicoes, posicoes_inimigas, modelo=None):
+    """
+    Calcula o peso de todos os passes possíveis entre os jogadores de um time em uma única operação.
+
+    Aplica, elemento a elemento, a mesma fórmula de GrafoSimples.adiciona_aresta.
+
+    Parâmetros:
+    posicoes (array): Um array (n, 2) com as posições dos jogadores do time.
+    posicoes_inimigas (array): Um array (m, 2) com as posições dos adversários.
+    modelo (ModeloPeso): O modelo de peso. Se omitido, usa MODELO_PADRAO.
+
+    Retorna:
+    ndarray: Matriz (n, n) em que o elemento [i, j] é o peso do passe de i para j. A diagonal não tem significado.
+    """
+    return (modelo or MODELO_PADRAO).matriz(GeometriaPasses(posicoes, posicoes_inimigas))
+
+
+def _log_potencia(log_base, expoentes):
+    """base ** expoente para vários expoentes de uma vez, como exp(expoente * log(base))."""
+    expoentes = np.asarray(expoentes, dtype=np.float64).reshape((-1,) + (1,) * (log_base.ndim - 1))
+    with np.errstate(invalid="ignore"):
+        potencias = np.exp(expoentes * log_base)
+    # Com base zero e expoente zero, 0 * -inf dá NaN; como em math.pow, o resultado é 1
+    return np.where(np.isneginf(log_base) & (expoentes == 0), 1.0, potencias)
+
+
+def varre_modelos(modelos, geometria):
+    """
+    Calcula a matriz de pesos de vários modelos sobre a mesma geometria em poucas operações.
+
+    As distâncias vêm da geometria, calculadas uma só vez, e as potências de todos os modelos são
+    avaliadas juntas como exp(expoente * log(base)), com o logaritmo de cada base calculado uma vez.
+    Por isso o resultado pode diferir de ModeloPeso.matriz nos últimos bits (erro relativo da
+    ordem de 1e-15 vezes o expoente).
+
+    Parâmetros:
+    modelos (list): Os ModeloPeso a avaliar.
+    geometria (GeometriaPasses): As distâncias das posições.
+
+    Retorna:
+    ndarray: Array (P, n, n) com a matriz de pesos de cada um dos P modelos, na ordem dada.
+    """
+    modelos = list(modelos)
+    n = geometria.posicoes.shape[0]
+    expoentes_distancia = [m.expoente_distancia for m in modelos]
+    expoentes_gol = [m.expoente_gol for m in modelos]
+    expoentes_marcador = [m.expoente_marcador for m in modelos]
+
+    with np.errstate(divide="ignore"):
+        peso_distancia = _log_potencia(np.log(geometria.distancias)[None], expoentes_distancia)
+
+        distancias_ao_gol = np.array([geometria.distancias_ao_gol(m.gol) for m in modelos]).reshape(-1, n)
+        raios = np.array([m.raio_gol for m in modelos], dtype=np.float64)[:, None]
+        peso_gol = _log_potencia(np.log(np.maximum(1 - distancias_ao_gol / raios, 0)), expoentes_gol)
+
+        pisos = np.array([m.distancia_minima_marcador for m in modelos], dtype=np.float64)[:, None]
+        log_marcador = -np.log(np.maximum(geometria.distancias_marcador[None, :], pisos))
+        peso_marcador = _log_potencia(log_marcador, expoentes_marcador)
+
+    return peso_distancia * (1 + peso_marcador[:, None, :] - peso_gol[:, :, None])
@@ -0,0 +1,179 @@
+"""Formato binário compacto para grafos e sequências de quadros.
+
+O arquivo tem um cabeçalho de tamanho fixo seguido de registros de tamanho fixo, um por quadro:
+
+    8 bytes   assinatura b"FGRAFO01"
+    4 bytes   tamanho do cabeçalho JSON (uint32, little-endian)
+    ...       cabeçalho JSON com os nomes dos vértices, completado com espaços até múltiplo de 64 bytes
+    ...       registros: posicoes (n, 2), pesos (n, n) e, opcionalmente, posicoes_inimigas (m, 2), em float64
+
+Como o layout é fixo, a leitura mapeia o arquivo na memória com np.memmap e os arrays são visões
+sobre ele, sem cópia. Os registros são acrescentados um a um, então sequências longas podem ser
+gravadas sem manter os quadros na memória.
+"""
+import json
+import struct
+
+import numpy as np
+
+from data_structure.graph import GrafoSimples
+
+ASSINATURA = b"FGRAFO01"
+ALINHAMENTO = 64
+
+
+def _tipo_registro(n, m):
+    """O dtype estruturado de um quadro com n vértices e m adversários."""
+    campos = [("posicoes", "<f8", (n, 2)), ("pesos", "<f8", (n, n))]
+    if m is not None:
+        campos.append(("posicoes_inimigas", "<f8", (m, 2)))
+    return np.dtype(campos)
+
+
+class GravadorSequencia:
+    """
+    Grava uma sequência de quadros de um mesmo par de times, um quadro por vez.
+
+    Pode ser usado como gerenciador de contexto:
+
+        with GravadorSequencia("partida.fgr", grafo.nomes, time_inimigo.nomes) as gravador:
+            for ...:
+                gravador.adiciona(grafo, time_inimigo)
+    """
+
+    def __init__(self, caminho, nomes, nomes_inimigos=None):
+        """
+        Cria o arquivo e grava o cabeçalho.
+
+        Parâmetros:
+        caminho (str): O arquivo de saída.
+        nomes (list): Os nomes dos vértices, na ordem dos índices.
+        nomes_inimigos (list): Os nomes dos adversários. Se omitido, as posições deles não são gravadas.
+        """
+        self.nomes = list(nomes)
+        self.nomes_inimigos = list(nomes_inimigos) if nomes_inimigos is not None else None
+        self.quadros = 0
+        self._tipo = _tipo_registro(len(self.nomes), None if self.nomes_inimigos is None else len(self.nomes_inimigos))
+
+        cabecalho = json.dumps({"versao": 1, "nomes": self.nomes, "nomes_inimigos": self.nomes_inimigos},
+                               ensure_ascii=False).encode("utf-8")
+        tamanho = len(ASSINATURA) + 4 + len(cabecalho)
+        cabecalho += b" " * (-tamanho % ALINHAMENTO)
+
+        self._arquivo = open(caminho, "wb")
+        self._arquivo.write(ASSINATURA + struct.pack("<I", len(cabecalho)) + cabecalho)
+
+    def adiciona(self, grafo, time_inimigo=None):
+        """
+        Grava as posições e os pesos atuais de um grafo como um novo quadro.
+
+        Parâmetros:
+        grafo (GrafoSimples): O grafo, com os vértices na mesma ordem de 'nomes'.
+        time_inimigo (GrafoSimples): O time adversário, obrigatório se o arquivo guarda as posições dele.
+        """
+        self.adiciona_arrays(grafo.posicoes, grafo.pesos, None if time_inimigo is None else time_inimigo.posicoes)
+
+    def adiciona_arrays(self, posicoes, pesos, posicoes_inimigas=None):
+        """Grava um quadro a partir dos arrays de posições e pesos."""
+        registro = np.zeros((), dtype=self._tipo)
+        registro["posicoes"] = posicoes
+        registro["pesos"] = pesos
+        if self.nomes_inimigos is not None:
+            if posicoes_inimigas is None:
+                raise ValueError("Este arquivo guarda as posições dos adversários; informe o time inimigo.")
+            registro["posicoes_inimigas"] = posicoes_inimigas
+        self._arquivo.write(registro.tobytes())
+        self.quadros += 1
+
+    def fecha(self):
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fecha()
+
+
+class SequenciaGravada:
+    """
+    Uma sequência de quadros lida de um arquivo, mapeada na memória sem cópia.
+
+    Atributos:
+    nomes (list): Os nomes dos vértices.
+    nomes_inimigos (list): Os nomes dos adversários, ou None.
+    posicoes (ndarray): Array (quadros, n, 2) com as posições de cada quadro.
+    pesos (ndarray): Array (quadros, n, n) com a matriz de pesos de cada quadro.
+    posicoes_inimigas (ndarray): Array (quadros, m, 2), ou None.
+    """
+
+    def __init__(self, caminho, modo="r"):
+        """
+        Abre um arquivo gravado por GravadorSequencia.
+
+        Parâmetros:
+        caminho (str): O arquivo.
+        modo (str): O modo do np.memmap. Com "c" (cópia na escrita), os arrays podem ser alterados sem mudar o arquivo.
+        """
+        with open(caminho, "rb") as arquivo:
+            if arquivo.read(len(ASSINATURA)) != ASSINATURA:
+                raise ValueError(f"{caminho} não é um arquivo de grafos gravado por GravadorSequencia.")
+            (tamanho,) = struct.unpack("<I", arquivo.read(4))
+            cabecalho = json.loads(arquivo.read(tamanho))
+
+        self.nomes = cabecalho["nomes"]
+        self.nomes_inimigos = cabecalho["nomes_inimigos"]
+        tipo = _tipo_registro(len(self.nomes), None if self.nomes_inimigos is None else len(self.nomes_inimigos))
+        registros = np.memmap(caminho, dtype=tipo, mode=modo, offset=len(ASSINATURA) + 4 + tamanho)
+
+        self._registros = registros
+        self.posicoes = registros["posicoes"]
+        self.pesos = registros["pesos"]
+        self.posicoes_inimigas = registros["posicoes_inimigas"] if self.nomes_inimigos is not None else None
+
+    def __len__(self):
+        return self._registros.shape[0]
+
+    def grafo(self, quadro=0):
+        """
+        Retorna um GrafoSimples cujos arrays são visões do quadro no arquivo.
+
+        Retorna:
+        GrafoSimples: O grafo do quadro. Só pode ser alterado se o arquivo foi aberto no modo "c".
+        """
+        return GrafoSimples.de_arrays(self.nomes, self.posicoes[quadro], self.pesos[quadro])
+
+    def time_inimigo(self, quadro=0):
+        """Retorna um GrafoSimples, sem arestas, com as posições dos adversários no quadro."""
+        if self.nomes_inimigos is None:
+            return None
+        m = len(self.nomes_inimigos)
+        return GrafoSimples.de_arrays(self.nomes_inimigos, self.posicoes_inimigas[quadro], np.full((m, m), np.inf))
+
+
+def salvar_grafo(grafo, caminho, time_inimigo=None):
+    """
+    Salva um único grafo (nomes, posições e pesos) no formato binário.
+
+    Parâmetros:
+    grafo (GrafoSimples): O grafo.
+    caminho (str): O arquivo de saída.
+    time_inimigo (GrafoSimples): Se informado, as posições dos adversários também são salvas.
+    """
+    with GravadorSequencia(caminho, grafo.nomes, None if time_inimigo is None else time_inimigo.nomes) as gravador:
+        gravador.adiciona(grafo, time_inimigo)
+
+
+def carregar_grafo(caminho, quadro=0, modo="c"):
+    """
+    Carrega um grafo salvo por salvar_grafo, sem copiar os arrays.
+
+    Parâmetros:
+    caminho (str): O arquivo.
+    quadro (int): Qual quadro carregar, se o arquivo tem vários.
+    modo (str): O modo do np.memmap. O padrão, "c", permite alterar o grafo sem mudar o arquivo.
+
+    Retorna:
+    GrafoSimples: O grafo carregado.
+    """
+    return SequenciaGravada(caminho, modo).grafo(quadro)
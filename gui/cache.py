@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class CacheRecursos:
+    """Cache de imagens carregadas do disco e de textos já renderizados.
+
+    Cada imagem é lida e convertida para o formato da tela uma única vez. Os
+    textos são guardados por (texto, fonte, cor, antialias), com descarte do
+    menos usado recentemente quando a capacidade é atingida. Os contadores de
+    acertos e faltas permitem confirmar que os redesenhos não leem o disco.
+    """
+
+    def __init__(self, capacidade_textos: int = 512):
+        """Inicializa um cache vazio.
+
+        args:
+            capacidade_textos (int): quantos textos renderizados manter no cache.
+        """
+        self.capacidade_textos = capacidade_textos
+        self._imagens = {}
+        self._textos = OrderedDict()
+        self.acertos = {"imagens": 0, "textos": 0}
+        self.faltas = {"imagens": 0, "textos": 0}
+
+    def imagem(self, caminho: str, alpha: bool = False) -> pygame.Surface:
+        """Retorna a imagem do arquivo, carregando-a só na primeira vez.
+
+        args:
+            caminho (str): o caminho da imagem.
+            alpha (bool): se a transparência da imagem deve ser mantida.
+        """
+        chave = (caminho, alpha)
+        imagem = self._imagens.get(chave)
+        if imagem is not None:
+            self.acertos["imagens"] += 1
+            return imagem
+
+        self.faltas["imagens"] += 1
+        imagem = pygame.image.load(caminho)
+        if pygame.display.get_surface() is not None:
+            imagem = imagem.convert_alpha() if alpha else imagem.convert()
+        self._imagens[chave] = imagem
+        return imagem
+
+    def texto(self, fonte: pygame.font.Font, texto: str, cor, antialias: bool = True) -> pygame.Surface:
+        """Retorna o texto renderizado com a fonte e a cor, renderizando-o só se não estiver no cache.
+
+        args:
+            fonte (pygame.font.Font): a fonte do texto.
+            texto (str): o texto.
+            cor: a cor, em RGB.
+            antialias (bool): se o texto deve ser suavizado.
+        """
+        chave = (texto, fonte, tuple(cor), antialias)
+        superficie = self._textos.get(chave)
+        if superficie is not None:
+            self.acertos["textos"] += 1
+            self._textos.move_to_end(chave)
+            return superficie
+
+        self.faltas["textos"] += 1
+        superficie = fonte.render(texto, antialias, cor)
+        self._textos[chave] = superficie
+        if len(self._textos) > self.capacidade_textos:
+            self._textos.popitem(last=False)
+        return superficie
+
+    def estatisticas(self) -> dict:
+        """Retorna os contadores de acertos e faltas e o tamanho atual de cada cache."""
+        return {
+            tipo: {
+                "acertos": self.acertos[tipo],
+                "faltas": self.faltas[tipo],
+                "itens": len(self._imagens if tipo == "imagens" else self._textos),
+            }
+            for tipo in ("imagens", "textos")
+        }
+
+    def limpar(self):
+        """Descarta todas as imagens e textos guardados. Os contadores são mantidos."""
+        self._imagens.clear()
+        self._textos.clear()
@@ -0,0 +1,290 @@
+"""Exportação de figuras do grafo de passes sem janela, com o backend Agg do matplotlib.
+
+Uma única figura é montada uma vez e reaproveitada em todos os quadros: as arestas são uma só
+LineCollection, os jogadores e os adversários são um scatter cada, e o caminho é uma linha. A
+cada quadro só os dados desses artistas mudam, então exportar milhares de cenários não recria
+eixos nem um patch por aresta. Nas sequências de vídeo, GIF ou PNG, o fundo com os eixos é
+renderizado uma vez e só o grafo é redesenhado sobre ele.
+
+Uso:
+    python -m gui.exportacao partida.fgr partida.mp4 [--fps 25] [--origem Alisson --destino Gol]
+    python -m gui.exportacao partida.fgr "quadros/{:05d}.png"
+"""
+import argparse
+import os
+import subprocess
+import time
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from data_structure.graph import GrafoSimples
+
+# Cobre o campo usado nos cenários (x em [0, 5], y em [-2, 2]) e o vértice do gol
+LIMITES_PADRAO = ((-0.5, 6.0), (-2.5, 2.5))
+
+
+class ExportadorFiguras:
+    """Desenha grafos de passes em uma figura do matplotlib fora da tela e salva o resultado.
+
+    A figura não passa pelo pyplot: ela tem o próprio canvas Agg, então exportar não abre janelas
+    nem depende do backend configurado. Se uma figura já existente for informada (a do pyplot, por
+    exemplo), os artistas são criados nela.
+    """
+
+    def __init__(self, tamanho: Tuple[float, float] = (8, 5), dpi: int = 100, limites=LIMITES_PADRAO,
+                 mostrar_nomes: bool = True, figura=None):
+        """Cria a figura e os artistas, ainda sem dados.
+
+        args:
+            tamanho (tuple): largura e altura da figura, em polegadas.
+            dpi (int): resolução da figura.
+            limites (tuple): ((x mínimo, x máximo), (y mínimo, y máximo)) dos eixos, fixos em todos os
+                quadros. Se None, os eixos se ajustam ao primeiro quadro desenhado.
+            mostrar_nomes (bool): se os nomes dos jogadores são escritos ao lado deles.
+            figura (matplotlib.figure.Figure): uma figura já criada para desenhar nela.
+        """
+        # Importado aqui para que quem só calcula pesos e caminhos não carregue o matplotlib
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+
+        if figura is None:
+            figura = Figure(figsize=tamanho, dpi=dpi)
+            FigureCanvasAgg(figura)
+        self.figura = figura
+        self.ax = figura.add_subplot()
+        self.limites = limites
+        self.mostrar_nomes = mostrar_nomes
+        self.quadros = 0
+
+        self._arestas = LineCollection([], colors="lightblue", linewidths=0.8, zorder=1)
+        self.ax.add_collection(self._arestas)
+        (self._caminho,) = self.ax.plot([], [], color="magenta", linewidth=3, zorder=2)
+        self._jogadores = self.ax.scatter([], [], s=100, zorder=3)
+        self._inimigos = self.ax.scatter([], [], s=80, c="red", marker="x", zorder=3)
+        self._nomes = []
+        self._fundo = None
+        self._chave_fundo = None
+
+        if limites is not None:
+            self.ax.set_xlim(*limites[0])
+            self.ax.set_ylim(*limites[1])
+
+    def desenha(self, grafo: GrafoSimples, time_inimigo: GrafoSimples = None, caminho: List[str] = None):
+        """Troca os dados dos artistas pelos de um grafo. Nada é renderizado até salvar.
+
+        args:
+            grafo (GrafoSimples): o grafo de passes; as arestas desenhadas são as de lista_arestas.
+            time_inimigo (GrafoSimples): se informado, os adversários são desenhados.
+            caminho (list): se for uma lista de nomes, o caminho é destacado.
+        """
+        posicoes = grafo.posicoes
+        origens, destinos, _ = grafo.lista_arestas()
+        self._arestas.set_segments(np.stack((posicoes[origens], posicoes[destinos]), axis=1))
+        self._jogadores.set_offsets(posicoes)
+        self._inimigos.set_offsets(np.empty((0, 2)) if time_inimigo is None else time_inimigo.posicoes)
+
+        if isinstance(caminho, list) and caminho:
+            pontos = posicoes[[grafo.indice(nome) for nome in caminho]]
+            self._caminho.set_data(pontos[:, 0], pontos[:, 1])
+        else:
+            self._caminho.set_data([], [])
+
+        if self.mostrar_nomes:
+            self._atualiza_nomes(grafo.nomes, posicoes)
+
+        if self.limites is None and self.quadros == 0:
+            self.ax.update_datalim(posicoes)
+            self.ax.autoscale_view()
+        self.quadros += 1
+
+    def _atualiza_nomes(self, nomes: List[str], posicoes: np.ndarray):
+        """Reaproveita os textos do quadro anterior, criando ou removendo só os que sobram ou faltam."""
+        while len(self._nomes) < len(nomes):
+            self._nomes.append(self.ax.text(0, 0, "", fontsize=12, ha="right", zorder=4))
+        while len(self._nomes) > len(nomes):
+            self._nomes.pop().remove()
+        for texto, nome, posicao in zip(self._nomes, nomes, posicoes.tolist()):
+            if texto.get_text() != nome:
+                texto.set_text(nome)
+            texto.set_position(posicao)
+
+    def salvar(self, arquivo: str, **opcoes):
+        """Salva o quadro atual. O formato (PNG, SVG, PDF...) vem da extensão do arquivo.
+
+        args:
+            arquivo (str): o arquivo de saída.
+            opcoes: repassadas a Figure.savefig.
+        """
+        self.figura.savefig(arquivo, **opcoes)
+
+    def _dinamicos(self) -> list:
+        return [self._arestas, self._caminho, self._jogadores, self._inimigos, *self._nomes]
+
+    def imagem(self) -> np.ndarray:
+        """Renderiza o quadro atual e retorna os pixels.
+
+        O fundo (eixos, marcações e rótulos) só muda se os limites ou o tamanho da figura mudarem,
+        então ele é renderizado uma vez, guardado, e a cada quadro só os artistas do grafo são
+        desenhados por cima dele.
+
+        returns:
+            np.ndarray: array (altura, largura, 4) RGBA, uint8, copiado do canvas.
+        """
+        canvas = self.figura.canvas
+        chave = (canvas.get_width_height(), self.ax.get_xlim(), self.ax.get_ylim())
+        if self._fundo is None or self._chave_fundo != chave:
+            for artista in self._dinamicos():
+                artista.set_visible(False)
+            canvas.draw()
+            for artista in self._dinamicos():
+                artista.set_visible(True)
+            self._fundo = canvas.copy_from_bbox(self.figura.bbox)
+            self._chave_fundo = chave
+
+        canvas.restore_region(self._fundo)
+        for artista in self._dinamicos():
+            self.ax.draw_artist(artista)
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+    def exporta_sequencia(self, quadros: Iterable[tuple], arquivo: str, fps: int = 25) -> int:
+        """Desenha e grava uma sequência de quadros.
+
+        Se 'arquivo' tem um campo de formatação, como "quadros/{:05d}.png", cada quadro é salvo em
+        uma imagem; PNG e JPEG são gravados a partir dos pixels de imagem(), e os outros formatos
+        (SVG, PDF...) com salvar. Se termina em .gif, os quadros são escritos um a um em um GIF animado
+        com o Pillow; nos outros casos (.mp4, .mkv...), são enviados ao ffmpeg por um pipe, um quadro por vez.
+
+        args:
+            quadros (iterable): tuplas (grafo, time_inimigo, caminho), com time_inimigo e caminho
+                podendo ser None. É consumido um quadro por vez.
+            arquivo (str): o arquivo de saída ou o padrão dos nomes das imagens.
+            fps (int): quadros por segundo do vídeo.
+
+        returns:
+            int: quantos quadros foram gravados.
+        """
+        from PIL import Image
+
+        extensao = os.path.splitext(arquivo)[1].lower()
+        gravados = 0
+        if "{" in arquivo:
+            for grafo, time_inimigo, caminho in quadros:
+                self.desenha(grafo, time_inimigo, caminho)
+                if extensao == ".png":
+                    # A compressão padrão do PNG leva mais tempo que renderizar o quadro
+                    Image.fromarray(self.imagem()[..., :3]).save(arquivo.format(gravados), compress_level=1)
+                elif extensao in (".jpg", ".jpeg"):
+                    Image.fromarray(self.imagem()[..., :3]).save(arquivo.format(gravados))
+                else:
+                    self.salvar(arquivo.format(gravados))
+                gravados += 1
+            return gravados
+
+        if extensao == ".gif":
+            # Image.save com append_images guarda todos os quadros antes de escrever; aqui cada quadro é
+            # escrito assim que é desenhado, com a própria paleta, e a memória não cresce com a sequência
+            from PIL import GifImagePlugin
+
+            saida = None
+            try:
+                for grafo, time_inimigo, caminho in quadros:
+                    self.desenha(grafo, time_inimigo, caminho)
+                    quadro = Image.fromarray(self.imagem()[..., :3]).convert("P", palette=Image.Palette.ADAPTIVE)
+                    if saida is None:
+                        saida = open(arquivo, "wb")
+                        cabecalho, _ = GifImagePlugin.getheader(quadro, info={"loop": 0, "duration": 1000 / fps})
+                        saida.write(b"".join(cabecalho))
+                    saida.write(b"".join(GifImagePlugin.getdata(quadro, duration=1000 / fps, include_color_table=True)))
+                    gravados += 1
+            finally:
+                if saida is not None:
+                    saida.write(b";")
+                    saida.close()
+            return gravados
+
+        processo = None
+        try:
+            for grafo, time_inimigo, caminho in quadros:
+                self.desenha(grafo, time_inimigo, caminho)
+                pixels = self.imagem()
+                if processo is None:
+                    processo = abre_ffmpeg(arquivo, pixels.shape[1], pixels.shape[0], fps)
+                processo.stdin.write(pixels.tobytes())
+                gravados += 1
+        finally:
+            if processo is not None:
+                processo.stdin.close()
+                if processo.wait() != 0:
+                    raise RuntimeError(f"O ffmpeg terminou com erro ao gravar {arquivo}.")
+        return gravados
+
+
+def abre_ffmpeg(arquivo: str, largura: int, altura: int, fps: int, formato: str = "rgba") -> subprocess.Popen:
+    """Inicia um ffmpeg que lê quadros crus da entrada padrão e grava o vídeo em 'arquivo'.
+
+    args:
+        arquivo (str): o vídeo de saída; o contêiner vem da extensão.
+        largura (int): a largura dos quadros, em pixels.
+        altura (int): a altura dos quadros, em pixels.
+        fps (int): quadros por segundo.
+        formato (str): o formato dos pixels no pipe, como o -pix_fmt do ffmpeg ("rgba", "rgb24"...).
+    """
+    import matplotlib
+    from matplotlib import animation
+
+    if not animation.writers.is_available("ffmpeg"):
+        raise RuntimeError(f"O ffmpeg não foi encontrado; não é possível gravar {arquivo}. "
+                           "Use um .gif ou um padrão de imagens como 'quadros/{:05d}.png'.")
+    comando = [matplotlib.rcParams["animation.ffmpeg_path"], "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", formato, "-s", f"{largura}x{altura}", "-r", str(fps), "-i", "-",
+               # yuv420p, o formato que os players aceitam, exige largura e altura pares
+               "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", arquivo]
+    return subprocess.Popen(comando, stdin=subprocess.PIPE)
+
+
+def quadros_gravados(sequencia, origem: str = None, destino: str = None):
+    """Gera os quadros de uma SequenciaGravada no formato de exporta_sequencia.
+
+    args:
+        sequencia (SequenciaGravada): a sequência lida do arquivo.
+        origem (str): se informado com 'destino', o caminho mais curto de cada quadro é destacado.
+        destino (str): o vértice de destino do caminho.
+    """
+    for quadro in range(len(sequencia)):
+        grafo = sequencia.grafo(quadro)
+        caminho = None
+        if origem is not None and destino is not None:
+            caminho = grafo.encontra_caminho_mais_curto(origem, destino)
+        yield grafo, sequencia.time_inimigo(quadro), caminho
+
+
+def main():
+    from data_structure.snapshot import SequenciaGravada
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entrada", help="arquivo gravado por GravadorSequencia")
+    parser.add_argument("saida", help="vídeo (.mp4, .gif) ou padrão de imagens, como 'quadros/{:05d}.png'")
+    parser.add_argument("--fps", type=int, default=25)
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--origem", help="destaca o caminho mais curto desta origem até --destino")
+    parser.add_argument("--destino", default="Gol")
+    parser.add_argument("--sem-nomes", action="store_true", help="não escreve os nomes dos jogadores")
+    args = parser.parse_args()
+
+    pasta = os.path.dirname(args.saida)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    sequencia = SequenciaGravada(args.entrada)
+    exportador = ExportadorFiguras(dpi=args.dpi, mostrar_nomes=not args.sem_nomes)
+    inicio = time.perf_counter()
+    gravados = exportador.exporta_sequencia(
+        quadros_gravados(sequencia, args.origem, args.destino if args.origem else None), args.saida, args.fps)
+    duracao = time.perf_counter() - inicio
+    print(f"{gravados} quadros em {duracao:.2f} s ({gravados / max(duracao, 1e-9):.1f} quadros/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,27 @@
+import os
+
+import numpy as np
 import pygame
 from typing import Tuple, List
 
 from data_structure.graph import GrafoSimples
+from gui.cache import CacheRecursos
+from profiling.perfil import medir
+
+CAMINHO_PLACAR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "assets", "placar.png")
+
+# Cores das rotas alternativas em draw_frame, da segunda melhor em diante
+CORES_ALTERNATIVAS = ((0, 200, 255), (255, 140, 0), (120, 255, 120))
 
 
 class InterfaceDrawer:
-    """Classe que abstrai as funções de desenho do PyGame."""
+    """Classe que abstrai as funções de desenho do PyGame.
+
+    Os métodos draw_* só desenham; a tela é atualizada uma vez por quadro, em
+    draw_frame ou present. draw_frame mantém o fundo, as arestas e os jogadores
+    em camadas pré-compostas, que só são redesenhadas quando os grafos mudam, e
+    envia para a tela apenas as regiões que mudaram desde o quadro anterior.
+    """
 
     def __init__(self, tela: pygame.surface, background_path: str):
         """Inicializa um InterfaceDrawer.
@@ -18,68 +34,137 @@ class InterfaceDrawer:
         self.font = pygame.font.SysFont(None, 15)
         self.button_font = pygame.font.SysFont(None, 80)
         self.score = 0
+        self.mostrar_botoes = True  # Os botões Play e Next; desligados na renderização fora da tela
+        self.recursos = CacheRecursos()
 
-        background = pygame.image.load(background_path)
+        background = self.recursos.imagem(background_path)
         self.background = pygame.transform.scale(background, tela.get_size())
 
-    def draw_players(self, grafo: GrafoSimples, cor_jogador: pygame.Vector3):
+        self._viewport = Viewport(tela.get_size())
+        self._pixels = {}  # id(grafo) -> (grafo, versao, viewport, pixels)
+
+        self._chave_camadas = None
+        self._base = None
+        self._quadro_anterior = None
+        self._painel_overlay = None
+
+    def invalida_caches(self, camadas: bool = True):
+        """Faz o próximo draw_frame desenhar e enviar o quadro inteiro, mesmo que nada tenha mudado.
+
+        args:
+            camadas (bool): se as camadas pré-compostas também são descartadas e redesenhadas. Com
+                False, só o quadro anterior é esquecido e as camadas guardadas são reaproveitadas.
+        """
+        self._quadro_anterior = None
+        if camadas:
+            self._chave_camadas = None
+            self._base = None
+
+    @property
+    def viewport(self) -> "Viewport":
+        """A transformação de posições em pixels, recalculada só quando o tamanho da tela muda."""
+        if self._viewport.tamanho_tela != self.screen.get_size():
+            self._viewport = Viewport(self.screen.get_size())
+        return self._viewport
+
+    def pixels_do_grafo(self, grafo: GrafoSimples) -> List[Tuple[float, float]]:
+        """Retorna a posição em pixel de cada vértice do grafo, na ordem dos índices.
+
+        As posições ficam guardadas até que o grafo ou o tamanho da tela mudem.
+        """
+        viewport = self.viewport
+        guardado = self._pixels.get(id(grafo))
+        if guardado is not None and guardado[0] is grafo and guardado[1] == grafo.versao and guardado[2] is viewport:
+            return guardado[3]
+
+        pixels = [tuple(pixel) for pixel in viewport.para_pixels(grafo.posicoes).tolist()]
+        if len(self._pixels) >= 8:
+            self._pixels.clear()
+        self._pixels[id(grafo)] = (grafo, grafo.versao, viewport, pixels)
+        return pixels
+
+    def draw_players(self, grafo: GrafoSimples, cor_jogador: pygame.Vector3, superficie: pygame.Surface = None):
         """Dado um grafo simples, desenha os vértices do grafo na tela do PyGame.
         
         args:
             grafo (GrafoSimples): um grafo para desenhar.
             cor_jogador (pygame.Vector3): uma cor, em RGB, para o jogador.
+            superficie (pygame.Surface): onde desenhar. Por padrão, a tela.
         """
+        superficie = superficie or self.screen
+        pixels = self.pixels_do_grafo(grafo)
         for vertice in grafo.vertices.values():
-            posicao = posicao_para_coordenada(vertice.posicao, self.screen.get_size())
-            pygame.draw.circle(self.screen, cor_jogador, posicao, 30)
+            posicao = pixels[vertice.indice]
+            pygame.draw.circle(superficie, cor_jogador, posicao, 30)
 
-            text = self.font.render(vertice.nome, True, (255, 0, 0))
+            text = self.recursos.texto(self.font, vertice.nome, (255, 0, 0))
             text_rect = text.get_rect(center=posicao)
-            self.screen.blit(text, text_rect)
-
-        pygame.display.update()
+            superficie.blit(text, text_rect)
 
-    def draw_edges(self, grafo: GrafoSimples, cor_linha: pygame.Vector3):
+    def draw_edges(self, grafo: GrafoSimples, cor_linha: pygame.Vector3, superficie: pygame.Surface = None):
         """Dado um grafo simples, desenha as arestas do grafo na tela do PyGame.
         
         args:
             grafo (GrafoSimples): um grafo para desenhar.
             cor_linha (pygame.Vector3): uma cor, em RGB, para as linhas
+            superficie (pygame.Surface): onde desenhar. Por padrão, a tela.
         """
-        for vertice in grafo.vertices.values():
-            for arestas in vertice.arestas:
-                pos_inicial = posicao_para_coordenada(vertice.posicao, self.screen.get_size())
-                pos_final = posicao_para_coordenada(arestas[0].posicao, self.screen.get_size())
-                pygame.draw.line(self.screen, cor_linha, pos_inicial, pos_final, 5)
-
-        pygame.display.update()
+        superficie = superficie or self.screen
+        pixels = self.pixels_do_grafo(grafo)
+        origens, destinos, _ = grafo.lista_arestas()
+        for origem, destino in zip(origens.tolist(), destinos.tolist()):
+            pygame.draw.line(superficie, cor_linha, pixels[origem], pixels[destino], 5)
 
-    def draw_path(self, grafo: GrafoSimples, caminho: List[str], cor_linha: pygame.Vector3):
+    def draw_path(self, grafo: GrafoSimples, caminho: List[str], cor_linha: pygame.Vector3) -> pygame.Rect:
         """Dado um grafo simples e um caminho, desenha as arestas do caminho na tela do PyGame.
         
         args:
             grafo (GrafoSimples): um grafo para desenhar.
             caminho (List[str]): uma lista de nomes de vértices representando o caminho.
             cor_linha (pygame.Vector3): uma cor, em RGB, para as linhas do caminho.
+
+        returns:
+            pygame.Rect: a região da tela alterada, ou None se o caminho não tem arestas.
         """
-        for i in range(len(caminho) - 1):
-            vertice_atual = grafo.vertices[caminho[i]]
-            vertice_proximo = grafo.vertices[caminho[i + 1]]
+        return self.draw_paths(grafo, [caminho], [cor_linha])
+
+    def draw_paths(self, grafo: GrafoSimples, caminhos: List[List[str]], cores: List[pygame.Vector3],
+                   larguras: List[int] = None) -> pygame.Rect:
+        """Desenha várias rotas de uma vez, na ordem dada, de modo que a primeira fica por baixo.
+
+        As posições em pixels do grafo são calculadas uma única vez para todas as rotas.
 
-            pos_inicial = posicao_para_coordenada(vertice_atual.posicao, self.screen.get_size())
-            pos_final = posicao_para_coordenada(vertice_proximo.posicao, self.screen.get_size())
-            pygame.draw.line(self.screen, cor_linha, pos_inicial, pos_final, 5)
+        args:
+            grafo (GrafoSimples): um grafo para desenhar.
+            caminhos (List[List[str]]): as rotas, cada uma uma lista de nomes de vértices.
+            cores (List[pygame.Vector3]): a cor, em RGB, de cada rota.
+            larguras (List[int]): a espessura das linhas de cada rota; por padrão, 5.
+
+        returns:
+            pygame.Rect: a região da tela alterada, ou None se nenhuma rota tem arestas.
+        """
+        larguras = larguras or [5] * len(caminhos)
+        regiao = None
+        pixels = self.pixels_do_grafo(grafo)
+        for caminho, cor_linha, largura in zip(caminhos, cores, larguras):
+            for i in range(len(caminho) - 1):
+                pos_inicial = pixels[grafo.indice(caminho[i])]
+                pos_final = pixels[grafo.indice(caminho[i + 1])]
+                linha = pygame.draw.line(self.screen, cor_linha, pos_inicial, pos_final, largura)
+                regiao = linha if regiao is None else regiao.union(linha)
 
-        pygame.display.update()
+        return regiao
 
-    def draw_background(self):
+    def draw_background(self, superficie: pygame.Surface = None):
         """Desenha o fundo designado na tela do PyGame."""
+        superficie = superficie or self.screen
         black = (0, 0, 0)
-        self.screen.fill(black)
-        self.screen.blit(self.background, (0, 0))
+        superficie.fill(black)
+        superficie.blit(self.background, (0, 0))
         
-    def draw_button(self, texto: str, inverted: bool):
+    def draw_button(self, texto: str, inverted: bool, superficie: pygame.Surface = None) -> pygame.Rect:
         """Desenha um botão com o texto enviado como argumento"""
+        superficie = superficie or self.screen
         tamanho_tela = self.screen.get_size()
         button_width = tamanho_tela[0] / 6
         button_height = tamanho_tela[1] / 6
@@ -88,15 +173,16 @@ class InterfaceDrawer:
         pos_y = tamanho_tela[1] - button_height
         
         fundo = pygame.Rect(pos_x, pos_y, button_width, button_height)
-        pygame.draw.rect(self.screen, (255, 255, 255), fundo)
-        text = self.button_font.render(texto, True, (0, 0, 0))
+        pygame.draw.rect(superficie, (255, 255, 255), fundo)
+        text = self.recursos.texto(self.button_font, texto, (0, 0, 0))
         text_rect = text.get_rect(center=fundo.center)
-        self.screen.blit(text, text_rect)
-        
-        pygame.display.update()
+        superficie.blit(text, text_rect)
+
+        return fundo
         
-    def draw_score(self):
-        placar = pygame.image.load("assets/placar.png")
+    def draw_score(self) -> pygame.Rect:
+        """Desenha o placar no topo da tela e retorna a região ocupada por ele."""
+        placar = self.recursos.imagem(CAMINHO_PLACAR, alpha=True)
         pos_x = (self.screen.get_size()[0] / 2) - placar.get_width() / 2
         pos_y = 0
         self.screen.blit(placar, (pos_x, pos_y))
@@ -104,35 +190,170 @@ class InterfaceDrawer:
         text_pos_x = self.screen.get_size()[0] / 2
         text_pos_y = 45
         
-        gols_casa = self.button_font.render(str(self.score), True, (0, 0, 0))
+        gols_casa = self.recursos.texto(self.button_font, str(self.score), (0, 0, 0))
         text_rect = gols_casa.get_rect(center=(text_pos_x - 40, text_pos_y))
         self.screen.blit(gols_casa, text_rect)
         
-        gols_fora = self.button_font.render("0", True, (0, 0, 0))
+        gols_fora = self.recursos.texto(self.button_font, "0", (0, 0, 0))
         text_rect = gols_fora.get_rect(center=(text_pos_x + 40, text_pos_y))
         self.screen.blit(gols_fora, text_rect)
-        
 
-        pygame.display.update()
+        return placar.get_rect(topleft=(pos_x, pos_y)).unionall([
+            gols_casa.get_rect(center=(text_pos_x - 40, text_pos_y)), text_rect])
+
+    @medir("InterfaceDrawer.atualiza_camadas")
+    def _atualiza_camadas(self, grafo: GrafoSimples, grafo_inimigo: GrafoSimples, cores: tuple) -> bool:
+        """Redesenha as camadas de arestas e jogadores, e a base composta, se os grafos mudaram.
+
+        returns:
+            bool: True se a base foi redesenhada.
+        """
+        versao_inimigo = None if grafo_inimigo is None else grafo_inimigo.versao
+        chave = (grafo, grafo.versao, grafo_inimigo, versao_inimigo, cores, self.mostrar_botoes)
+        anterior = self._chave_camadas
+        if anterior is not None and anterior[0] is grafo and anterior[2] is grafo_inimigo \
+                and anterior[1] == chave[1] and anterior[3:] == chave[3:]:
+            return False
+        self._chave_camadas = chave
+        cor_arestas, cor_jogadores, cor_inimigos = cores
+
+        arestas = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        self.draw_edges(grafo, cor_arestas, arestas)
+
+        jogadores = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        self.draw_players(grafo, cor_jogadores, jogadores)
+        if grafo_inimigo is not None:
+            self.draw_players(grafo_inimigo, cor_inimigos, jogadores)
+
+        base = pygame.Surface(self.screen.get_size())
+        self.draw_background(base)
+        base.blit(arestas, (0, 0))
+        base.blit(jogadores, (0, 0))
+        if self.mostrar_botoes:
+            self.draw_button("Play", False, base)
+            self.draw_button("Next", True, base)
+        self._base = base.convert() if pygame.display.get_surface() is not None else base
+        return True
+
+    @medir("InterfaceDrawer.draw_frame")
+    def draw_frame(self, grafo: GrafoSimples, grafo_inimigo: GrafoSimples, caminho: List[str] = None,
+                   cor_arestas=(255, 255, 255), cor_jogadores=(255, 255, 255),
+                   cor_inimigos=(255, 255, 0), cor_caminho=(255, 0, 255),
+                   alternativas: List[List[str]] = None, cores_alternativas=CORES_ALTERNATIVAS) -> List[pygame.Rect]:
+        """Desenha um quadro completo e atualiza a tela uma única vez.
+
+        Se nada mudou desde o quadro anterior, nada é desenhado. Se só o placar
+        ou o caminho mudaram, só as regiões deles são enviadas para a tela.
+
+        args:
+            grafo (GrafoSimples): o grafo do time que ataca, desenhado com arestas.
+            grafo_inimigo (GrafoSimples): o grafo do time adversário, ou None para desenhar só um time.
+            caminho (List[str]): um caminho para destacar, opcional.
+            alternativas (List[List[str]]): rotas alternativas, desenhadas mais finas, por baixo do caminho.
+            cores_alternativas: as cores das rotas alternativas, usadas em ciclo.
+
+        returns:
+            List[pygame.Rect]: as regiões da tela atualizadas.
+        """
+        caminho = tuple(caminho) if isinstance(caminho, list) else ()
+        alternativas = tuple(tuple(rota) for rota in alternativas or () if isinstance(rota, list))
+        rotas = (caminho,) + alternativas
+        base_mudou = self._atualiza_camadas(grafo, grafo_inimigo, (cor_arestas, cor_jogadores, cor_inimigos))
+        anterior = self._quadro_anterior
+        if not base_mudou and anterior is not None and anterior[0] == self.score and anterior[1] == rotas:
+            return []
+
+        self.screen.blit(self._base, (0, 0))
+        regiao_placar = self.draw_score()
+        cores = [cores_alternativas[i % len(cores_alternativas)] for i in range(len(alternativas))]
+        regiao_caminho = self.draw_paths(grafo, list(reversed(alternativas)) + [caminho],
+                                         list(reversed(cores)) + [cor_caminho],
+                                         [3] * len(alternativas) + [5])
+
+        if base_mudou or anterior is None:
+            regioes = [self.screen.get_rect()]
+        else:
+            regioes = [regiao for regiao in (regiao_placar, regiao_caminho, anterior[2]) if regiao is not None]
+
+        self._quadro_anterior = (self.score, rotas, regiao_caminho)
+        self.present(regioes)
+        return regioes
+
+    def draw_overlay(self, linhas: List[str]) -> pygame.Rect:
+        """Desenha um painel com linhas de texto no canto superior esquerdo e
+        atualiza só a região dele na tela. Usado para exibir a instrumentação.
+
+        returns:
+            pygame.Rect: a região ocupada pelo painel.
+        """
+        textos = [self.font.render(linha, True, (255, 255, 255)) for linha in linhas]
+        largura = max((texto.get_width() for texto in textos), default=0) + 10
+        altura = sum(texto.get_height() for texto in textos) + 10
+        painel = pygame.Rect(0, 0, largura, altura)
+        # O painel só cresce, para não deixar restos de um painel anterior maior
+        if self._painel_overlay is not None:
+            painel = painel.union(self._painel_overlay)
+        self._painel_overlay = painel
+
+        pygame.draw.rect(self.screen, (0, 0, 0), painel)
+        pos_y = 5
+        for texto in textos:
+            self.screen.blit(texto, (5, pos_y))
+            pos_y += texto.get_height()
+
+        self.present([painel])
+        return painel
+
+    @medir("InterfaceDrawer.present")
+    def present(self, regioes: List[pygame.Rect] = None):
+        """Envia o conteúdo desenhado para a tela, inteira ou só nas regiões indicadas."""
+        if pygame.display.get_surface() is not self.screen:
+            return
+        if regioes is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(regioes)
+
+
+class Viewport:
+    """Transformação das posições do campo em posições em pixel para uma tela
+    de um dado tamanho. Os coeficientes são calculados uma vez, na criação."""
+
+    def __init__(self, tamanho_tela: Tuple[int, int]):
+        """Calcula a origem e a escala da transformação.
+
+        args:
+            tamanho_tela (Tuple[int, int]): a largura e a altura da tela, em pixels.
+        """
+        self.tamanho_tela = tuple(tamanho_tela)
+        self.x0 = 200
+        self.y0 = tamanho_tela[1] / 2
+        self.step_x = (tamanho_tela[0] - self.x0) / 6
+        self.step_y = (tamanho_tela[1] - 100) / 5
+
+    def para_pixel(self, posicao: pygame.Vector2) -> Tuple[float, float]:
+        """Converte uma posição do campo em uma posição em pixel."""
+        return (self.x0 + self.step_x*posicao[0], self.y0 + self.step_y*posicao[1])
+
+    def para_pixels(self, posicoes) -> np.ndarray:
+        """Converte um array (n, 2) de posições do campo em um array (n, 2) de
+        posições em pixel, em uma única operação."""
+        posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+        pixels = np.empty_like(posicoes)
+        pixels[:, 0] = self.x0 + self.step_x*posicoes[:, 0]
+        pixels[:, 1] = self.y0 + self.step_y*posicoes[:, 1]
+        return pixels
 
 
 def posicoes_para_coordenadas(posicoes: List[pygame.Vector2], tamanho_tela: Tuple[int, int]) -> List[pygame.Vector2]:
     """Converte uma lista de posições arbitrárias em posições em pixel, para
     serem desenhadas pelo pygame.
     """
-    x0 = 200
-    y0 = tamanho_tela[1] / 2
-    step_x = (tamanho_tela[0] - x0) / 6
-    step_y = (tamanho_tela[1] - 100) / 5
-    return [(x0 + step_x*x, y0 + step_y*y) for x, y in posicoes]
+    return [tuple(pixel) for pixel in Viewport(tamanho_tela).para_pixels(posicoes).tolist()]
 
 
 def posicao_para_coordenada(posicao: pygame.Vector2, tamanho_tela: Tuple[int, int]) -> pygame.Vector2:
     """Converte uma posição arbitrária em uma posição em pixel, para ser
     desenhada pelo pygame.
     """
-    x0 = 200
-    y0 = tamanho_tela[1] / 2
-    step_x = (tamanho_tela[0] - x0) / 6
-    step_y = (tamanho_tela[1] - 100) / 5
-    return (x0 + step_x*posicao[0], y0 + step_y*posicao[1])
+    return Viewport(tamanho_tela).para_pixel(posicao)
@@ -0,0 +1,259 @@
+"""Renderização dos quadros da interface fora da tela, para gerar vídeos de partidas em servidores sem display.
+
+O InterfaceDrawer desenha em uma Surface comum, com o driver de vídeo dummy do SDL, e os pixels de
+cada quadro vão para uma saída: uma pasta de imagens, codificadas em um pool de processos, ou um
+vídeo, com os quadros enviados ao ffmpeg por uma thread. Nos dois casos a codificação acontece
+enquanto os quadros seguintes são desenhados, e o número de quadros em trânsito é limitado para que
+a memória não cresça com a duração da partida.
+
+Uso:
+    python -m gui.offscreen partida.fgr partida.mp4 [--fps 25] [--resolucao 1280x720]
+    python -m gui.offscreen partida.fgr "quadros/{:06d}.png" [--processos 4]
+"""
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Tuple
+
+import pygame
+
+from data_structure.graph import GrafoSimples
+from gui.exportacao import abre_ffmpeg, quadros_gravados
+from gui.gui import InterfaceDrawer
+
+CAMINHO_FUNDO = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "assets", "pitch.jpg")
+
+
+def _grava_imagem(pixels: bytes, tamanho: Tuple[int, int], arquivo: str):
+    """Codifica um quadro RGB e o grava; roda nos processos do pool de SaidaImagens."""
+    pygame.image.save(pygame.image.frombytes(pixels, tamanho, "RGB"), arquivo)
+
+
+class SaidaImagens:
+    """Grava cada quadro em uma imagem, com a codificação distribuída em um pool de processos.
+
+    O formato vem da extensão do padrão (PNG, JPEG, BMP, TGA). escreve() só espera quando já há
+    max_pendentes quadros sendo codificados, e então espera o mais antigo.
+    """
+
+    def __init__(self, padrao: str, processos: int = None, max_pendentes: int = None):
+        """Cria o pool de processos.
+
+        args:
+            padrao (str): o padrão dos nomes das imagens, com um campo para o número do quadro,
+                como "quadros/{:06d}.png".
+            processos (int): quantos processos codificam. Por padrão, um por CPU.
+            max_pendentes (int): quantos quadros podem estar em codificação ao mesmo tempo. Por padrão,
+                o dobro do número de processos.
+        """
+        processos = processos or os.cpu_count() or 1
+        self.padrao = padrao
+        self.max_pendentes = max_pendentes or 2 * processos
+        self.quadros = 0
+        self._executor = ProcessPoolExecutor(max_workers=processos)
+        self._pendentes = deque()
+
+    def escreve(self, pixels: bytes, tamanho: Tuple[int, int]):
+        """Envia um quadro RGB para ser codificado.
+
+        args:
+            pixels (bytes): os pixels do quadro, em RGB, linha a linha.
+            tamanho (Tuple[int, int]): a largura e a altura do quadro.
+        """
+        while len(self._pendentes) >= self.max_pendentes:
+            self._pendentes.popleft().result()
+        self._pendentes.append(self._executor.submit(_grava_imagem, pixels, tamanho, self.padrao.format(self.quadros)))
+        self.quadros += 1
+
+    def fecha(self):
+        """Espera todos os quadros serem gravados e encerra o pool."""
+        try:
+            while self._pendentes:
+                self._pendentes.popleft().result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fecha()
+
+
+class SaidaVideo:
+    """Grava os quadros em um vídeo com o ffmpeg.
+
+    O ffmpeg roda em um processo próprio e codifica em paralelo. Os quadros são escritos no pipe
+    dele por uma thread, a partir de uma fila limitada, então desenhar um quadro não espera o pipe.
+    """
+
+    def __init__(self, arquivo: str, fps: int = 25, max_pendentes: int = 32):
+        """
+        args:
+            arquivo (str): o vídeo de saída, como "partida.mp4".
+            fps (int): quadros por segundo.
+            max_pendentes (int): quantos quadros podem esperar na fila antes de escreve() bloquear.
+        """
+        self.arquivo = arquivo
+        self.fps = fps
+        self.quadros = 0
+        self._fila = queue.Queue(maxsize=max_pendentes)
+        self._processo = None
+        self._thread = None
+        self._erro = None
+
+    def _envia(self):
+        while True:
+            pixels = self._fila.get()
+            if pixels is None:
+                return
+            # Depois de um erro a fila continua sendo esvaziada, para que escreve() não fique bloqueado
+            if self._erro is None:
+                try:
+                    self._processo.stdin.write(pixels)
+                except OSError as erro:
+                    self._erro = erro
+
+    def escreve(self, pixels: bytes, tamanho: Tuple[int, int]):
+        """Põe um quadro RGB na fila do ffmpeg, iniciando-o no primeiro quadro.
+
+        args:
+            pixels (bytes): os pixels do quadro, em RGB, linha a linha.
+            tamanho (Tuple[int, int]): a largura e a altura do quadro, iguais em todos os quadros.
+        """
+        if self._erro is not None:
+            raise RuntimeError(f"O ffmpeg parou de aceitar quadros para {self.arquivo}.") from self._erro
+        if self._processo is None:
+            self._processo = abre_ffmpeg(self.arquivo, tamanho[0], tamanho[1], self.fps, "rgb24")
+            self._thread = threading.Thread(target=self._envia, name="saida-video", daemon=True)
+            self._thread.start()
+        self._fila.put(pixels)
+        self.quadros += 1
+
+    def fecha(self):
+        """Espera a fila ser enviada e o ffmpeg terminar o arquivo."""
+        if self._processo is None:
+            return
+        self._fila.put(None)
+        self._thread.join()
+        self._processo.stdin.close()
+        if self._processo.wait() != 0 or self._erro is not None:
+            raise RuntimeError(f"O ffmpeg terminou com erro ao gravar {self.arquivo}.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fecha()
+
+
+def abre_saida(arquivo: str, fps: int = 25, processos: int = None):
+    """Escolhe a saída pelo nome: um padrão com campo de formatação grava imagens, e o resto, um vídeo.
+
+    args:
+        arquivo (str): "quadros/{:06d}.png" ou "partida.mp4", por exemplo.
+        fps (int): quadros por segundo do vídeo.
+        processos (int): quantos processos codificam as imagens.
+    """
+    if "{" in arquivo:
+        return SaidaImagens(arquivo, processos)
+    return SaidaVideo(arquivo, fps)
+
+
+class RenderizadorOffscreen:
+    """Desenha os quadros da interface (campo, grafo de passes, rota e placar) em uma Surface fora da tela.
+
+    Usa o mesmo InterfaceDrawer da janela, então os quadros são iguais aos mostrados no jogo, sem os
+    botões Play e Next.
+    """
+
+    def __init__(self, resolucao: Tuple[int, int] = (1280, 720), fundo: str = CAMINHO_FUNDO,
+                 mostrar_botoes: bool = False):
+        """Inicializa o pygame sem janela e cria a Surface.
+
+        args:
+            resolucao (Tuple[int, int]): a largura e a altura dos quadros, em pixels.
+            fundo (str): a imagem do campo.
+            mostrar_botoes (bool): se os botões da interface aparecem nos quadros.
+        """
+        # Sem display, o SDL precisa do driver dummy; um driver já escolhido pelo ambiente é respeitado
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.init()
+        self.superficie = pygame.Surface(resolucao)
+        self.interface = InterfaceDrawer(self.superficie, fundo)
+        self.interface.mostrar_botoes = mostrar_botoes
+
+    @property
+    def resolucao(self) -> Tuple[int, int]:
+        return self.superficie.get_size()
+
+    def renderiza(self, grafo: GrafoSimples, grafo_inimigo: GrafoSimples, caminho: List[str] = None,
+                  placar: int = None) -> bytes:
+        """Desenha um quadro e retorna os pixels.
+
+        args:
+            grafo (GrafoSimples): o grafo do time que ataca.
+            grafo_inimigo (GrafoSimples): o time adversário, ou None se a sequência não tem adversário.
+            caminho (List[str]): a rota a destacar, opcional.
+            placar (int): os gols do time da casa. Se omitido, o placar não muda.
+
+        returns:
+            bytes: os pixels do quadro, em RGB, linha a linha.
+        """
+        if placar is not None:
+            self.interface.score = placar
+        self.interface.draw_frame(grafo, grafo_inimigo, caminho)
+        return pygame.image.tobytes(self.superficie, "RGB")
+
+    def renderiza_sequencia(self, quadros: Iterable[tuple], saida) -> int:
+        """Desenha uma sequência de quadros e os envia para uma saída, um por vez.
+
+        args:
+            quadros (iterable): tuplas (grafo, grafo_inimigo, caminho) ou (grafo, grafo_inimigo,
+                caminho, placar), como as de quadros_gravados.
+            saida: uma SaidaImagens, uma SaidaVideo ou qualquer objeto com escreve(pixels, tamanho).
+                Não é fechada aqui.
+
+        returns:
+            int: quantos quadros foram renderizados.
+        """
+        renderizados = 0
+        for quadro in quadros:
+            saida.escreve(self.renderiza(*quadro), self.resolucao)
+            renderizados += 1
+        return renderizados
+
+
+def main():
+    from data_structure.snapshot import SequenciaGravada
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entrada", help="arquivo gravado por GravadorSequencia")
+    parser.add_argument("saida", help="vídeo (.mp4, .mkv) ou padrão de imagens, como 'quadros/{:06d}.png'")
+    parser.add_argument("--fps", type=int, default=25)
+    parser.add_argument("--resolucao", default="1280x720", help="largura x altura, em pixels")
+    parser.add_argument("--processos", type=int, help="processos que codificam as imagens")
+    parser.add_argument("--origem", default="Alisson", help="a rota destacada vai desta origem até --destino")
+    parser.add_argument("--destino", default="Gol")
+    args = parser.parse_args()
+
+    pasta = os.path.dirname(args.saida)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    sequencia = SequenciaGravada(args.entrada)
+    renderizador = RenderizadorOffscreen(tuple(int(valor) for valor in args.resolucao.split("x")))
+    inicio = time.perf_counter()
+    with abre_saida(args.saida, args.fps, args.processos) as saida:
+        renderizados = renderizador.renderiza_sequencia(quadros_gravados(sequencia, args.origem, args.destino), saida)
+    duracao = time.perf_counter() - inicio
+    print(f"{renderizados} quadros em {duracao:.2f} s ({renderizados / max(duracao, 1e-9):.1f} quadros/s, "
+          f"{renderizados / args.fps / max(duracao, 1e-9):.1f}x o tempo real)")
+
+
+if __name__ == "__main__":
+    main()
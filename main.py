@@ -1,12 +1,17 @@
-from random import uniform
+import os
+import sys
+import time
 import pygame
-import pygame_gui
-from typing import List, Tuple, Any
 from enum import Enum
 import random
-import math
 from gui.gui import InterfaceDrawer
-from data_structure.graph import GrafoSimples
+from profiling import perfil
+from simulation.cenarios import (FORMACOES, JOGADORES_TIME_1, JOGADORES_TIME_2, gera_cenario,
+                                 generate_graph, get_player_positions)
+from simulation.trabalhador import CAMINHO, CENARIO, ERRO, TrabalhadorGrafos
+
+# Imprime os grafos a cada cenário novo: --depurar
+DEPURAR = "--depurar" in sys.argv
 
 
 class EventType(Enum):
@@ -36,119 +41,25 @@ def process_event_bus(tamanho):
     return EventType.NONE
 
 
-def get_player_positions(formacao_time_1, formacao_time_2) -> List[Tuple[int, int]]:
-    """Função temporária, que retorna um exemplo
-    de posicionamento para os jogadores."""
-    if(formacao_time_1 == "4-3-3"):
-        posicao_time_1 = [(0, 0),
-            (1, -2), (1, -1), (1, 1), (1, 2),
-
-            (3, -2), (2, 0), (3, 2),
-            (4, -2),(4, 0),(4,2), (5.6,0)]
-    if(formacao_time_1 == "4-4-2"):
-        posicao_time_1 = [(0, 0),
-            (1, -2), (1, -1), (1, 1), (1, 2),
-            (2, -1), (2, 1),
-
-            (3, -2), (3, 2),
-            (4, -1), (4, 1) , (5.6,0)]
-    if(formacao_time_1 == "4-5-1"):
-        posicao_time_1 = [(0, 0),
-            (1, -2), (1, -1), (1, 1), (1, 2),
-            (2, -1), (2, 1),
-            (2.5, 0),
-
-            (3, -2), (3, 2),
-            (4, 0), (5.6,0)]
-
-    if(formacao_time_2 == "4-3-3"):
-        posicao_time_2 = [(5.2, 0),
-            (4.2, -2), (4.2, -1), (4.2, 1), (4.2, 2),
-
-            (2.2, -2), (3.2, 0), (2.2, 2),
-            (1.2, -2),(1.2, 0),(1.2,2)]
-    if(formacao_time_2 == "4-4-2"):
-        posicao_time_2 = [(5.2, 0),
-            (4.2, -2), (4.2, -1), (4.2, 1), (4.2, 2),
-            (3.2, -1), (3.2, 1),
-
-            (2.2, -2), (2.2, 2),
-            (1.2, -1), (1.2, 1)]
-    if(formacao_time_2 == "4-5-1"):
-        posicao_time_2 = [(5.2, 0),
-            (4.2, -2), (4.2, -1), (4.2, 1), (4.2, 2),
-            (3.2, -1), (3.2, 1),
-            (2.7, 0),
-
-            (2.2, -2), (2.2, 2),
-            (1.2, 0)]
-        
-    for i in range(1, len(posicao_time_1)):
-        x, y = posicao_time_1[i]
-        
-        posicao_time_1[i] = (x, y)
-    
-    for i in range(1, len(posicao_time_2)):
-        x, y = posicao_time_2[i]
-        posicao_time_2[i] = (x, y)
-
-    return posicao_time_1, posicao_time_2
-
-def generate_graph(jogadores: List[Any], posicoes: List[Tuple[int, int]]):
-    """Gera um grafo simples, sem arestas, e com os jogadores
-    como vértices."""
-    grafo = GrafoSimples()
-
-    for jogador, posicao in zip(jogadores, posicoes):
-        grafo.adiciona_vertice(jogador, posicao)
-
-    return grafo
-
-
-def atualizar_posicoes_sem_sobreposicao(posicoes_time_1, posicoes_time_2):
-    limite_x, limite_y = 5.0, 2.0  # Limites do campo
-    proximidade_minima = 0.6  # Distância mínima permitida entre jogadores
-
-    # Função para verificar a proximidade entre dois pontos
-    def muito_proxima(pos1, pos2):
-        return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2) < proximidade_minima
-
-    # Atualizar posições para ambos os times
-    for time_posicoes in [posicoes_time_1, posicoes_time_2]:
-        for i in range(1, len(time_posicoes)-1):  # Ignora o goleiro e o gol
-            nova_pos = (round(uniform(0, limite_x), 1), round(uniform(-limite_y, limite_y), 1))
-
-            # Verificar proximidade com outros jogadores de ambos os times
-            while any(muito_proxima(nova_pos, p) for p in posicoes_time_1 + posicoes_time_2 if p != time_posicoes[i]):
-                nova_pos = (round(uniform(0, limite_x), 1), round(uniform(-limite_y, limite_y), 1))
-
-            time_posicoes[i] = nova_pos
-
-    return posicoes_time_1, posicoes_time_2
-
+@perfil.medir("update_positions")
 def update_positions(formacao_time_1, formacao_time_2):
-    global posicoes_time_1, posicoes_time_2, grafo, grafo_two
-
-    # Obter posições iniciais baseadas na formação
-    posicoes_time_1, posicoes_time_2 = get_player_positions(formacao_time_1, formacao_time_2)
-
-    # Atualizar posições sem sobreposição
-    posicoes_time_1, posicoes_time_2 = atualizar_posicoes_sem_sobreposicao(posicoes_time_1, posicoes_time_2)
-
-    # Atualizar grafos
-    grafo = generate_graph(jogadores_time_1, posicoes_time_1)
-    grafo.cria_grafo_completo(grafo_two)
-
-    grafo_two = generate_graph(jogadores_time_2, posicoes_time_2)
+    """Sorteia um cenário novo. Roda no TrabalhadorGrafos, fora do laço da interface."""
+    # Sortear posições sem sobreposição e montar grafos novos
+    novo_grafo, novo_grafo_two = gera_cenario(formacao_time_1, formacao_time_2)
 
     # Visualizar grafos (Opcional, para depuração)
-    grafo.visualizar()
-    grafo_two.visualizar()
-    
+    if DEPURAR:
+        novo_grafo.visualizar()
+        novo_grafo_two.visualizar()
+
+    return novo_grafo, novo_grafo_two
 
 
 def main_menu(screen):
     """Exibe o menu inicial para seleção das formações com uma imagem de fundo."""
+    # Só o menu usa o pygame_gui; importá-lo aqui deixa a inicialização mais rápida
+    import pygame_gui
+
     pygame.init()
 
     tela_largura, tela_altura = screen.get_size()
@@ -178,13 +89,13 @@ def main_menu(screen):
     manager = pygame_gui.UIManager((tela_largura, tela_altura))
 
     dropdown_time_1 = pygame_gui.elements.UIDropDownMenu(
-        options_list=["4-4-2", "4-3-3", "4-5-1"],
+        options_list=FORMACOES,
         starting_option="4-4-2",
         relative_rect=pygame.Rect((pos_x_dropdown1, pos_y_dropdown), (largura_dropdown, altura_dropdown)),
         manager=manager)
 
     dropdown_time_2 = pygame_gui.elements.UIDropDownMenu(
-        options_list=["4-4-2", "4-3-3", "4-5-1"],
+        options_list=FORMACOES,
         starting_option="4-4-2",
         relative_rect=pygame.Rect((pos_x_dropdown2, pos_y_dropdown), (largura_dropdown, altura_dropdown)),
         manager=manager)
@@ -224,31 +135,26 @@ def main_menu(screen):
     pygame.quit()
 
 
+@perfil.medir("draw_screen")
 def draw_screen(gui, caminho=None):
-    gui.draw_background()
-    gui.draw_edges(grafo, (255, 255, 255))
-    gui.draw_players(grafo, (255, 255, 255))
-    gui.draw_players(grafo_two, (255, 255, 0))
-    gui.draw_button("Play", False)
-    gui.draw_button("Next", True)
-    gui.draw_score()
-    if caminho:
-        gui.draw_path(grafo, caminho, (255, 0, 255))
+    gui.draw_frame(grafo, grafo_two, caminho)
 
 
 if __name__ == "__main__":
     TAMANHO_TELA = (1280, 720)
 
+    # Instrumentação de tempo: --perfil ou FOOTBALL_GRAPHS_PERFIL=1
+    if "--perfil" in sys.argv:
+        perfil.ativar()
+    linhas_perfil = []
+    ultimo_resumo = 0.0
+
     pygame.init()
     tela = pygame.display.set_mode(TAMANHO_TELA)
     formacao_time_1, formacao_time_2 = main_menu(tela)
 
-    jogadores_time_1 = ["Alisson", "Royal", "Marquinhos", "Magalhães",
-                 "Augusto", "André", "Guimarães", "Rodrygo",
-                 "Raphinha", "Jesus", "Martinelli", "Gol"]
-    jogadores_time_2 = [
-    "Bruno", "Carlos", "Daniel", "Eduardo", "Fernando", "Gabriel",
-    "Henrique", "Igor", "João", "Lucas", "Matheus"]
+    jogadores_time_1 = JOGADORES_TIME_1
+    jogadores_time_2 = JOGADORES_TIME_2
     posicoes_time_1, posicoes_time_2 = get_player_positions(formacao_time_1, formacao_time_2)
 
     pygame.init()
@@ -264,7 +170,11 @@ if __name__ == "__main__":
 
     tela = pygame.display.set_mode(TAMANHO_TELA)
     interface = InterfaceDrawer(tela, "assets/pitch.jpg")
-    draw_screen(interface)
+    caminho_ate_o_gol = None
+
+    # Os cenários e os caminhos são calculados em segundo plano; o laço só troca os grafos
+    # desenhados quando um resultado fica pronto
+    trabalhador = TrabalhadorGrafos(grafo, grafo_two, update_positions)
     
     quit = False
     clock = pygame.time.Clock()
@@ -277,14 +187,40 @@ if __name__ == "__main__":
                 quit = True
                 break
             case EventType.PLAY:
-                caminho_ate_o_gol = grafo.encontra_caminho_mais_curto("Alisson", "Gol")
-                
                 if random.random() < 100:
-                    interface.score += 1
-                    draw_screen(interface, caminho_ate_o_gol)
+                    trabalhador.pede_caminho("Alisson", "Gol")
             case EventType.NEXT:
-                update_positions(formacao_time_1, formacao_time_2)
+                trabalhador.pede_cenario(formacao_time_1, formacao_time_2)
+                caminho_ate_o_gol = None
                 interface.score = 0
-                draw_screen(interface)
             case _:
                 pass
+
+        for tipo, resultado in trabalhador.coleta():
+            if tipo == CENARIO:
+                grafo, grafo_two = resultado
+            elif tipo == CAMINHO:
+                caminho_ate_o_gol = resultado
+                interface.score += 1
+            elif tipo == ERRO:
+                # O quadro anterior continua na tela; só o pedido que falhou é perdido
+                pedido, excecao = resultado
+                print(f"Falha ao calcular o {pedido}: {excecao!r}")
+
+        # Só as regiões que mudaram desde o último quadro são enviadas para a tela
+        draw_screen(interface, caminho_ate_o_gol)
+
+        if perfil.ATIVO:
+            if time.perf_counter() - ultimo_resumo > 0.5:
+                linhas_perfil = perfil.linhas_resumo()
+                ultimo_resumo = time.perf_counter()
+            interface.draw_overlay(linhas_perfil)
+
+        clock.tick(60)
+
+    trabalhador.encerra()
+
+    if perfil.ATIVO:
+        arquivo_perfil = os.environ.get("FOOTBALL_GRAPHS_PERFIL_ARQUIVO", "perfil.json")
+        perfil.salvar(arquivo_perfil)
+        print(f"Perfil salvo em {arquivo_perfil}")
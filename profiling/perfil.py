@@ -0,0 +1,159 @@
+"""Instrumentação opcional de tempo das etapas críticas.
+
+Fica desligada por padrão. É ligada pela variável de ambiente
+FOOTBALL_GRAPHS_PERFIL=1 ou chamando ativar(). Desligada, cada função
+instrumentada paga apenas um teste de um booleano antes de ser chamada.
+
+Para cada etapa são guardados a contagem de chamadas, o tempo total e uma
+janela com as durações mais recentes, de onde saem os percentis. Os eventos
+individuais ficam em um buffer limitado e podem ser salvos em JSON ou CSV.
+"""
+import csv
+import functools
+import json
+import math
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+VARIAVEL_AMBIENTE = "FOOTBALL_GRAPHS_PERFIL"
+TAMANHO_JANELA = 1000
+MAXIMO_EVENTOS = 100_000
+
+ATIVO = os.environ.get(VARIAVEL_AMBIENTE, "") not in ("", "0")
+
+_estatisticas = {}
+_eventos = deque(maxlen=MAXIMO_EVENTOS)
+_inicio = time.perf_counter()
+
+
+class Estatistica:
+    """
+    Tempos acumulados de uma etapa.
+
+    Atributos:
+    contagem (int): Quantas vezes a etapa foi executada.
+    total (float): O tempo total gasto na etapa, em segundos.
+    janela (deque): As durações mais recentes, usadas nos percentis.
+    """
+
+    def __init__(self):
+        self.contagem = 0
+        self.total = 0.0
+        self.janela = deque(maxlen=TAMANHO_JANELA)
+
+    def registra(self, duracao):
+        self.contagem += 1
+        self.total += duracao
+        self.janela.append(duracao)
+
+    def percentil(self, p):
+        """Retorna o percentil p (entre 0 e 100) das durações da janela, em segundos."""
+        if not self.janela:
+            return math.nan
+        ordenadas = sorted(self.janela)
+        return ordenadas[min(len(ordenadas) - 1, int(round(p / 100 * (len(ordenadas) - 1))))]
+
+    def como_dict(self):
+        return {
+            "contagem": self.contagem,
+            "total": self.total,
+            "media": self.total / self.contagem if self.contagem else math.nan,
+            "p50": self.percentil(50),
+            "p95": self.percentil(95),
+            "p99": self.percentil(99),
+        }
+
+
+def ativar(ativo=True):
+    """Liga ou desliga a instrumentação."""
+    global ATIVO
+    ATIVO = ativo
+
+
+def registra(etapa, duracao, inicio=None):
+    """Registra uma execução de uma etapa com a duração informada, em segundos."""
+    estatistica = _estatisticas.get(etapa)
+    if estatistica is None:
+        estatistica = _estatisticas[etapa] = Estatistica()
+    estatistica.registra(duracao)
+    _eventos.append((etapa, (inicio if inicio is not None else time.perf_counter() - duracao) - _inicio, duracao))
+
+
+def medir(etapa):
+    """
+    Decorador que mede o tempo de cada chamada da função como uma etapa.
+
+    Parâmetros:
+    etapa (str): O nome da etapa.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def instrumentada(*args, **kwargs):
+            if not ATIVO:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registra(etapa, time.perf_counter() - inicio, inicio)
+        return instrumentada
+    return decorador
+
+
+@contextmanager
+def trecho(etapa):
+    """Gerenciador de contexto que mede o tempo de um bloco de código como uma etapa."""
+    if not ATIVO:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registra(etapa, time.perf_counter() - inicio, inicio)
+
+
+def resumo():
+    """Retorna um dicionário com as estatísticas de cada etapa, da que consumiu mais tempo para a que consumiu menos."""
+    ordenadas = sorted(_estatisticas.items(), key=lambda item: item[1].total, reverse=True)
+    return {etapa: estatistica.como_dict() for etapa, estatistica in ordenadas}
+
+
+def limpar():
+    """Descarta todas as estatísticas e eventos registrados."""
+    _estatisticas.clear()
+    _eventos.clear()
+
+
+def salvar(caminho):
+    """
+    Salva o registro em um arquivo.
+
+    Em .csv, cada linha é um evento (etapa, inicio, duracao). Nos demais casos, é salvo um JSON
+    com o resumo por etapa e a lista de eventos.
+
+    Parâmetros:
+    caminho (str): O arquivo de saída.
+    """
+    if caminho.endswith(".csv"):
+        with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(["etapa", "inicio", "duracao"])
+            escritor.writerows(_eventos)
+        return
+
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "resumo": resumo(),
+            "eventos": [{"etapa": etapa, "inicio": inicio, "duracao": duracao} for etapa, inicio, duracao in _eventos],
+        }, arquivo, ensure_ascii=False, indent=2)
+
+
+def linhas_resumo(maximo=8):
+    """Retorna linhas de texto curtas com as etapas mais custosas, para exibição na tela."""
+    linhas = []
+    for etapa, dados in list(resumo().items())[:maximo]:
+        linhas.append(f"{etapa}: {dados['contagem']}x p50 {dados['p50'] * 1e3:.2f} ms p95 {dados['p95'] * 1e3:.2f} ms")
+    return linhas
@@ -0,0 +1,163 @@
+from typing import List, Tuple, Any
+
+import numpy as np
+
+from data_structure.graph import GrafoSimples
+from data_structure.pesos import matriz_distancias
+
+FORMACOES = ["4-4-2", "4-3-3", "4-5-1"]
+
+JOGADORES_TIME_1 = ["Alisson", "Royal", "Marquinhos", "Magalhães",
+                    "Augusto", "André", "Guimarães", "Rodrygo",
+                    "Raphinha", "Jesus", "Martinelli", "Gol"]
+JOGADORES_TIME_2 = ["Bruno", "Carlos", "Daniel", "Eduardo", "Fernando", "Gabriel",
+                    "Henrique", "Igor", "João", "Lucas", "Matheus"]
+
+
+def get_player_positions(formacao_time_1, formacao_time_2) -> List[Tuple[int, int]]:
+    """Função temporária, que retorna um exemplo
+    de posicionamento para os jogadores."""
+    if(formacao_time_1 == "4-3-3"):
+        posicao_time_1 = [(0, 0),
+            (1, -2), (1, -1), (1, 1), (1, 2),
+
+            (3, -2), (2, 0), (3, 2),
+            (4, -2),(4, 0),(4,2), (5.6,0)]
+    if(formacao_time_1 == "4-4-2"):
+        posicao_time_1 = [(0, 0),
+            (1, -2), (1, -1), (1, 1), (1, 2),
+            (2, -1), (2, 1),
+
+            (3, -2), (3, 2),
+            (4, -1), (4, 1) , (5.6,0)]
+    if(formacao_time_1 == "4-5-1"):
+        posicao_time_1 = [(0, 0),
+            (1, -2), (1, -1), (1, 1), (1, 2),
+            (2, -1), (2, 1),
+            (2.5, 0),
+
+            (3, -2), (3, 2),
+            (4, 0), (5.6,0)]
+
+    if(formacao_time_2 == "4-3-3"):
+        posicao_time_2 = [(5.2, 0),
+            (4.2, -2), (4.2, -1), (4.2, 1), (4.2, 2),
+
+            (2.2, -2), (3.2, 0), (2.2, 2),
+            (1.2, -2),(1.2, 0),(1.2,2)]
+    if(formacao_time_2 == "4-4-2"):
+        posicao_time_2 = [(5.2, 0),
+            (4.2, -2), (4.2, -1), (4.2, 1), (4.2, 2),
+            (3.2, -1), (3.2, 1),
+
+            (2.2, -2), (2.2, 2),
+            (1.2, -1), (1.2, 1)]
+    if(formacao_time_2 == "4-5-1"):
+        posicao_time_2 = [(5.2, 0),
+            (4.2, -2), (4.2, -1), (4.2, 1), (4.2, 2),
+            (3.2, -1), (3.2, 1),
+            (2.7, 0),
+
+            (2.2, -2), (2.2, 2),
+            (1.2, 0)]
+        
+    for i in range(1, len(posicao_time_1)):
+        x, y = posicao_time_1[i]
+        
+        posicao_time_1[i] = (x, y)
+    
+    for i in range(1, len(posicao_time_2)):
+        x, y = posicao_time_2[i]
+        posicao_time_2[i] = (x, y)
+
+    return posicao_time_1, posicao_time_2
+
+def generate_graph(jogadores: List[Any], posicoes: List[Tuple[int, int]]):
+    """Gera um grafo simples, sem arestas, e com os jogadores
+    como vértices."""
+    grafo = GrafoSimples()
+
+    for jogador, posicao in zip(jogadores, posicoes):
+        grafo.adiciona_vertice(jogador, posicao)
+
+    return grafo
+
+
+LIMITE_X, LIMITE_Y = 5.0, 2.0  # Limites do campo
+PROXIMIDADE_MINIMA = 0.6  # Distância mínima permitida entre jogadores
+
+
+def amostra_posicoes(quantidade, posicoes_fixas, rng=None, limite_x=LIMITE_X, limite_y=LIMITE_Y,
+                     proximidade_minima=PROXIMIDADE_MINIMA, max_lotes=100):
+    """Sorteia várias posições de uma vez, arredondadas a 0.1, com x em [0, limite_x]
+    e y em [-limite_y, limite_y], sem que nenhuma fique a menos de
+    proximidade_minima das outras sorteadas nem das posições fixas.
+
+    Os candidatos são gerados em lotes; a distância de cada lote às posições já
+    aceitas é calculada de uma vez, e os candidatos válidos são aceitos em ordem.
+    Se, depois de max_lotes lotes, ainda faltarem posições, lança RuntimeError em
+    vez de continuar tentando indefinidamente.
+
+    rng pode ser uma semente inteira ou um numpy.random.Generator."""
+    rng = np.random.default_rng(rng)
+    fixas = np.asarray(posicoes_fixas, dtype=np.float64).reshape(-1, 2)
+    aceitas = np.empty((0, 2))
+
+    for _ in range(max_lotes):
+        faltam = quantidade - len(aceitas)
+        if faltam == 0:
+            break
+
+        candidatos = np.round(np.column_stack((
+            rng.uniform(0, limite_x, 4 * faltam),
+            rng.uniform(-limite_y, limite_y, 4 * faltam),
+        )), 1)
+        ocupadas = np.concatenate((fixas, aceitas))
+        livres = (matriz_distancias(candidatos, ocupadas) >= proximidade_minima).all(axis=1)
+        compativeis = matriz_distancias(candidatos) >= proximidade_minima
+
+        novas = []
+        for i in np.flatnonzero(livres).tolist():
+            if not livres[i]:
+                continue
+            novas.append(i)
+            if len(novas) == faltam:
+                break
+            livres &= compativeis[i]
+        aceitas = np.concatenate((aceitas, candidatos[novas]))
+
+    if len(aceitas) < quantidade:
+        raise RuntimeError(f"Não foi possível posicionar {quantidade} jogadores sem sobreposição "
+                           f"em {max_lotes} lotes de candidatos.")
+    return [tuple(posicao) for posicao in aceitas.tolist()]
+
+
+def atualizar_posicoes_sem_sobreposicao(posicoes_time_1, posicoes_time_2, rng=None):
+    """Sorteia novas posições para os jogadores de linha dos dois times, sem que
+    dois jogadores fiquem a menos de uma distância mínima. O goleiro e a última
+    posição de cada time não são alterados. rng pode ser uma semente inteira ou
+    um numpy.random.Generator."""
+    moveis = [(time_posicoes, i) for time_posicoes in [posicoes_time_1, posicoes_time_2]
+              for i in range(1, len(time_posicoes)-1)]  # Ignora o goleiro e o gol
+    fixas = [posicoes_time_1[0], posicoes_time_1[-1], posicoes_time_2[0], posicoes_time_2[-1]]
+
+    # Sortear as posições dos dois times em uma única chamada
+    novas = amostra_posicoes(len(moveis), fixas, rng)
+    for (time_posicoes, i), nova_pos in zip(moveis, novas):
+        time_posicoes[i] = nova_pos
+
+    return posicoes_time_1, posicoes_time_2
+
+
+def gera_cenario(formacao_time_1, formacao_time_2, rng=None, modelo=None):
+    """Sorteia um cenário a partir das formações e monta os grafos dos dois
+    times, com as arestas do time 1 pesadas contra as posições do time 2.
+    'modelo' é o ModeloPeso usado nos pesos (por padrão, MODELO_PADRAO)."""
+    posicoes_time_1, posicoes_time_2 = get_player_positions(formacao_time_1, formacao_time_2)
+    posicoes_time_1, posicoes_time_2 = atualizar_posicoes_sem_sobreposicao(posicoes_time_1, posicoes_time_2, rng)
+
+    grafo_two = generate_graph(JOGADORES_TIME_2, posicoes_time_2)
+    grafo = generate_graph(JOGADORES_TIME_1, posicoes_time_1)
+    grafo.cria_grafo_completo(grafo_two, modelo)
+
+    return grafo, grafo_two
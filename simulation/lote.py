@@ -0,0 +1,194 @@
+"""Simulação em lote, sem interface gráfica, de cenários aleatórios a partir das formações.
+
+Cada cenário repete o que um clique em "Next" seguido de "Play" faz na interface: sorteia as
+posições, monta o grafo de passes e procura o caminho mais curto até o gol. Os cenários são
+divididos em blocos, e cada bloco roda em um processo com a sua própria semente.
+
+Uso:
+    python -m simulation.lote --time-1 4-3-3 --time-2 4-4-2 --cenarios 100000 --processos 8
+"""
+import argparse
+import json
+import math
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulation.cenarios import FORMACOES, JOGADORES_TIME_1, gera_cenario
+
+ORIGEM = JOGADORES_TIME_1[0]
+DESTINO = "Gol"
+
+class ResultadoLote:
+    """
+    Estatísticas agregadas de um lote de cenários.
+
+    Atributos:
+    cenarios (int): Quantos cenários foram simulados.
+    sem_caminho (int): Quantos cenários não tinham caminho até o gol.
+    soma_custos (float): A soma dos custos dos caminhos encontrados.
+    custo_minimo (float): O menor custo encontrado.
+    custo_maximo (float): O maior custo encontrado.
+    soma_passes (int): A soma do número de passes dos caminhos encontrados.
+    passes (Counter): Quantos caminhos tiveram cada número de passes.
+    envolvimento (Counter): Em quantos caminhos cada jogador aparece.
+    tempo (float): O tempo total de execução, em segundos.
+    """
+
+    def __init__(self):
+        self.cenarios = 0
+        self.sem_caminho = 0
+        self.soma_custos = 0.0
+        self.custo_minimo = math.inf
+        self.custo_maximo = -math.inf
+        self.soma_passes = 0
+        self.passes = Counter()
+        self.envolvimento = Counter()
+        self.tempo = 0.0
+
+    def registra(self, caminho, custo):
+        """Acrescenta o resultado de um cenário às estatísticas."""
+        self.cenarios += 1
+        if not isinstance(caminho, list):
+            self.sem_caminho += 1
+            return
+        self.soma_custos += custo
+        self.custo_minimo = min(self.custo_minimo, custo)
+        self.custo_maximo = max(self.custo_maximo, custo)
+        self.soma_passes += len(caminho) - 1
+        self.passes[len(caminho) - 1] += 1
+        self.envolvimento.update(caminho)
+
+    def junta(self, outro):
+        """Acrescenta as estatísticas de outro ResultadoLote a este."""
+        self.cenarios += outro.cenarios
+        self.sem_caminho += outro.sem_caminho
+        self.soma_custos += outro.soma_custos
+        self.custo_minimo = min(self.custo_minimo, outro.custo_minimo)
+        self.custo_maximo = max(self.custo_maximo, outro.custo_maximo)
+        self.soma_passes += outro.soma_passes
+        self.passes.update(outro.passes)
+        self.envolvimento.update(outro.envolvimento)
+
+    @property
+    def com_caminho(self):
+        return self.cenarios - self.sem_caminho
+
+    @property
+    def custo_medio(self):
+        return self.soma_custos / self.com_caminho if self.com_caminho else math.nan
+
+    @property
+    def passes_medio(self):
+        return self.soma_passes / self.com_caminho if self.com_caminho else math.nan
+
+    @property
+    def cenarios_por_segundo(self):
+        return self.cenarios / self.tempo if self.tempo else math.nan
+
+    def como_dict(self):
+        """Retorna as estatísticas em um dicionário serializável em JSON."""
+        return {
+            "cenarios": self.cenarios,
+            "sem_caminho": self.sem_caminho,
+            "custo_medio": self.custo_medio,
+            "custo_minimo": self.custo_minimo if self.com_caminho else None,
+            "custo_maximo": self.custo_maximo if self.com_caminho else None,
+            "passes_medio": self.passes_medio,
+            "passes": {str(k): v for k, v in sorted(self.passes.items())},
+            "envolvimento": dict(self.envolvimento.most_common()),
+            "tempo": self.tempo,
+            "cenarios_por_segundo": self.cenarios_por_segundo,
+        }
+
+
+def simula_bloco(formacao_time_1, formacao_time_2, cenarios, semente):
+    """
+    Simula um bloco de cenários com um gerador de números aleatórios próprio.
+
+    Parâmetros:
+    formacao_time_1 (str): A formação do time que ataca.
+    formacao_time_2 (str): A formação do time que defende.
+    cenarios (int): Quantos cenários simular.
+    semente (int): A semente do gerador do bloco.
+
+    Retorna:
+    ResultadoLote: As estatísticas do bloco.
+    """
+    rng = np.random.default_rng(semente)
+    resultado = ResultadoLote()
+    for _ in range(cenarios):
+        grafo, _ = gera_cenario(formacao_time_1, formacao_time_2, rng)
+        caminho, custo = grafo.encontra_caminho_mais_curto(ORIGEM, DESTINO, retornar_custo=True)
+        resultado.registra(caminho, custo)
+    return resultado
+
+
+def executa_lote(formacao_time_1, formacao_time_2, cenarios, processos=None, semente=0, tamanho_bloco=1000):
+    """
+    Simula muitos cenários distribuídos em um conjunto de processos.
+
+    A divisão em blocos e as sementes dependem só de 'cenarios', 'semente' e 'tamanho_bloco', então o
+    resultado é o mesmo para qualquer número de processos.
+
+    Parâmetros:
+    formacao_time_1 (str): A formação do time que ataca.
+    formacao_time_2 (str): A formação do time que defende.
+    cenarios (int): Quantos cenários simular.
+    processos (int): Quantos processos usar. Com 1, roda no processo atual; se omitido, usa todos os núcleos.
+    semente (int): A semente do lote.
+    tamanho_bloco (int): Quantos cenários cada tarefa simula.
+
+    Retorna:
+    ResultadoLote: As estatísticas de todos os cenários.
+    """
+    blocos = [tamanho_bloco] * (cenarios // tamanho_bloco)
+    if cenarios % tamanho_bloco:
+        blocos.append(cenarios % tamanho_bloco)
+    sementes = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(semente).spawn(len(blocos))]
+    argumentos = ([formacao_time_1] * len(blocos), [formacao_time_2] * len(blocos), blocos, sementes)
+
+    inicio = time.perf_counter()
+    resultado = ResultadoLote()
+    if processos == 1:
+        for parcial in map(simula_bloco, *argumentos):
+            resultado.junta(parcial)
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            for parcial in executor.map(simula_bloco, *argumentos):
+                resultado.junta(parcial)
+    resultado.tempo = time.perf_counter() - inicio
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-1", choices=FORMACOES, default="4-4-2", help="formação do time que ataca")
+    parser.add_argument("--time-2", choices=FORMACOES, default="4-4-2", help="formação do time que defende")
+    parser.add_argument("--cenarios", type=int, default=10000)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--tamanho-bloco", type=int, default=1000)
+    parser.add_argument("--json", help="arquivo onde salvar as estatísticas")
+    args = parser.parse_args()
+
+    resultado = executa_lote(args.time_1, args.time_2, args.cenarios, args.processos, args.semente, args.tamanho_bloco)
+
+    print(f"{resultado.cenarios} cenários em {resultado.tempo:.2f} s "
+          f"({resultado.cenarios_por_segundo:.0f} cenários/s)")
+    print(f"Sem caminho: {resultado.sem_caminho}")
+    print(f"Custo médio: {resultado.custo_medio:.3f} (mín. {resultado.custo_minimo:.3f}, máx. {resultado.custo_maximo:.3f})")
+    print(f"Passes por caminho: {resultado.passes_medio:.2f}")
+    print("Envolvimento:")
+    for jogador, vezes in resultado.envolvimento.most_common():
+        print(f"  {jogador:<12} {vezes / resultado.cenarios:6.1%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado.como_dict(), arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""Otimização do posicionamento defensivo contra um time que ataca parado.
+
+Procura onde pôr os jogadores de linha do time 2 para que a rota mais barata do time 1 até o gol,
+com os pesos de GrafoSimples.adiciona_aresta, custe o máximo possível. Só o termo de marcador dos
+pesos depende da defesa, então os outros termos são calculados uma vez e cada posicionamento
+candidato custa uma distância ao marcador por atacante e um Bellman–Ford, feitos em lote para
+muitos candidatos de uma vez.
+
+A busca é um recozimento simulado com várias cadeias independentes: a cada passo, cada cadeia move
+um defensor, todas as propostas são avaliadas juntas e aceitas pelo critério de Metropolis. As
+cadeias são divididas em blocos, e cada bloco roda em um processo com a sua própria semente.
+
+Uso:
+    python -m simulation.otimizador --time-1 4-3-3 --time-2 4-4-2 --cadeias 64 --passos 2000 --processos 4
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from data_structure.caminhos import custos_em_lote
+from data_structure.pesos import MODELO_PADRAO, distancias_marcador, matriz_distancias
+from simulation.cenarios import (FORMACOES, JOGADORES_TIME_1, JOGADORES_TIME_2, LIMITE_X, LIMITE_Y,
+                                 PROXIMIDADE_MINIMA, amostra_posicoes, generate_graph, get_player_positions)
+from simulation.lote import DESTINO, ORIGEM
+
+
+def _distancias_em_lote(pontos, outros):
+    """Distâncias entre pontos (P, q, 2) e outros (P, r, 2) ou (r, 2), com as mesmas operações de matriz_distancias."""
+    outros = outros if outros.ndim == 3 else outros[None]
+    dx = pontos[:, :, None, 0] - outros[:, None, :, 0]
+    dy = pontos[:, :, None, 1] - outros[:, None, :, 1]
+    return np.sqrt(dx**2 + dy**2)
+
+
+class ProblemaDefesa:
+    """
+    O problema de posicionar os defensores móveis contra um ataque com posições fixas.
+
+    Atributos:
+    posicoes_ataque (ndarray): Array (n, 2) com as posições do time que ataca, incluindo o gol.
+    posicoes_fixas (ndarray): Array (f, 2) com os defensores que não se movem (o goleiro).
+    moveis (int): Quantos defensores são posicionados.
+    origem (int): O índice, no ataque, de onde parte a rota.
+    destino (int): O índice, no ataque, aonde a rota chega.
+    """
+
+    def __init__(self, posicoes_ataque, posicoes_fixas, moveis, origem, destino, modelo=None,
+                 limite_x=LIMITE_X, limite_y=LIMITE_Y, proximidade_minima=PROXIMIDADE_MINIMA):
+        """
+        Parâmetros:
+        posicoes_ataque (array): Array (n, 2) com as posições do time que ataca.
+        posicoes_fixas (array): Array (f, 2) com as posições dos defensores fixos; pode ser vazio.
+        moveis (int): Quantos defensores são posicionados.
+        origem (int): O índice, no ataque, de onde parte a rota.
+        destino (int): O índice, no ataque, aonde a rota chega.
+        modelo (ModeloPeso): O modelo de peso. Se omitido, usa MODELO_PADRAO.
+        limite_x (float): Os defensores ficam com x em [0, limite_x].
+        limite_y (float): Os defensores ficam com y em [-limite_y, limite_y].
+        proximidade_minima (float): A distância mínima de cada defensor a qualquer outro jogador.
+        """
+        self.modelo = modelo or MODELO_PADRAO
+        self.posicoes_ataque = np.asarray(posicoes_ataque, dtype=np.float64).reshape(-1, 2)
+        self.posicoes_fixas = np.asarray(posicoes_fixas, dtype=np.float64).reshape(-1, 2)
+        self.moveis = moveis
+        self.origem = origem
+        self.destino = destino
+        self.limite_x = limite_x
+        self.limite_y = limite_y
+        self.proximidade_minima = proximidade_minima
+
+        # Os termos que não dependem da defesa
+        self._peso_distancia = self.modelo.termo_distancia(matriz_distancias(self.posicoes_ataque))
+        self._peso_gol = self.modelo.termo_gol(self.modelo.distancias_ao_gol(self.posicoes_ataque))
+        if len(self.posicoes_fixas):
+            self._marcador_fixo = distancias_marcador(self.posicoes_ataque, self.posicoes_fixas)
+        else:
+            self._marcador_fixo = np.full(len(self.posicoes_ataque), np.inf)
+        self._ocupadas = np.concatenate((self.posicoes_ataque, self.posicoes_fixas))
+
+    @classmethod
+    def das_formacoes(cls, formacao_time_1, formacao_time_2, origem=ORIGEM, destino=DESTINO, modelo=None):
+        """
+        Monta o problema com as posições de get_player_positions. O goleiro do time 2 fica fixo.
+
+        Parâmetros:
+        formacao_time_1 (str): A formação do time que ataca.
+        formacao_time_2 (str): A formação do time que defende; só o número de jogadores importa.
+        origem (str): O jogador do time 1 de onde parte a rota.
+        destino (str): O vértice do time 1 aonde a rota chega.
+        modelo (ModeloPeso): O modelo de peso.
+
+        Retorna:
+        ProblemaDefesa: O problema.
+        """
+        posicoes_time_1, posicoes_time_2 = get_player_positions(formacao_time_1, formacao_time_2)
+        return cls(posicoes_time_1, posicoes_time_2[:1], len(posicoes_time_2) - 1,
+                   JOGADORES_TIME_1.index(origem), JOGADORES_TIME_1.index(destino), modelo)
+
+    def custos(self, defensores):
+        """
+        Calcula o custo da rota mais barata da origem ao destino para vários posicionamentos.
+
+        Parâmetros:
+        defensores (array): Array (P, moveis, 2) com as posições dos defensores móveis de cada candidato.
+
+        Retorna:
+        ndarray: Vetor (P,) com os custos, iguais aos de encontra_caminho_mais_curto no grafo montado
+        por monta_grafos.
+        """
+        defensores = np.asarray(defensores, dtype=np.float64).reshape(-1, self.moveis, 2)
+        marcador = np.minimum(_distancias_em_lote(self.posicoes_ataque[None], defensores).min(axis=2), self._marcador_fixo)
+        peso_marcador = self.modelo.termo_marcador(marcador)
+        pesos = self._peso_distancia[None] * (1 + peso_marcador[:, None, :] - self._peso_gol[None, :, None])
+        n = pesos.shape[1]
+        pesos[:, np.arange(n), np.arange(n)] = np.inf
+        return custos_em_lote(pesos, self.origem)[:, self.destino]
+
+    def limita(self, posicoes):
+        """Traz posições (..., 2) para dentro do campo."""
+        return np.stack((np.clip(posicoes[..., 0], 0, self.limite_x),
+                         np.clip(posicoes[..., 1], -self.limite_y, self.limite_y)), axis=-1)
+
+    def viaveis(self, defensores, movidos=None):
+        """
+        Verifica quais posicionamentos respeitam os limites do campo e a proximidade mínima.
+
+        Parâmetros:
+        defensores (array): Array (P, moveis, 2) com os candidatos.
+        movidos (array): Se informado, o índice do único defensor que mudou em cada candidato, e só ele
+        é verificado, supondo que os outros já respeitavam as restrições.
+
+        Retorna:
+        ndarray: Vetor (P,) de booleanos.
+        """
+        defensores = np.asarray(defensores, dtype=np.float64).reshape(-1, self.moveis, 2)
+        linhas = np.arange(len(defensores))
+        if movidos is None:
+            consultas = defensores
+            mesmos = np.broadcast_to(np.eye(self.moveis, dtype=bool), (len(defensores), self.moveis, self.moveis))
+        else:
+            consultas = defensores[linhas, movidos][:, None, :]
+            mesmos = (np.arange(self.moveis)[None, :] == np.asarray(movidos)[:, None])[:, None, :]
+
+        dentro = ((consultas[..., 0] >= 0) & (consultas[..., 0] <= self.limite_x)
+                  & (np.abs(consultas[..., 1]) <= self.limite_y)).all(axis=1)
+        longe_fixas = (_distancias_em_lote(consultas, self._ocupadas) >= self.proximidade_minima).all(axis=(1, 2))
+        longe_defensores = ((_distancias_em_lote(consultas, defensores) >= self.proximidade_minima) | mesmos).all(axis=(1, 2))
+        return dentro & longe_fixas & longe_defensores
+
+    def sorteia(self, quantidade, rng=None):
+        """
+        Sorteia posicionamentos viáveis com amostra_posicoes.
+
+        Retorna:
+        ndarray: Array (quantidade, moveis, 2).
+        """
+        rng = np.random.default_rng(rng)
+        return np.array([amostra_posicoes(self.moveis, self._ocupadas, rng, self.limite_x, self.limite_y,
+                                          self.proximidade_minima) for _ in range(quantidade)]).reshape(-1, self.moveis, 2)
+
+    def monta_grafos(self, defensores, jogadores_time_1=JOGADORES_TIME_1, jogadores_time_2=JOGADORES_TIME_2):
+        """
+        Monta os grafos dos dois times para um posicionamento, como gera_cenario.
+
+        Parâmetros:
+        defensores (array): Array (moveis, 2) com as posições dos defensores móveis.
+
+        Retorna:
+        tuple: (grafo, grafo_inimigo).
+        """
+        posicoes_time_2 = np.concatenate((self.posicoes_fixas, np.asarray(defensores).reshape(-1, 2)))
+        grafo_inimigo = generate_graph(jogadores_time_2, [tuple(p) for p in posicoes_time_2.tolist()])
+        grafo = generate_graph(jogadores_time_1, [tuple(p) for p in self.posicoes_ataque.tolist()])
+        grafo.cria_grafo_completo(grafo_inimigo, modelo=self.modelo)
+        return grafo, grafo_inimigo
+
+
+class ResultadoOtimizacao:
+    """
+    O melhor posicionamento encontrado e o histórico da busca.
+
+    Atributos:
+    posicoes (ndarray): Array (moveis, 2) com as posições dos defensores móveis.
+    custo (float): O custo da rota mais barata com esse posicionamento.
+    custo_inicial (float): O maior custo entre os posicionamentos sorteados no início.
+    avaliacoes (int): Quantos posicionamentos foram avaliados.
+    tempo (float): O tempo total, em segundos.
+    traco (list): Pares (avaliacoes, melhor custo até ali), a convergência da busca.
+    """
+
+    def __init__(self, posicoes, custo, custo_inicial, avaliacoes, tempo, traco):
+        self.posicoes = posicoes
+        self.custo = custo
+        self.custo_inicial = custo_inicial
+        self.avaliacoes = avaliacoes
+        self.tempo = tempo
+        self.traco = traco
+
+    @property
+    def avaliacoes_por_segundo(self):
+        return self.avaliacoes / self.tempo if self.tempo else float("nan")
+
+    def como_dict(self, nomes=None):
+        """Retorna o resultado em um dicionário serializável em JSON."""
+        posicoes = self.posicoes.tolist()
+        return {
+            "posicoes": dict(zip(nomes, posicoes)) if nomes is not None else posicoes,
+            "custo": self.custo,
+            "custo_inicial": self.custo_inicial,
+            "avaliacoes": self.avaliacoes,
+            "tempo": self.tempo,
+            "avaliacoes_por_segundo": self.avaliacoes_por_segundo,
+            "traco": self.traco,
+        }
+
+
+def recozimento_bloco(problema, cadeias, passos, semente, temperatura_inicial=0.05, temperatura_final=1e-4,
+                      passo_inicial=1.0, passo_final=0.05, intervalo_traco=10):
+    """
+    Roda um bloco de cadeias de recozimento simulado com um gerador de números aleatórios próprio.
+
+    A temperatura e o tamanho dos movimentos caem geometricamente ao longo dos passos; a temperatura
+    é relativa ao custo médio dos posicionamentos iniciais. Propostas inviáveis são rejeitadas sem
+    ser avaliadas.
+
+    Parâmetros:
+    problema (ProblemaDefesa): O problema.
+    cadeias (int): Quantas cadeias o bloco roda, avaliadas juntas a cada passo.
+    passos (int): Quantos movimentos cada cadeia propõe.
+    semente (int): A semente do gerador do bloco.
+    temperatura_inicial (float): A temperatura inicial, como fração do custo médio inicial.
+    temperatura_final (float): A temperatura final, na mesma escala.
+    passo_inicial (float): O desvio padrão inicial de cada movimento.
+    passo_final (float): O desvio padrão final.
+    intervalo_traco (int): A cada quantos passos o melhor custo é registrado.
+
+    Retorna:
+    ResultadoOtimizacao: O melhor posicionamento do bloco.
+    """
+    inicio = time.perf_counter()
+    rng = np.random.default_rng(semente)
+    linhas = np.arange(cadeias)
+    atuais = problema.sorteia(cadeias, rng)
+    custos = problema.custos(atuais)
+    melhor = int(custos.argmax())
+    melhores_posicoes, melhor_custo = atuais[melhor].copy(), float(custos[melhor])
+    custo_inicial = melhor_custo
+    escala = float(np.mean(custos))
+    avaliacoes = cadeias
+    traco = [(avaliacoes, melhor_custo)]
+
+    for passo in range(passos):
+        fracao = passo / max(passos - 1, 1)
+        temperatura = escala * temperatura_inicial * (temperatura_final / temperatura_inicial) ** fracao
+        desvio = passo_inicial * (passo_final / passo_inicial) ** fracao
+
+        movidos = rng.integers(problema.moveis, size=cadeias)
+        propostas = atuais.copy()
+        propostas[linhas, movidos] = problema.limita(propostas[linhas, movidos] + rng.normal(0, desvio, (cadeias, 2)))
+        viaveis = problema.viaveis(propostas, movidos)
+
+        novos = np.full(cadeias, -np.inf)
+        if viaveis.any():
+            novos[viaveis] = problema.custos(propostas[viaveis])
+            avaliacoes += int(viaveis.sum())
+        with np.errstate(over="ignore", invalid="ignore"):
+            aceitas = viaveis & ((novos >= custos) | (rng.random(cadeias) < np.exp((novos - custos) / temperatura)))
+        atuais[aceitas] = propostas[aceitas]
+        custos[aceitas] = novos[aceitas]
+
+        melhor = int(custos.argmax())
+        if custos[melhor] > melhor_custo:
+            melhores_posicoes, melhor_custo = atuais[melhor].copy(), float(custos[melhor])
+        if (passo + 1) % intervalo_traco == 0 or passo == passos - 1:
+            traco.append((avaliacoes, melhor_custo))
+
+    return ResultadoOtimizacao(melhores_posicoes, melhor_custo, custo_inicial, avaliacoes,
+                               time.perf_counter() - inicio, traco)
+
+
+def otimiza_defesa(problema, cadeias=64, passos=2000, processos=None, semente=0, cadeias_por_bloco=32, **opcoes):
+    """
+    Procura o posicionamento defensivo de maior custo com cadeias de recozimento distribuídas em processos.
+
+    Como em executa_lote, a divisão em blocos e as sementes dependem só de 'cadeias', 'semente' e
+    'cadeias_por_bloco', então o resultado é o mesmo para qualquer número de processos.
+
+    Parâmetros:
+    problema (ProblemaDefesa): O problema.
+    cadeias (int): Quantas cadeias no total.
+    passos (int): Quantos movimentos cada cadeia propõe.
+    processos (int): Quantos processos usar. Com 1, roda no processo atual; se omitido, usa todos os núcleos.
+    semente (int): A semente da busca.
+    cadeias_por_bloco (int): Quantas cadeias cada tarefa roda, avaliadas em lote.
+    opcoes: Repassadas a recozimento_bloco (temperaturas, passos dos movimentos, intervalo_traco).
+
+    Retorna:
+    ResultadoOtimizacao: O melhor posicionamento entre todas as cadeias, com o traço somado dos blocos.
+    """
+    blocos = [cadeias_por_bloco] * (cadeias // cadeias_por_bloco)
+    if cadeias % cadeias_por_bloco:
+        blocos.append(cadeias % cadeias_por_bloco)
+    sementes = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(semente).spawn(len(blocos))]
+    argumentos = ([problema] * len(blocos), blocos, [passos] * len(blocos), sementes)
+
+    inicio = time.perf_counter()
+    if processos == 1:
+        parciais = [recozimento_bloco(*valores, **opcoes) for valores in zip(*argumentos)]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(recozimento_bloco, *valores, **opcoes) for valores in zip(*argumentos)]
+            parciais = [futuro.result() for futuro in futuros]
+    tempo = time.perf_counter() - inicio
+
+    melhor = max(parciais, key=lambda parcial: parcial.custo)
+    # Os blocos registram o traço nos mesmos passos; em cada um, soma as avaliações e fica com o melhor custo
+    traco = [(sum(pontos[0] for pontos in registro), max(pontos[1] for pontos in registro))
+             for registro in zip(*(parcial.traco for parcial in parciais))]
+    return ResultadoOtimizacao(melhor.posicoes, melhor.custo, max(parcial.custo_inicial for parcial in parciais),
+                               sum(parcial.avaliacoes for parcial in parciais), tempo, traco)
+
+
+def busca_aleatoria(problema, amostras, semente=0, tamanho_lote=256):
+    """
+    Referência para comparação: avalia posicionamentos sorteados como os de atualizar_posicoes_sem_sobreposicao.
+
+    Retorna:
+    ResultadoOtimizacao: O melhor dos posicionamentos sorteados.
+    """
+    inicio = time.perf_counter()
+    rng = np.random.default_rng(semente)
+    melhores_posicoes, melhor_custo = None, -np.inf
+    avaliadas, traco = 0, []
+    while avaliadas < amostras:
+        lote = problema.sorteia(min(tamanho_lote, amostras - avaliadas), rng)
+        custos = problema.custos(lote)
+        avaliadas += len(lote)
+        if custos.max() > melhor_custo:
+            melhores_posicoes, melhor_custo = lote[custos.argmax()].copy(), float(custos.max())
+        traco.append((avaliadas, melhor_custo))
+    return ResultadoOtimizacao(melhores_posicoes, melhor_custo, traco[0][1], avaliadas, time.perf_counter() - inicio, traco)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-1", choices=FORMACOES, default="4-4-2", help="formação do time que ataca")
+    parser.add_argument("--time-2", choices=FORMACOES, default="4-4-2", help="formação do time que defende")
+    parser.add_argument("--cadeias", type=int, default=64)
+    parser.add_argument("--passos", type=int, default=2000)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--cadeias-por-bloco", type=int, default=32)
+    parser.add_argument("--comparar-aleatoria", type=int, default=0,
+                        help="avalia também tantos posicionamentos sorteados, para comparação")
+    parser.add_argument("--json", help="arquivo onde salvar o resultado e o traço de convergência")
+    args = parser.parse_args()
+
+    problema = ProblemaDefesa.das_formacoes(args.time_1, args.time_2)
+    resultado = otimiza_defesa(problema, args.cadeias, args.passos, args.processos, args.semente,
+                               args.cadeias_por_bloco)
+
+    print(f"{resultado.avaliacoes} avaliações em {resultado.tempo:.2f} s "
+          f"({resultado.avaliacoes_por_segundo:.0f} avaliações/s)")
+    print(f"Custo da melhor rota: {resultado.custo:.4f} (melhor sorteio inicial: {resultado.custo_inicial:.4f})")
+    grafo, _ = problema.monta_grafos(resultado.posicoes)
+    caminho, custo = grafo.encontra_caminho_mais_curto(ORIGEM, DESTINO, retornar_custo=True)
+    print(f"Rota do ataque: {' -> '.join(caminho)} ({custo:.4f})")
+    nomes = JOGADORES_TIME_2[len(problema.posicoes_fixas):]
+    print("Posições:")
+    for nome, (x, y) in zip(nomes, resultado.posicoes.tolist()):
+        print(f"  {nome:<10} ({x:5.2f}, {y:5.2f})")
+    print("Convergência:")
+    for avaliacoes, melhor in resultado.traco[::max(len(resultado.traco) // 10, 1)]:
+        print(f"  {avaliacoes:>10} {melhor:.4f}")
+
+    saida = {"otimizacao": resultado.como_dict(nomes)}
+    if args.comparar_aleatoria:
+        aleatoria = busca_aleatoria(problema, args.comparar_aleatoria, args.semente)
+        print(f"Busca aleatória: {aleatoria.custo:.4f} em {aleatoria.avaliacoes} avaliações "
+              f"({aleatoria.avaliacoes_por_segundo:.0f} avaliações/s)")
+        saida["aleatoria"] = aleatoria.como_dict(nomes)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump(saida, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Leitura em fluxo de dados de rastreamento e atualização do grafo quadro a quadro.
+
+Formatos aceitos:
+    CSV, com cabeçalho e uma linha por jogador por quadro, agrupadas por quadro:
+        frame,jogador,x,y
+    JSONL, com um quadro por linha:
+        {"frame": 0, "posicoes": {"Alisson": [0.0, 0.0], "Bruno": [5.2, 0.0], ...}}
+
+Os arquivos são lidos por mmap e processados linha a linha, então a memória usada não depende
+da duração da partida. Nomes que não pertencem a nenhum dos times (a bola, por exemplo) são ignorados.
+
+Uso:
+    python -m simulation.rastreamento partida.csv [--saida rotas.jsonl]
+"""
+import argparse
+import csv
+import io
+import json
+import mmap
+import time
+
+from data_structure.graph import GrafoSimples
+from simulation.cenarios import JOGADORES_TIME_1, JOGADORES_TIME_2
+
+POSICAO_GOL = (5.6, 0)
+
+
+def _linhas(caminho):
+    """Gera as linhas de um arquivo, decodificadas, lendo-o por mmap."""
+    with open(caminho, "rb") as arquivo:
+        if arquivo.seek(0, io.SEEK_END) == 0:
+            return
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            for linha in iter(mapa.readline, b""):
+                yield linha.decode("utf-8")
+
+
+def le_quadros_csv(caminho):
+    """
+    Lê um arquivo CSV de rastreamento, um quadro por vez.
+
+    Parâmetros:
+    caminho (str): O arquivo CSV, com as colunas frame, jogador, x e y.
+
+    Retorna:
+    generator: Tuplas (frame, posicoes), com posicoes um dicionário nome -> (x, y).
+    """
+    quadro_atual, posicoes = None, {}
+    for linha in csv.DictReader(_linhas(caminho)):
+        quadro = int(linha["frame"])
+        if quadro != quadro_atual and posicoes:
+            yield quadro_atual, posicoes
+            posicoes = {}
+        quadro_atual = quadro
+        posicoes[linha["jogador"]] = (float(linha["x"]), float(linha["y"]))
+    if posicoes:
+        yield quadro_atual, posicoes
+
+
+def le_quadros_jsonl(caminho):
+    """
+    Lê um arquivo JSONL de rastreamento, um quadro por vez.
+
+    Parâmetros:
+    caminho (str): O arquivo JSONL, com um objeto {"frame": ..., "posicoes": {...}} por linha.
+
+    Retorna:
+    generator: Tuplas (frame, posicoes), com posicoes um dicionário nome -> (x, y).
+    """
+    for linha in _linhas(caminho):
+        if not linha.strip():
+            continue
+        quadro = json.loads(linha)
+        yield quadro["frame"], {nome: tuple(posicao) for nome, posicao in quadro["posicoes"].items()}
+
+
+def le_quadros(caminho):
+    """Lê um arquivo de rastreamento, escolhendo o formato pela extensão (.csv ou .jsonl)."""
+    if caminho.endswith(".csv"):
+        return le_quadros_csv(caminho)
+    return le_quadros_jsonl(caminho)
+
+
+class AcompanhadorPartida:
+    """
+    Mantém os grafos dos dois times atualizados a partir de um fluxo de quadros de rastreamento.
+
+    Quando poucos jogadores se movem em um quadro, só as arestas afetadas são recalculadas
+    (GrafoSimples.mover_vertice para os atacantes; mover_posicao no time inimigo e depois
+    atualiza_marcador para os defensores); quando muitos se movem, o grafo é
+    reconstruído de uma vez, o que é mais barato nesse caso.
+
+    Atributos:
+    grafo (GrafoSimples): O grafo de passes do time que ataca, incluindo o vértice do gol.
+    grafo_inimigo (GrafoSimples): O time que defende.
+    """
+
+    def __init__(self, jogadores_time_1=JOGADORES_TIME_1, jogadores_time_2=JOGADORES_TIME_2,
+                 origem=None, destino="Gol", posicao_gol=POSICAO_GOL, limite_incremental=0.25):
+        """
+        Parâmetros:
+        jogadores_time_1 (list): Os nomes do time que ataca. destino, se estiver na lista, fica fixo em posicao_gol.
+        jogadores_time_2 (list): Os nomes do time que defende.
+        origem (str): De onde partem as rotas. Por padrão, o primeiro jogador do time 1.
+        destino (str): Aonde as rotas chegam.
+        posicao_gol (tuple): A posição do vértice do gol.
+        limite_incremental (float): A fração de jogadores que se movem acima da qual o grafo é reconstruído.
+        """
+        self.origem = origem or jogadores_time_1[0]
+        self.destino = destino
+        self.limite_incremental = limite_incremental
+        self.grafo = GrafoSimples()
+        self.grafo_inimigo = GrafoSimples()
+        for nome in jogadores_time_1:
+            self.grafo.adiciona_vertice(nome, posicao_gol if nome == destino else (0, 0))
+        for nome in jogadores_time_2:
+            self.grafo_inimigo.adiciona_vertice(nome, (0, 0))
+        self._iniciado = False
+
+    def aplica_quadro(self, posicoes):
+        """
+        Atualiza os grafos com as posições de um quadro.
+
+        Parâmetros:
+        posicoes (dict): Nome do jogador -> (x, y). Jogadores ausentes mantêm a posição anterior.
+        """
+        atacantes, defensores = [], []
+        for nome, posicao in posicoes.items():
+            if nome == self.destino:
+                continue
+            if nome in self.grafo.vertices:
+                if self.grafo.vertices[nome].posicao != posicao:
+                    atacantes.append((nome, posicao))
+            elif nome in self.grafo_inimigo.vertices:
+                if self.grafo_inimigo.vertices[nome].posicao != posicao:
+                    defensores.append((nome, posicao))
+
+        total = len(self.grafo.vertices) + len(self.grafo_inimigo.vertices)
+        if not self._iniciado or len(atacantes) + len(defensores) > self.limite_incremental * total:
+            for nome, posicao in atacantes:
+                self.grafo.mover_posicao(nome, posicao)
+            for nome, posicao in defensores:
+                self.grafo_inimigo.mover_posicao(nome, posicao)
+            self.grafo.cria_grafo_completo(self.grafo_inimigo)
+            self._iniciado = True
+            return
+
+        for nome, posicao in defensores:
+            self.grafo_inimigo.mover_posicao(nome, posicao)
+            self.grafo.atualiza_marcador(nome, self.grafo_inimigo)
+        for nome, posicao in atacantes:
+            self.grafo.mover_vertice(nome, posicao, self.grafo_inimigo)
+
+    def acompanha(self, quadros):
+        """
+        Processa um fluxo de quadros e gera a melhor rota de cada um.
+
+        O grafo de passes de cada quadro está em self.grafo no momento em que o resultado é gerado.
+
+        Parâmetros:
+        quadros (iterable): Tuplas (frame, posicoes), como as geradas por le_quadros.
+
+        Retorna:
+        generator: Tuplas (frame, caminho, custo).
+        """
+        for quadro, posicoes in quadros:
+            self.aplica_quadro(posicoes)
+            caminho, custo = self.grafo.encontra_caminho_mais_curto(self.origem, self.destino, retornar_custo=True)
+            yield quadro, caminho, custo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivo", help="arquivo de rastreamento, .csv ou .jsonl")
+    parser.add_argument("--saida", help="arquivo JSONL onde salvar a rota de cada quadro")
+    parser.add_argument("--fps", type=float, default=25.0, help="taxa de quadros da gravação, para comparar com o tempo real")
+    args = parser.parse_args()
+
+    acompanhador = AcompanhadorPartida()
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else None
+    quadros = 0
+    inicio = time.perf_counter()
+    try:
+        for quadro, caminho, custo in acompanhador.acompanha(le_quadros(args.arquivo)):
+            quadros += 1
+            if saida:
+                saida.write(json.dumps({"frame": quadro, "caminho": caminho, "custo": custo}, ensure_ascii=False) + "\n")
+    finally:
+        if saida:
+            saida.close()
+    tempo = time.perf_counter() - inicio
+
+    taxa = quadros / tempo if tempo else float("inf")
+    print(f"{quadros} quadros em {tempo:.2f} s ({taxa:.0f} quadros/s, {taxa / args.fps:.1f}x o tempo real)")
+
+
+if __name__ == "__main__":
+    main()
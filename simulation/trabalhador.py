@@ -0,0 +1,135 @@
+"""Execução em segundo plano da geração de cenários e da busca de caminhos.
+
+O laço da interface pede o trabalho e continua desenhando; os resultados são recolhidos a cada
+quadro com coleta(). Os grafos de um cenário novo são montados em objetos novos (o buffer de trás)
+e só substituem os que estão na tela (o buffer da frente) quando ficam prontos, então a interface
+nunca vê um grafo pela metade.
+
+Cada pedido de cenário abre uma nova geração. Pedidos de gerações anteriores que ainda não
+começaram são cancelados, e os que já estão rodando param no próximo ponto de verificação ou têm
+o resultado descartado. Um pedido que falha não derruba a interface: a exceção é recolhida por
+coleta() como um resultado do tipo ERRO.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from simulation.cenarios import gera_cenario
+
+CENARIO = "cenario"
+CAMINHO = "caminho"
+ERRO = "erro"
+
+
+class PedidoCancelado(Exception):
+    """Levantada dentro do trabalhador quando o pedido em execução ficou obsoleto."""
+
+
+class TrabalhadorGrafos:
+    """
+    Gera cenários e calcula caminhos em uma thread separada, um pedido por vez, na ordem pedida.
+
+    Como os pedidos são executados em ordem, um caminho pedido logo depois de um cenário é
+    calculado sobre o grafo desse cenário, mesmo que ele ainda não tenha chegado à tela.
+
+    Atributos:
+    geracao (int): A geração atual; aumenta a cada pedido de cenário.
+    """
+
+    def __init__(self, grafo, grafo_inimigo, gerador=gera_cenario):
+        """
+        Parâmetros:
+        grafo (GrafoSimples): O grafo de passes inicial, já com as arestas.
+        grafo_inimigo (GrafoSimples): O time adversário inicial.
+        gerador (callable): Função que recebe os argumentos de pede_cenario e retorna (grafo, grafo_inimigo).
+        """
+        self.gerador = gerador
+        self.geracao = 0
+        self._grafos = (grafo, grafo_inimigo)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trabalhador-grafos")
+        self._pendentes = []
+        self._trava = threading.Lock()
+
+    @property
+    def ocupado(self):
+        """Se há pedidos da geração atual ainda não recolhidos."""
+        return bool(self._pendentes)
+
+    def _verifica(self, geracao):
+        if geracao != self.geracao:
+            raise PedidoCancelado()
+
+    def _executa_cenario(self, geracao, argumentos):
+        self._verifica(geracao)
+        grafos = self.gerador(*argumentos)
+        self._verifica(geracao)
+        with self._trava:
+            self._grafos = grafos
+        return grafos
+
+    def _executa_caminho(self, geracao, origem, destino):
+        self._verifica(geracao)
+        with self._trava:
+            grafo, _ = self._grafos
+        return grafo.encontra_caminho_mais_curto(origem, destino)
+
+    def pede_cenario(self, *argumentos):
+        """
+        Pede um cenário novo, cancelando tudo o que foi pedido antes.
+
+        Parâmetros:
+        argumentos: Repassados ao gerador, por padrão gera_cenario(formacao_time_1, formacao_time_2).
+
+        Retorna:
+        int: A nova geração.
+        """
+        with self._trava:
+            self.geracao += 1
+            for _, futuro in self._pendentes:
+                futuro.cancel()
+            self._pendentes = [(CENARIO, self._executor.submit(self._executa_cenario, self.geracao, argumentos))]
+        return self.geracao
+
+    def pede_caminho(self, origem, destino):
+        """
+        Pede o caminho mais curto entre dois vértices no grafo do último cenário pedido.
+
+        Parâmetros:
+        origem (str): O nome do vértice de origem.
+        destino (str): O nome do vértice de destino.
+        """
+        with self._trava:
+            futuro = self._executor.submit(self._executa_caminho, self.geracao, origem, destino)
+            self._pendentes.append((CAMINHO, futuro))
+
+    def coleta(self):
+        """
+        Recolhe, sem bloquear, os resultados prontos da geração atual, na ordem em que foram pedidos.
+
+        Retorna:
+        list: Tuplas (tipo, valor). Para CENARIO, valor é (grafo, grafo_inimigo); para CAMINHO, é o
+        retorno de encontra_caminho_mais_curto. Se um pedido falhou, a tupla é (ERRO, (tipo, excecao)),
+        e os grafos do último cenário que deu certo continuam valendo.
+        """
+        prontos = []
+        with self._trava:
+            while self._pendentes and self._pendentes[0][1].done():
+                tipo, futuro = self._pendentes.pop(0)
+                if futuro.cancelled():
+                    continue
+                excecao = futuro.exception()
+                if isinstance(excecao, PedidoCancelado):
+                    continue
+                if excecao is not None:
+                    prontos.append((ERRO, (tipo, excecao)))
+                else:
+                    prontos.append((tipo, futuro.result()))
+        return prontos
+
+    def encerra(self):
+        """Cancela os pedidos pendentes e espera o que estiver rodando terminar."""
+        with self._trava:
+            self.geracao += 1
+            for _, futuro in self._pendentes:
+                futuro.cancel()
+            self._pendentes = []
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,53 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from simulation.cenarios import gera_cenario
+
+ORIGEM, DESTINO = "Alisson", "Gol"
+
+
+def cenarios(quantidade=10, semente=0):
+    rng = np.random.default_rng(semente)
+    return [gera_cenario("4-3-3", "4-4-2", rng)[0] for _ in range(quantidade)]
+
+
+def custo(grafo_nx, caminho):
+    return sum(grafo_nx[de][para]["weight"] for de, para in zip(caminho, caminho[1:]))
+
+
+@pytest.mark.parametrize("grafo", cenarios())
+def test_k_caminhos_mais_curtos_igual_ao_networkx(grafo):
+    grafo_nx = grafo.construir_grafo_networkx()
+    esperados = []
+    for caminho in nx.shortest_simple_paths(grafo_nx, ORIGEM, DESTINO, weight="weight"):
+        esperados.append(caminho)
+        if len(esperados) == 5:
+            break
+
+    rotas = grafo.k_caminhos_mais_curtos(ORIGEM, DESTINO, 5, retornar_custo=True)
+
+    assert [caminho for caminho, _ in rotas] == esperados
+    np.testing.assert_allclose([c for _, c in rotas], [custo(grafo_nx, caminho) for caminho in esperados], rtol=1e-12)
+
+
+@pytest.mark.parametrize("grafo", cenarios())
+@pytest.mark.parametrize("max_passes", [1, 2, 3])
+def test_caminho_com_limite_de_passes_igual_a_busca_exaustiva(grafo, max_passes):
+    grafo_nx = grafo.construir_grafo_networkx()
+    esperado = min(nx.all_simple_paths(grafo_nx, ORIGEM, DESTINO, cutoff=max_passes),
+                   key=lambda caminho: custo(grafo_nx, caminho))
+
+    caminho, custo_total = grafo.caminho_com_limite_de_passes(ORIGEM, DESTINO, max_passes, retornar_custo=True)
+
+    assert caminho == esperado
+    assert len(caminho) - 1 <= max_passes
+    assert custo_total == pytest.approx(custo(grafo_nx, esperado), rel=1e-12)
+
+
+def test_caminho_com_limite_de_passes_sem_caminho():
+    grafo = cenarios(1)[0]
+    grafo.pesos[grafo.indice(ORIGEM), grafo.indice(DESTINO)] = np.inf
+    grafo.invalida_caches()
+
+    assert grafo.caminho_com_limite_de_passes(ORIGEM, DESTINO, 1) == "Não há caminho disponível."
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from data_structure.graph import GrafoSimples
+from simulation.cenarios import gera_cenario, generate_graph, get_player_positions, JOGADORES_TIME_1, JOGADORES_TIME_2
+
+
+def reconstruido(grafo, time_inimigo):
+    """Um grafo com as mesmas posições, montado do zero com cria_grafo_completo."""
+    completo = GrafoSimples.de_arrays(grafo.nomes, grafo.posicoes.copy(), np.full_like(grafo.pesos, np.inf))
+    completo.cria_grafo_completo(time_inimigo)
+    return completo.pesos
+
+
+def sorteia_posicao(rng):
+    return tuple(rng.uniform((0, -2), (5, 2)).tolist())
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_mover_vertice_igual_a_reconstrucao(semente):
+    rng = np.random.default_rng(semente)
+    grafo, time_inimigo = gera_cenario("4-3-3", "4-4-2", rng)
+    for _ in range(5):
+        nome = grafo.nomes[rng.integers(len(grafo.nomes) - 1)]  # O gol não se move
+        grafo.mover_vertice(nome, sorteia_posicao(rng), time_inimigo)
+
+        np.testing.assert_array_equal(grafo.pesos, reconstruido(grafo, time_inimigo))
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_atualiza_marcador_igual_a_reconstrucao(semente):
+    rng = np.random.default_rng(semente)
+    grafo, time_inimigo = gera_cenario("4-3-3", "4-4-2", rng)
+    for _ in range(5):
+        nome = time_inimigo.nomes[rng.integers(len(time_inimigo.nomes))]
+        time_inimigo.mover_posicao(nome, sorteia_posicao(rng))
+        grafo.atualiza_marcador(nome, time_inimigo)
+
+        np.testing.assert_array_equal(grafo.pesos, reconstruido(grafo, time_inimigo))
+
+
+def test_atualizacao_sem_termos_mantem_as_arestas():
+    posicoes_time_1, posicoes_time_2 = get_player_positions("4-3-3", "4-4-2")
+    time_inimigo = generate_graph(JOGADORES_TIME_2, posicoes_time_2)
+    grafo = generate_graph(JOGADORES_TIME_1, posicoes_time_1)
+    grafo.adiciona_aresta("Alisson", grafo.nomes[1], time_inimigo)
+    grafo.adiciona_aresta(grafo.nomes[1], "Gol", time_inimigo)
+    arestas = np.isfinite(grafo.pesos)
+
+    time_inimigo.mover_posicao(time_inimigo.nomes[3], (1.0, 0.5))
+    grafo.atualiza_marcador(time_inimigo.nomes[3], time_inimigo)
+    grafo.mover_vertice(grafo.nomes[1], (1.5, 0.3), time_inimigo)
+
+    np.testing.assert_array_equal(np.isfinite(grafo.pesos), arestas)
+    completo = reconstruido(grafo, time_inimigo)
+    np.testing.assert_allclose(grafo.pesos[arestas], completo[arestas], rtol=1e-12)
@@ -0,0 +1,33 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from data_structure.snapshot import GravadorSequencia, SequenciaGravada
+from gui.exportacao import quadros_gravados
+from gui.offscreen import RenderizadorOffscreen
+from simulation.cenarios import gera_cenario
+
+
+class SaidaMemoria:
+    def __init__(self):
+        self.quadros = []
+
+    def escreve(self, pixels, tamanho):
+        self.quadros.append((pixels, tamanho))
+
+
+def test_renderiza_sequencia_sem_time_inimigo(tmp_path):
+    arquivo = str(tmp_path / "partida.fgr")
+    grafo, _ = gera_cenario("4-3-3", "4-4-2")
+    with GravadorSequencia(arquivo, grafo.nomes) as gravador:
+        gravador.adiciona(grafo)
+        gravador.adiciona(grafo)
+
+    sequencia = SequenciaGravada(arquivo)
+    saida = SaidaMemoria()
+    renderizador = RenderizadorOffscreen((320, 180))
+    renderizados = renderizador.renderiza_sequencia(quadros_gravados(sequencia, "Alisson", "Gol"), saida)
+
+    assert renderizados == 2
+    assert [tamanho for _, tamanho in saida.quadros] == [(320, 180)] * 2
+    assert all(len(pixels) == 320 * 180 * 3 for pixels, _ in saida.quadros)
@@ -0,0 +1,32 @@
+import itertools
+import warnings
+
+import numpy as np
+import pytest
+
+from data_structure.pesos import GeometriaPasses, ModeloPeso, varre_modelos
+from simulation.cenarios import gera_cenario, get_player_positions
+
+EXPOENTES = (0, 1, 3.3)
+
+
+def geometrias():
+    yield GeometriaPasses(*get_player_positions("4-4-2", "4-3-3"))
+    rng = np.random.default_rng(7)
+    for _ in range(3):
+        grafo, time_inimigo = gera_cenario("4-3-3", "4-4-2", rng)
+        yield GeometriaPasses(grafo.posicoes, time_inimigo.posicoes)
+
+
+@pytest.mark.parametrize("geometria", list(geometrias()))
+def test_varre_modelos_igual_a_matriz(geometria):
+    modelos = [ModeloPeso(*expoentes) for expoentes in itertools.product(EXPOENTES, repeat=3)]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        varridos = varre_modelos(modelos, geometria)
+
+    fora_da_diagonal = ~np.eye(len(geometria.posicoes), dtype=bool)
+    for modelo, pesos in zip(modelos, varridos):
+        esperado = modelo.matriz(geometria)
+        np.testing.assert_allclose(pesos[fora_da_diagonal], esperado[fora_da_diagonal], rtol=1e-12,
+                                   err_msg=repr(modelo))
@@ -0,0 +1,35 @@
+import time
+
+from simulation.cenarios import gera_cenario
+from simulation.trabalhador import CAMINHO, CENARIO, ERRO, TrabalhadorGrafos
+
+
+def coleta_tudo(trabalhador, esperados, limite=10.0):
+    resultados = []
+    fim = time.monotonic() + limite
+    while len(resultados) < esperados and time.monotonic() < fim:
+        resultados.extend(trabalhador.coleta())
+        time.sleep(0.01)
+    return resultados
+
+
+def test_pedido_que_falha_vira_erro_e_mantem_o_ultimo_cenario():
+    grafo, grafo_inimigo = gera_cenario("4-3-3", "4-4-2")
+
+    def gerador_com_falha():
+        raise RuntimeError("sem posições válidas")
+
+    trabalhador = TrabalhadorGrafos(grafo, grafo_inimigo, gerador_com_falha)
+    try:
+        trabalhador.pede_cenario()
+        trabalhador.pede_caminho("Alisson", "Gol")
+        resultados = coleta_tudo(trabalhador, 2)
+    finally:
+        trabalhador.encerra()
+
+    assert [tipo for tipo, _ in resultados] == [ERRO, CAMINHO]
+    pedido, excecao = resultados[0][1]
+    assert pedido == CENARIO
+    assert isinstance(excecao, RuntimeError)
+    # O caminho foi calculado sobre o grafo que já estava na tela
+    assert resultados[1][1] == grafo.encontra_caminho_mais_curto("Alisson", "Gol")